@@ -1,8 +1,10 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import drugs, clinical_trials, analytics
+from app.api.v1.endpoints import drugs, clinical_trials, analytics, jobs, events
 
 api_router = APIRouter()
 
 api_router.include_router(drugs.router)
 api_router.include_router(clinical_trials.router)
 api_router.include_router(analytics.router)
+api_router.include_router(jobs.router)
+api_router.include_router(events.router)
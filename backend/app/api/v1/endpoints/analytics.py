@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.db import get_db
 from app.schemas.schemas import AnalyticsSummary
 from app.services.services import AnalyticsService
@@ -29,15 +31,7 @@ def get_top_manufacturers(db: Session = Depends(get_db)):
     """
     Get top drug manufacturers by number of drugs
     """
-    from sqlalchemy import func
-    from app.models.models import Drug
-    
-    results = db.query(
-        Drug.manufacturer,
-        func.count(Drug.id).label('count')
-    ).group_by(Drug.manufacturer).order_by(func.count(Drug.id).desc()).limit(10).all()
-    
-    return [{"manufacturer": r[0], "drug_count": r[1]} for r in results if r[0]]
+    return AnalyticsService.get_top_manufacturers(db)
 
 
 @router.get("/trials/by-therapeutic-area")
@@ -45,14 +39,22 @@ def get_trials_by_therapeutic_area(db: Session = Depends(get_db)):
     """
     Get trial distribution by therapeutic area
     """
-    from sqlalchemy import func
-    from app.models.models import ClinicalTrial, Drug
-    
-    results = db.query(
-        Drug.therapeutic_area,
-        func.count(ClinicalTrial.id).label('count')
-    ).join(ClinicalTrial, Drug.id == ClinicalTrial.drug_id) \
-     .group_by(Drug.therapeutic_area) \
-     .order_by(func.count(ClinicalTrial.id).desc()).all()
-    
-    return [{"therapeutic_area": r[0], "trial_count": r[1]} for r in results if r[0]]
+    return AnalyticsService.get_trials_by_therapeutic_area(db)
+
+
+@router.get("/adverse-events/by-severity")
+def get_adverse_events_by_severity(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    drug_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get adverse event counts by severity
+
+    Bounding the reported_date range keeps the query to the matching
+    monthly partitions.
+    """
+    if start_date and end_date and end_date < start_date:
+        raise HTTPException(status_code=422, detail="end_date must not be before start_date")
+    return AnalyticsService.get_adverse_events_by_severity(db, start_date, end_date, drug_id)
@@ -1,8 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from app.api.v1.fieldsets import parse_fields, sparse_response
+from app.api.v1.params import parse_ids
 from app.db import get_db
-from app.schemas.schemas import ClinicalTrialCreate, ClinicalTrialUpdate, ClinicalTrialResponse
+from app.schemas.schemas import (
+    ClinicalTrialCreate, ClinicalTrialUpdate, ClinicalTrialUpsert, ClinicalTrialResponse,
+    BatchIds, ClinicalTrialBatchResponse, MAX_BATCH_IDS
+)
 from app.services.services import ClinicalTrialService
 
 router = APIRouter(prefix="/clinical-trials", tags=["clinical-trials"])
@@ -10,9 +15,12 @@ router = APIRouter(prefix="/clinical-trials", tags=["clinical-trials"])
 
 @router.get("/", response_model=List[ClinicalTrialResponse])
 def get_trials(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     drug_id: Optional[int] = Query(None, description="Filter by drug ID"),
+    ids: Optional[str] = Query(None, description="Comma-separated trial IDs, e.g. 1,2,3"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,status"),
     db: Session = Depends(get_db)
 ):
     """
@@ -21,24 +29,56 @@ def get_trials(
     - **skip**: Number of records to skip
     - **limit**: Maximum number of records to return
     - **drug_id**: Filter trials by drug ID (optional)
+    - **ids**: Fetch these trials in the given order instead of paginating;
+      IDs that do not exist are listed in the `X-Missing-Ids` header
+    - **fields**: Return only these fields (the ID is always included)
     """
-    if drug_id:
-        trials = ClinicalTrialService.get_trials_by_drug(db, drug_id)
+    field_names = parse_fields(fields, ClinicalTrialResponse)
+    trial_ids = parse_ids(ids)
+    if trial_ids is not None:
+        trials, missing = ClinicalTrialService.get_trials_by_ids(db, trial_ids, fields=field_names)
+        if missing:
+            response.headers["X-Missing-Ids"] = ",".join(str(i) for i in missing)
+    elif drug_id:
+        trials = ClinicalTrialService.get_trials_by_drug(db, drug_id, fields=field_names)
     else:
-        trials = ClinicalTrialService.get_all_trials(db, skip=skip, limit=limit)
+        trials = ClinicalTrialService.get_all_trials(db, skip=skip, limit=limit, fields=field_names)
+    if field_names:
+        return sparse_response(trials, ClinicalTrialResponse, field_names, headers=response.headers)
     return trials
 
 
+@router.post("/batch", response_model=ClinicalTrialBatchResponse)
+def get_trials_batch(batch: BatchIds, db: Session = Depends(get_db)):
+    """
+    Get many clinical trials by ID in one request
+    
+    - **ids**: Trial IDs to fetch (up to 1000)
+    
+    Returns the trials in input order and the IDs that were not found.
+    """
+    trials, missing = ClinicalTrialService.get_trials_by_ids(db, batch.ids)
+    return {"items": trials, "missing": missing}
+
+
 @router.get("/{trial_id}", response_model=ClinicalTrialResponse)
-def get_trial(trial_id: int, db: Session = Depends(get_db)):
+def get_trial(
+    trial_id: int,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,status"),
+    db: Session = Depends(get_db)
+):
     """
     Get a specific clinical trial by ID
     
     - **trial_id**: The ID of the trial to retrieve
+    - **fields**: Return only these fields (the ID is always included)
     """
-    trial = ClinicalTrialService.get_trial_by_id(db, trial_id)
+    field_names = parse_fields(fields, ClinicalTrialResponse)
+    trial = ClinicalTrialService.get_trial_by_id(db, trial_id, fields=field_names)
     if not trial:
         raise HTTPException(status_code=404, detail="Clinical trial not found")
+    if field_names:
+        return sparse_response(trial, ClinicalTrialResponse, field_names)
     return trial
 
 
@@ -57,8 +97,13 @@ def create_trial(trial: ClinicalTrialCreate, db: Session = Depends(get_db)):
     - **patient_count**: Number of patients enrolled
     - **location**: Trial location
     - **sponsor**: Trial sponsor organization
+    
+    Returns 422 if the drug does not exist.
     """
-    return ClinicalTrialService.create_trial(db, trial)
+    try:
+        return ClinicalTrialService.create_trial(db, trial)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
 
 @router.put("/{trial_id}", response_model=ClinicalTrialResponse)
@@ -72,3 +117,39 @@ def update_trial(trial_id: int, trial: ClinicalTrialUpdate, db: Session = Depend
     if not updated_trial:
         raise HTTPException(status_code=404, detail="Clinical trial not found")
     return updated_trial
+
+
+@router.put("/by-trial-id/{trial_id}", response_model=ClinicalTrialResponse)
+def upsert_trial(trial_id: str, trial: ClinicalTrialUpsert, db: Session = Depends(get_db)):
+    """
+    Create or update a clinical trial by its registry identifier
+    
+    - **trial_id**: Unique trial identifier (e.g., NCT12345678)
+    
+    Optional fields omitted from the body are left unchanged on an existing trial.
+    Safe to retry: the same request always leaves the same row.
+    Returns 422 if the drug does not exist.
+    """
+    if not 1 <= len(trial_id) <= 50:
+        raise HTTPException(status_code=422, detail="trial_id must be 1-50 characters")
+    try:
+        return ClinicalTrialService.upsert_trial(db, trial_id, trial)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.post("/bulk-upsert", response_model=List[ClinicalTrialResponse])
+def bulk_upsert_trials(trials: List[ClinicalTrialCreate], db: Session = Depends(get_db)):
+    """
+    Create or update many clinical trials by trial_id in a single statement
+    
+    Accepts up to 1000 trials and returns one per input, in input order.
+    Trials repeating a trial_id are merged, the later one winning, and each
+    gets the merged row. Returns 422 if any drug does not exist.
+    """
+    if len(trials) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BATCH_IDS} trials are allowed")
+    try:
+        return ClinicalTrialService.bulk_upsert_trials(db, trials)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
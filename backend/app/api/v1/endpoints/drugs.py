@@ -1,38 +1,105 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from app.api.v1.fieldsets import parse_fields, sparse_response
+from app.api.v1.params import parse_ids
 from app.db import get_db
-from app.schemas.schemas import DrugCreate, DrugUpdate, DrugResponse
-from app.services.services import DrugService
+from app.schemas.schemas import (
+    DrugCreate, DrugUpdate, DrugUpsert, DrugResponse, AdverseEventResponse,
+    BatchIds, DrugBatchResponse, BulkDeleteResponse, MAX_BATCH_IDS
+)
+from app.services.services import DrugService, AdverseEventService
 
 router = APIRouter(prefix="/drugs", tags=["drugs"])
 
 
 @router.get("/", response_model=List[DrugResponse])
-def get_drugs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_drugs(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    ids: Optional[str] = Query(None, description="Comma-separated drug IDs, e.g. 1,2,3"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name"),
+    db: Session = Depends(get_db)
+):
     """
     Get all drugs with pagination
     
     - **skip**: Number of records to skip (default: 0)
     - **limit**: Maximum number of records to return (default: 100)
+    - **ids**: Fetch these drugs in the given order instead of paginating;
+      IDs that do not exist are listed in the `X-Missing-Ids` header
+    - **fields**: Return only these fields (the ID is always included)
     """
-    drugs = DrugService.get_all_drugs(db, skip=skip, limit=limit)
+    field_names = parse_fields(fields, DrugResponse)
+    drug_ids = parse_ids(ids)
+    if drug_ids is not None:
+        drugs, missing = DrugService.get_drugs_by_ids(db, drug_ids, fields=field_names)
+        if missing:
+            response.headers["X-Missing-Ids"] = ",".join(str(i) for i in missing)
+    else:
+        drugs = DrugService.get_all_drugs(db, skip=skip, limit=limit, fields=field_names)
+    if field_names:
+        return sparse_response(drugs, DrugResponse, field_names, headers=response.headers)
     return drugs
 
 
+@router.post("/batch", response_model=DrugBatchResponse)
+def get_drugs_batch(batch: BatchIds, db: Session = Depends(get_db)):
+    """
+    Get many drugs by ID in one request
+    
+    - **ids**: Drug IDs to fetch (up to 1000)
+    
+    Returns the drugs in input order and the IDs that were not found.
+    """
+    drugs, missing = DrugService.get_drugs_by_ids(db, batch.ids)
+    return {"items": drugs, "missing": missing}
+
+
 @router.get("/{drug_id}", response_model=DrugResponse)
-def get_drug(drug_id: int, db: Session = Depends(get_db)):
+def get_drug(
+    drug_id: int,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name"),
+    db: Session = Depends(get_db)
+):
     """
     Get a specific drug by ID
     
     - **drug_id**: The ID of the drug to retrieve
+    - **fields**: Return only these fields (the ID is always included)
     """
-    drug = DrugService.get_drug_by_id(db, drug_id)
+    field_names = parse_fields(fields, DrugResponse)
+    drug = DrugService.get_drug_by_id(db, drug_id, fields=field_names)
     if not drug:
         raise HTTPException(status_code=404, detail="Drug not found")
+    if field_names:
+        return sparse_response(drug, DrugResponse, field_names)
     return drug
 
 
+@router.get("/{drug_id}/adverse-events", response_model=List[AdverseEventResponse])
+def get_drug_adverse_events(
+    drug_id: int,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get adverse events reported for a drug
+
+    - **drug_id**: The ID of the drug
+    - **start_date** / **end_date**: Only events reported in this range (inclusive);
+      bounded ranges only scan the matching monthly partitions
+    """
+    if start_date and end_date and end_date < start_date:
+        raise HTTPException(status_code=422, detail="end_date must not be before start_date")
+    if not DrugService.get_drug_by_id(db, drug_id, fields=["id"]):
+        raise HTTPException(status_code=404, detail="Drug not found")
+    return AdverseEventService.get_events_by_drug(db, drug_id, start_date, end_date)
+
+
 @router.post("/", response_model=DrugResponse, status_code=status.HTTP_201_CREATED)
 def create_drug(drug: DrugCreate, db: Session = Depends(get_db)):
     """
@@ -61,6 +128,56 @@ def update_drug(drug_id: int, drug: DrugUpdate, db: Session = Depends(get_db)):
     return updated_drug
 
 
+@router.put("/by-name/{name}", response_model=DrugResponse)
+def upsert_drug(name: str, drug: DrugUpsert, db: Session = Depends(get_db)):
+    """
+    Create or update a drug by its name
+    
+    - **name**: Unique drug name
+    
+    Fields omitted from the body are left unchanged on an existing drug.
+    Safe to retry: the same request always leaves the same row.
+    """
+    if not 1 <= len(name) <= 200:
+        raise HTTPException(status_code=422, detail="name must be 1-200 characters")
+    return DrugService.upsert_drug(db, name, drug)
+
+
+@router.post("/bulk-upsert", response_model=List[DrugResponse])
+def bulk_upsert_drugs(drugs: List[DrugCreate], db: Session = Depends(get_db)):
+    """
+    Create or update many drugs by name in a single statement
+    
+    Accepts up to 1000 drugs and returns one per input, in input order.
+    Drugs repeating a name are merged, the later one winning, and each gets
+    the merged row.
+    """
+    if len(drugs) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BATCH_IDS} drugs are allowed")
+    return DrugService.bulk_upsert_drugs(db, drugs)
+
+
+@router.delete("/", response_model=BulkDeleteResponse)
+def bulk_delete_drugs(
+    ids: Optional[str] = Query(None, description="Comma-separated drug IDs, e.g. 1,2,3"),
+    manufacturer: Optional[str] = Query(None, description="Delete all drugs from this manufacturer"),
+    db: Session = Depends(get_db)
+):
+    """
+    Delete many drugs at once, with their clinical trials, trial results and adverse events
+    
+    - **ids**: Drug IDs to delete
+    - **manufacturer**: Delete drugs from this manufacturer
+    
+    At least one filter is required; both together must both match.
+    Returns the number of deleted rows per table.
+    """
+    if ids is None and manufacturer is None:
+        raise HTTPException(status_code=422, detail="Provide ids and/or manufacturer")
+    counts = DrugService.bulk_delete_drugs(db, drug_ids=parse_ids(ids), manufacturer=manufacturer)
+    return {"deleted": counts}
+
+
 @router.delete("/{drug_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_drug(drug_id: int, db: Session = Depends(get_db)):
     """
@@ -0,0 +1,81 @@
+import json
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from app.core.config import settings
+from app.core.events import ChangeEvent, event_broker
+from app.schemas.schemas import TrialStatusEnum
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+def format_sse(event: ChangeEvent) -> str:
+    """Format a change event as a Server-Sent Events message"""
+    return (
+        f"id: {event.seq}\n"
+        f"event: {event.entity}.{event.action}\n"
+        f"data: {json.dumps(event.to_dict())}\n\n"
+    )
+
+
+def format_reset(seq: int) -> str:
+    """Tell the client to reload its data and resume after seq"""
+    return f"event: reset\ndata: {json.dumps({'seq': seq})}\n\n"
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    since: Optional[int] = Query(None, description="Resume after this sequence number"),
+    entity: Optional[str] = Query(None, description="Filter by entity (drug, clinical_trial)"),
+    drug_id: Optional[int] = Query(None, description="Filter by drug ID"),
+    sponsor: Optional[str] = Query(None, description="Filter by trial sponsor"),
+    status: Optional[TrialStatusEnum] = Query(None, description="Filter by trial status"),
+    last_event_id: Optional[int] = Header(None)
+):
+    """
+    Stream drug and clinical trial changes as Server-Sent Events
+
+    - **since**: Sequence number to resume from; defaults to the `Last-Event-ID`
+      header, or to live events only
+    - **entity**, **drug_id**, **sponsor**, **status**: Optional filters
+
+    If the client has fallen behind the server buffer, or resumes from a
+    sequence number the server has not reached (its sequence restarted), a
+    `reset` event with the current sequence number is sent and the client
+    should reload its data. A `: keep-alive` comment is sent whenever no
+    event arrives for EVENT_HEARTBEAT_SECONDS.
+    """
+    cursor = since if since is not None else last_event_id
+    if cursor is None:
+        cursor = event_broker.last_seq
+    filters = {
+        "entity": entity,
+        "drug_id": drug_id,
+        "sponsor": sponsor,
+        "status": status.value if status else None
+    }
+
+    async def event_stream():
+        nonlocal cursor
+        if cursor > event_broker.last_seq:
+            cursor = event_broker.last_seq
+            yield format_reset(cursor)
+        while not await request.is_disconnected():
+            events, gap = event_broker.read_since(cursor)
+            if gap:
+                yield format_reset(event_broker.last_seq)
+            if not events:
+                if not await event_broker.wait_for(cursor, settings.EVENT_HEARTBEAT_SECONDS):
+                    yield ": keep-alive\n\n"
+                continue
+            for event in events:
+                if event.matches(**filters):
+                    yield format_sse(event)
+            cursor = events[-1].seq
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,55 @@
+from fastapi import APIRouter, HTTPException, status
+from app.core.jobs import JobStatus, job_manager
+from app.schemas.schemas import JobCreate, JobResponse
+import app.services.jobs  # noqa: F401  (registers job handlers)
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.post("/", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def create_job(job: JobCreate):
+    """
+    Queue a background job
+
+    - **kind**: Job type (drugs_export, clinical_trials_export, analytics_summary, data_quality,
+      parquet_snapshot, adverse_event_partitions)
+    - **params**: Optional keyword parameters of the job's handler; unknown ones are rejected with 400
+    """
+    try:
+        return job_manager.submit(job.kind, job.params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(job_id: str):
+    """
+    Get the status and progress of a job
+
+    - **job_id**: The ID returned when the job was created
+    """
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}/result")
+def get_job_result(job_id: str):
+    """
+    Get the result of a finished job
+
+    Returns 409 while the job is still queued or running, or if it failed.
+    """
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status == JobStatus.FAILED:
+        raise HTTPException(status_code=409, detail=f"Job failed: {job.error}")
+    if job.status != JobStatus.SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    try:
+        return job_manager.load_result(job)
+    except FileNotFoundError:
+        # Purged after its TTL between the lookup and the read
+        raise HTTPException(status_code=404, detail="Job not found")
@@ -0,0 +1,50 @@
+from functools import lru_cache
+from fastapi import HTTPException, Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+from typing import List, Mapping, Optional, Tuple, Type
+
+
+def parse_fields(fields: Optional[str], response_model: Type[BaseModel]) -> Optional[List[str]]:
+    """
+    Parse a sparse fieldset such as 'id,name,status'
+
+    The ID is always included. Unknown field names are rejected with 422.
+    """
+    if fields is None:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in response_model.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown fields: {unknown}. Available: {list(response_model.model_fields)}"
+        )
+    return list(dict.fromkeys(["id"] + requested))
+
+
+@lru_cache(maxsize=256)
+def _partial_adapters(response_model: Type[BaseModel], fields: Tuple[str, ...]):
+    """Build (and cache) a response model restricted to the given fields"""
+    partial = create_model(
+        f"{response_model.__name__}Partial",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (response_model.model_fields[name].annotation, response_model.model_fields[name])
+           for name in fields}
+    )
+    return TypeAdapter(partial), TypeAdapter(List[partial])
+
+
+def sparse_response(
+    data, response_model: Type[BaseModel], fields: List[str], headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """Serialize an ORM object or list of objects with only the requested fields"""
+    item_adapter, list_adapter = _partial_adapters(response_model, tuple(fields))
+    if isinstance(data, list):
+        content = list_adapter.dump_json(list_adapter.validate_python(data, from_attributes=True))
+    else:
+        content = item_adapter.dump_json(item_adapter.validate_python(data, from_attributes=True))
+    response = Response(content=content, media_type="application/json")
+    for key, value in (headers or {}).items():
+        if key.lower() not in ("content-length", "content-type"):
+            response.headers[key] = value
+    return response
@@ -0,0 +1,18 @@
+from fastapi import HTTPException
+from typing import List, Optional
+from app.schemas.schemas import MAX_BATCH_IDS
+
+
+def parse_ids(ids: Optional[str]) -> Optional[List[int]]:
+    """Parse a comma-separated ID list such as '1,2,3'"""
+    if ids is None:
+        return None
+    try:
+        parsed = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be a comma-separated list of integers")
+    if not parsed:
+        raise HTTPException(status_code=422, detail="ids must not be empty")
+    if len(parsed) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BATCH_IDS} ids are allowed")
+    return parsed
@@ -0,0 +1,156 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+class LocalVersionStore:
+    """Entity version stamps kept in process memory"""
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> int:
+        return self._versions.get(key, 0)
+
+    def bump(self, key: str) -> int:
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+            return self._versions[key]
+
+    def clear(self):
+        with self._lock:
+            self._versions.clear()
+
+
+class RedisVersionStore:
+    """
+    Entity version stamps kept in Redis
+
+    Lets several uvicorn workers share invalidations: a bump in one worker
+    makes every other worker's cached copy stale on its next lookup.
+    """
+
+    def __init__(self, url: str, prefix: str = "datamax:entity-version:"):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("ENTITY_CACHE_REDIS_URL requires the 'redis' package: pip install redis")
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def get(self, key: str) -> int:
+        value = self._client.get(self._prefix + key)
+        return int(value) if value is not None else 0
+
+    def bump(self, key: str) -> int:
+        return int(self._client.incr(self._prefix + key))
+
+    def clear(self):
+        pass
+
+
+class EntityCache:
+    """
+    Size-bounded LRU cache of entity rows with version stamps
+
+    Each entry remembers the entity version it was loaded under. Writers bump
+    the version after committing, which makes cached copies stale without
+    having to reach every worker's memory. Entries also expire after a TTL so
+    changes made outside the API are eventually picked up.
+    """
+
+    def __init__(self, max_size: int = 5000, ttl_seconds: float = 300, version_store=None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.versions = version_store or LocalVersionStore()
+        self._entries: "OrderedDict[str, Tuple[int, float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    @staticmethod
+    def _key(entity: str, entity_id: Any) -> str:
+        return f"{entity}:{entity_id}"
+
+    def get(self, entity: str, entity_id: Any) -> Tuple[Optional[Dict[str, Any]], int]:
+        """
+        Look up an entity
+
+        Returns:
+            Tuple of (row snapshot or None, current version). On a miss, pass
+            the version back to put() so a concurrent write is not masked.
+        """
+        key = self._key(entity, entity_id)
+        version = self.versions.get(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, loaded_at, snapshot = entry
+                if entry_version == version and time.monotonic() - loaded_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return snapshot, version
+                del self._entries[key]
+            self.misses += 1
+        return None, version
+
+    def version(self, entity: str, entity_id: Any) -> int:
+        """Current version of an entity, to pass to put() when loading it directly"""
+        return self.versions.get(self._key(entity, entity_id))
+
+    def put(self, entity: str, entity_id: Any, version: int, snapshot: Dict[str, Any]):
+        """Store a row snapshot loaded under the given version"""
+        if not self.enabled:
+            return
+        key = self._key(entity, entity_id)
+        with self._lock:
+            self._entries[key] = (version, time.monotonic(), snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, entity: str, entity_id: Any):
+        """Bump the entity version and drop the local copy"""
+        key = self._key(entity, entity_id)
+        self.versions.bump(key)
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+        self.versions.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+entity_cache = EntityCache(
+    max_size=settings.ENTITY_CACHE_SIZE,
+    ttl_seconds=settings.ENTITY_CACHE_TTL_SECONDS,
+    version_store=(
+        RedisVersionStore(settings.ENTITY_CACHE_REDIS_URL)
+        if settings.ENTITY_CACHE_REDIS_URL else LocalVersionStore()
+    )
+)
+metrics.register_collector("entity_cache", entity_cache.stats)
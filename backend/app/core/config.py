@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
@@ -9,6 +9,48 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ENVIRONMENT: str = "development"
     LOG_LEVEL: str = "INFO"
+
+    # SQLite performance profile (WAL, separate write connection)
+    SQLITE_TUNED: bool = False
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_CACHE_SIZE: int = -65536
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
+    # Startup warm-up: connections to pre-open and hot entities to preload
+    WARMUP_ENABLED: bool = True
+    WARMUP_POOL_CONNECTIONS: int = 5
+    WARMUP_CACHE_ENTITIES: int = 500
+
+    # Statement timeout per request in ms (0 disables), with per path prefix overrides,
+    # e.g. STATEMENT_TIMEOUTS='{"/api/v1/analytics": 60000}'
+    STATEMENT_TIMEOUT_MS: int = 30000
+    STATEMENT_TIMEOUTS: Dict[str, int] = {}
+
+    # Monthly adverse_events partitions to keep ahead of today (PostgreSQL)
+    ADVERSE_EVENT_PARTITION_MONTHS_AHEAD: int = 3
+
+    # Background jobs
+    JOB_MAX_WORKERS: int = 4
+    JOB_RESULTS_DIR: str = "./job_results"
+    JOB_RESULT_TTL_SECONDS: int = 3600
+
+    # Parquet snapshots (written by the parquet_snapshot job)
+    SNAPSHOT_DIR: str = "./snapshots"
+    SNAPSHOT_BATCH_SIZE: int = 10000
+
+    # Analytics engine: "sql" queries the database, "duckdb" a local snapshot
+    ANALYTICS_ENGINE: str = "sql"
+    ANALYTICS_SNAPSHOT_DIR: str = "./snapshots/analytics"
+    ANALYTICS_SNAPSHOT_MAX_AGE_SECONDS: float = 300
+
+    # Change feed
+    EVENT_BUFFER_SIZE: int = 1000
+    EVENT_HEARTBEAT_SECONDS: float = 15.0
+
+    # Entity cache (0 disables it)
+    ENTITY_CACHE_SIZE: int = 5000
+    ENTITY_CACHE_TTL_SECONDS: float = 300
+    ENTITY_CACHE_REDIS_URL: Optional[str] = None
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,131 @@
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+class ChangeEvent:
+    """A create/update/delete of a drug or clinical trial"""
+
+    def __init__(self, seq: int, entity: str, action: str, entity_id: int, data: Dict[str, Any]):
+        self.seq = seq
+        self.entity = entity
+        self.action = action
+        self.entity_id = entity_id
+        self.data = data
+        self.timestamp = datetime.utcnow()
+
+    @property
+    def drug_id(self) -> Optional[int]:
+        if self.entity == "drug":
+            return self.entity_id
+        return self.data.get("drug_id")
+
+    def matches(
+        self,
+        entity: Optional[str] = None,
+        drug_id: Optional[int] = None,
+        sponsor: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> bool:
+        """Check the event against subscriber filters"""
+        if entity is not None and self.entity != entity:
+            return False
+        if drug_id is not None and self.drug_id != drug_id:
+            return False
+        if sponsor is not None and self.data.get("sponsor") != sponsor:
+            return False
+        if status is not None and self.data.get("status") != status:
+            return False
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "seq": self.seq,
+            "entity": self.entity,
+            "action": self.action,
+            "id": self.entity_id,
+            "timestamp": self.timestamp.isoformat(),
+            "data": self.data
+        }
+
+
+class EventBroker:
+    """
+    Fan-out of change events to live subscribers
+
+    Events are kept in a bounded ring buffer and numbered with a monotonic
+    sequence. Subscribers keep their own cursor into the buffer, so a slow
+    subscriber never makes the broker buffer more; if it falls behind the
+    oldest retained event it is told to resync instead. Publishing is safe
+    from worker threads; waiting is done on the subscriber's event loop.
+    """
+
+    def __init__(self, buffer_size: int = 1000):
+        self._events: deque = deque(maxlen=buffer_size)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._waiters = set()
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def publish(self, entity: str, action: str, entity_id: int, data: Dict[str, Any]) -> ChangeEvent:
+        """Record an event and wake up waiting subscribers"""
+        with self._lock:
+            self._seq += 1
+            event = ChangeEvent(self._seq, entity, action, entity_id, data)
+            self._events.append(event)
+            waiters = list(self._waiters)
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(waiter.set)
+            except RuntimeError:
+                # Subscriber loop already closed
+                pass
+        return event
+
+    def read_since(self, seq: int, limit: int = 100) -> Tuple[List[ChangeEvent], bool]:
+        """
+        Get events with a sequence number above seq
+
+        Returns:
+            Tuple of (events, gap) where gap is True if events after seq
+            have already been evicted from the buffer
+        """
+        with self._lock:
+            if not self._events or self._seq <= seq:
+                return [], False
+            oldest = self._events[0].seq
+            gap = seq < oldest - 1
+            start = max(seq + 1, oldest) - oldest
+            events = [self._events[i] for i in range(start, min(start + limit, len(self._events)))]
+        return events, gap
+
+    async def wait_for(self, seq: int, timeout: float) -> bool:
+        """
+        Wait until an event above seq is published or the timeout passes
+
+        Returns:
+            False if the timeout passed without a new event
+        """
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            if self._seq > seq:
+                return True
+            self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+
+event_broker = EventBroker(buffer_size=settings.EVENT_BUFFER_SIZE)
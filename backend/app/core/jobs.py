@@ -0,0 +1,179 @@
+import inspect
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job:
+    """State of a single background job"""
+
+    def __init__(self, kind: str, params: Dict[str, Any]):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status = JobStatus.QUEUED
+        self.progress = 0.0
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.expires_at: Optional[datetime] = None
+
+    def report_progress(self, progress: float):
+        """Record progress as a fraction between 0 and 1"""
+        self.progress = round(min(max(progress, 0.0), 1.0), 4)
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+class JobManager:
+    """
+    In-process job runner
+
+    Jobs run on a bounded thread pool with their own database session, so
+    HTTP workers never wait on them. Results are written to disk as JSON and
+    removed once their TTL has passed.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable = SessionLocal,
+        max_workers: int = 4,
+        results_dir: str = "./job_results",
+        ttl_seconds: int = 3600
+    ):
+        self.session_factory = session_factory
+        self.max_workers = max_workers
+        self.results_dir = Path(results_dir)
+        self.ttl_seconds = ttl_seconds
+        self._handlers: Dict[str, Callable] = {}
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def register(self, kind: str):
+        """Decorator registering a handler called as handler(db, job, **params)"""
+        def decorator(func: Callable) -> Callable:
+            self._handlers[kind] = func
+            return func
+        return decorator
+
+    @property
+    def kinds(self):
+        return sorted(self._handlers)
+
+    def submit(self, kind: str, params: Optional[Dict[str, Any]] = None) -> Job:
+        """Queue a job; raises ValueError for unknown job kinds or parameters"""
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind '{kind}'. Available: {self.kinds}")
+        params = params or {}
+        try:
+            # db and job are passed by the runner
+            inspect.signature(self._handlers[kind]).bind(None, None, **params)
+        except TypeError as e:
+            raise ValueError(f"Invalid parameters for job kind '{kind}': {e}")
+
+        self.purge_expired()
+        job = Job(kind, params)
+        with self._lock:
+            self._jobs[job.id] = job
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="job"
+                )
+            executor = self._executor
+        executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by ID, or None if it does not exist or has expired"""
+        self.purge_expired()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def load_result(self, job: Job) -> Any:
+        """
+        Read the persisted result of a finished job
+
+        Raises FileNotFoundError if the result was purged in the meantime.
+        """
+        with open(self._result_path(job.id)) as f:
+            return json.load(f)
+
+    def purge_expired(self):
+        """Drop jobs and result files whose TTL has passed"""
+        now = datetime.utcnow()
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.expires_at is not None and job.expires_at <= now
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+        for job_id in expired:
+            self._result_path(job_id).unlink(missing_ok=True)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker pool"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _result_path(self, job_id: str) -> Path:
+        return self.results_dir / f"{job_id}.json"
+
+    def _run(self, job: Job):
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        started = time.perf_counter()
+        db = self.session_factory()
+        try:
+            result = self._handlers[job.kind](db, job, **job.params)
+            self.results_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._result_path(job.id).with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(jsonable_encoder(result), f)
+            tmp_path.replace(self._result_path(job.id))
+            job.report_progress(1.0)
+            job.status = JobStatus.SUCCEEDED
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.kind}) failed: {str(e)}")
+            job.error = str(e)
+            job.status = JobStatus.FAILED
+        finally:
+            db.close()
+            job.finished_at = datetime.utcnow()
+            job.expires_at = job.finished_at + timedelta(seconds=self.ttl_seconds)
+            logger.info(
+                f"Job {job.id} ({job.kind}) {job.status} in {time.perf_counter() - started:.2f}s"
+            )
+
+
+job_manager = JobManager(
+    max_workers=settings.JOB_MAX_WORKERS,
+    results_dir=settings.JOB_RESULTS_DIR,
+    ttl_seconds=settings.JOB_RESULT_TTL_SECONDS
+)
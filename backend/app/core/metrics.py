@@ -0,0 +1,38 @@
+import threading
+from collections import defaultdict
+from typing import Callable, Dict
+
+
+class Metrics:
+    """Process-wide counters plus named collectors for derived values"""
+
+    def __init__(self):
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._collectors: Dict[str, Callable[[], dict]] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] += value
+
+    def get(self, name: str) -> int:
+        return self._counters.get(name, 0)
+
+    def register_collector(self, name: str, collector: Callable[[], dict]):
+        """Register a callable whose dict output is reported under name"""
+        self._collectors[name] = collector
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+        report = {"counters": counters}
+        for name, collector in self._collectors.items():
+            report[name] = collector()
+        return report
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+
+metrics = Metrics()
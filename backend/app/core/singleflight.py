@@ -0,0 +1,118 @@
+import functools
+import inspect
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+from app.core.metrics import metrics
+from app.db.timeouts import is_interrupted
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.retry = False
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent calls into one execution
+
+    The first caller for a key runs the function; callers arriving with the
+    same key while it is running wait for it and receive the same result (or
+    exception). Nothing is cached once the call completes, so results are
+    never older than the in-flight computation.
+
+    Errors for which `leader_only(error)` is true belong to the leader's
+    request alone (its statement was cancelled because its client went
+    away, or hit its own deadline). They are raised to the leader only; the
+    waiting callers run the call again, one of them as the new leader, under
+    their own request's timeout and cancellation.
+    """
+
+    def __init__(self, leader_only: Callable[[BaseException], bool] = lambda error: False):
+        self.leader_only = leader_only
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executions = 0
+        self.retries = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.calls += 1
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                    self.executions += 1
+
+            if leader:
+                break
+            call.done.wait()
+            if call.retry:
+                with self._lock:
+                    self.retries += 1
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            if self.leader_only(e):
+                call.retry = True
+            else:
+                call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def coalesced(self, name: str, skip: int = 1):
+        """
+        Decorator coalescing calls by name and normalized arguments
+
+        The first `skip` positional arguments (the database session for
+        service methods) are not part of the key. Defaults are applied, so
+        f(db) and f(db, limit=10) share a key when 10 is the default.
+        """
+        def decorator(fn):
+            signature = inspect.signature(fn)
+            skipped = list(signature.parameters)[:skip]
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                key = (name,) + tuple(
+                    (param, value) for param, value in bound.arguments.items() if param not in skipped
+                )
+                return self.do(key, lambda: fn(*args, **kwargs))
+            return wrapper
+        return decorator
+
+    def stats(self) -> dict:
+        coalesced = self.calls - self.executions
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": coalesced,
+            "coalescing_ratio": round(coalesced / self.calls, 4) if self.calls else 0.0,
+            "retries": self.retries,
+            "in_flight": len(self._calls)
+        }
+
+    def reset(self):
+        with self._lock:
+            self.calls = self.executions = self.retries = 0
+
+
+single_flight = SingleFlight(leader_only=is_interrupted)
+metrics.register_collector("single_flight", single_flight.stats)
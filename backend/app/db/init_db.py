@@ -0,0 +1,52 @@
+"""Schema creation and sample data for local setups"""
+from datetime import date
+from sqlalchemy.orm import Session
+from app.db.session import Base, engine
+import app.models  # noqa: F401  (registers models on Base.metadata)
+from app.models.models import Drug, ClinicalTrial
+
+
+def create_schema(bind=engine):
+    """Create any missing tables"""
+    Base.metadata.create_all(bind=bind)
+
+
+def seed_sample_data(db: Session) -> int:
+    """
+    Add sample drugs and clinical trials to an empty database
+
+    Returns the number of drugs added (0 if the database already has drugs).
+    """
+    if db.query(Drug).count() > 0:
+        return 0
+
+    drugs = [
+        Drug(name="Aspirin", generic_name="Acetylsalicylic acid", manufacturer="Bayer",
+             therapeutic_area="Cardiology", molecule_type="Small Molecule",
+             approval_date=date(1899, 3, 6)),
+        Drug(name="Ibuprofen", generic_name="Ibuprofen", manufacturer="Pfizer",
+             therapeutic_area="Pain Management", molecule_type="Small Molecule",
+             approval_date=date(1969, 1, 1)),
+        Drug(name="Metformin", generic_name="Metformin", manufacturer="Merck",
+             therapeutic_area="Endocrinology", molecule_type="Small Molecule",
+             approval_date=date(1994, 12, 29)),
+    ]
+    db.add_all(drugs)
+    db.flush()
+
+    db.add_all([
+        ClinicalTrial(trial_id="NCT00001", title="Phase 3 Study of Aspirin in CAD",
+                      drug_id=drugs[0].id, phase="Phase 3", status="Completed",
+                      patient_count=500, location="USA", sponsor="Bayer",
+                      start_date=date(2020, 1, 15), end_date=date(2022, 12, 31)),
+        ClinicalTrial(trial_id="NCT00002", title="Safety Study of Ibuprofen",
+                      drug_id=drugs[1].id, phase="Phase 2", status="Ongoing",
+                      patient_count=250, location="EU", sponsor="Pfizer",
+                      start_date=date(2021, 6, 1)),
+        ClinicalTrial(trial_id="NCT00003", title="Metformin in Type 2 Diabetes",
+                      drug_id=drugs[2].id, phase="Phase 3", status="Completed",
+                      patient_count=800, location="Global", sponsor="Merck",
+                      start_date=date(2018, 11, 5), end_date=date(2021, 8, 20)),
+    ])
+    db.commit()
+    return len(drugs)
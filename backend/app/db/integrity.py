@@ -0,0 +1,44 @@
+"""
+Integrity errors as client errors
+
+A write that breaks a unique or foreign key constraint conflicts with the
+data already stored (a taken name, a row that references or is referenced
+by another one). It is answered with 409 instead of a 500 and counted in
+db.integrity_errors; get_db rolls the session back when it is closed.
+"""
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
+
+from app.core.metrics import metrics
+
+# SQLSTATE codes of the violations told apart on PostgreSQL
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+
+DETAILS = {
+    "unique": "A row with the same unique value already exists",
+    "foreign_key": "The change conflicts with rows that reference or are referenced by it",
+    "other": "The change violates a database constraint",
+}
+
+
+def violation_kind(exc: IntegrityError) -> str:
+    """'unique', 'foreign_key' or 'other'"""
+    code = getattr(exc.orig, "pgcode", None)
+    message = str(exc.orig).upper()
+    if code == UNIQUE_VIOLATION or "UNIQUE CONSTRAINT" in message:
+        return "unique"
+    if code == FOREIGN_KEY_VIOLATION or "FOREIGN KEY CONSTRAINT" in message:
+        return "foreign_key"
+    return "other"
+
+
+async def _integrity_error_handler(request: Request, exc: IntegrityError):
+    metrics.increment("db.integrity_errors")
+    return JSONResponse(status_code=409, content={"detail": DETAILS[violation_kind(exc)]})
+
+
+def install_integrity_errors(app: FastAPI):
+    """Answer constraint violations with 409 Conflict"""
+    app.add_exception_handler(IntegrityError, _integrity_error_handler)
@@ -0,0 +1,82 @@
+"""
+Monthly partition maintenance for adverse_events
+
+On PostgreSQL adverse_events is range-partitioned by reported_date (see
+database/schema.sql and migration 0003). These helpers keep partitions
+created ahead of incoming data and detach old months for archiving. On other
+databases, or when the table is not partitioned, they do nothing.
+"""
+from datetime import date
+from typing import List
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+
+
+def _add_months(day: date, months: int) -> date:
+    """First day of the month `months` after the month of `day`"""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def is_partitioned(db: Session) -> bool:
+    """Whether adverse_events is a partitioned table"""
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(db.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = 'adverse_events')"
+    )).scalar())
+
+
+def ensure_adverse_event_partitions(
+    db: Session,
+    start: date = None,
+    end: date = None,
+    months_ahead: int = None
+) -> int:
+    """
+    Create the monthly partitions covering start..end
+
+    Defaults to the current month through ADVERSE_EVENT_PARTITION_MONTHS_AHEAD
+    months ahead. Returns the number of partitions created.
+    """
+    if not is_partitioned(db):
+        return 0
+    if months_ahead is None:
+        months_ahead = settings.ADVERSE_EVENT_PARTITION_MONTHS_AHEAD
+    today = date.today()
+    start = start or today
+    end = end or _add_months(today, months_ahead)
+    created = db.execute(
+        text("SELECT ensure_adverse_event_partitions(:start, :end)"),
+        {"start": start, "end": end}
+    ).scalar()
+    db.commit()
+    return created or 0
+
+
+def detach_adverse_event_partitions(db: Session, before: date) -> List[str]:
+    """
+    Detach monthly partitions that end on or before `before`
+
+    Detached partitions become standalone tables that can be archived or
+    dropped without touching the live table. Returns their names.
+    """
+    if not is_partitioned(db):
+        return []
+    rows = db.execute(text(
+        "SELECT c.relname "
+        "FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = 'adverse_events' AND c.relname LIKE 'adverse_events_y%'"
+    )).scalars().all()
+    detached = []
+    for name in sorted(rows):
+        year, month = int(name[-7:-3]), int(name[-2:])
+        if _add_months(date(year, month, 1), 1) <= before:
+            db.execute(text(f'ALTER TABLE adverse_events DETACH PARTITION "{name}"'))
+            detached.append(name)
+    db.commit()
+    return detached
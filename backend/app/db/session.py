@@ -1,12 +1,72 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql.dml import UpdateBase
 from app.core.config import settings
 
+
+def configure_sqlite(sqlite_engine, tuned: bool = False):
+    """
+    Set per-connection SQLite pragmas
+
+    Foreign keys (and so ON DELETE CASCADE) are always enforced. The tuned
+    profile adds WAL journaling so readers do not block on the writer,
+    relaxed fsync, memory-mapped I/O, a larger page cache, in-memory temp
+    tables and a busy timeout instead of immediate "database is locked" errors.
+    """
+    @event.listens_for(sqlite_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        if tuned:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+            cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.close()
+
+
+class RoutingSession(Session):
+    """
+    Session that sends writes to a dedicated write engine when one is set
+
+    Flushes and INSERT/UPDATE/DELETE statements go to write_bind, everything
+    else to the regular (read) bind.
+    """
+
+    def __init__(self, *args, write_bind=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.write_bind = write_bind
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.write_bind is not None and (self._flushing or isinstance(clause, UpdateBase)):
+            return self.write_bind
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+def is_sqlite_file(url: str) -> bool:
+    """Check for an on-disk SQLite database (WAL does not apply to :memory:)"""
+    return url.startswith("sqlite") and ":memory:" not in url and url.rstrip("/") not in ("sqlite:", "sqlite+pysqlite:")
+
+
 # Handle SQLite connection args
 connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
 engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+write_engine = None
+if settings.DATABASE_URL.startswith("sqlite"):
+    configure_sqlite(engine, tuned=settings.SQLITE_TUNED)
+    if settings.SQLITE_TUNED and is_sqlite_file(settings.DATABASE_URL):
+        # SQLite allows one writer at a time; a single pooled write connection
+        # serializes writers in-process while the read pool serves readers.
+        write_engine = create_engine(
+            settings.DATABASE_URL, connect_args=connect_args, pool_size=1, max_overflow=0
+        )
+        configure_sqlite(write_engine, tuned=True)
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=engine, class_=RoutingSession, write_bind=write_engine
+)
 
 Base = declarative_base()
 
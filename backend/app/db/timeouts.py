@@ -0,0 +1,227 @@
+"""
+Per-request statement timeouts and cancellation on client disconnect
+
+StatementTimeoutMiddleware gives every HTTP request a QueryControl holding
+its timeout (STATEMENT_TIMEOUT_MS, overridden per path prefix by
+STATEMENT_TIMEOUTS) and watches for the client going away. When a session
+begins a transaction inside the request, the timeout is applied to its
+connection:
+
+- PostgreSQL: SET LOCAL statement_timeout, for the time left in the request
+- SQLite: a progress handler that aborts the statement past the deadline
+
+If the client disconnects before a response has started, the in-flight
+statement is cancelled (psycopg2 cancel() / sqlite3 interrupt()).
+A request's own timeout becomes a 504 (db.statement_timeouts), its client
+disconnecting a 503 (db.statements_cancelled) and pool exhaustion a 503
+(db.pool_timeouts). An interrupted statement is only ever answered with a
+504 when the request's own deadline has passed.
+"""
+import asyncio
+import contextvars
+import logging
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Progress handler granularity (SQLite VM instructions between deadline checks)
+SQLITE_PROGRESS_STEPS = 1000
+
+
+class QueryControl:
+    """Timeout and cancellation state of one request's database work"""
+
+    def __init__(self, timeout_ms: int):
+        self.timeout_ms = timeout_ms
+        self.deadline = time.monotonic() + timeout_ms / 1000 if timeout_ms else None
+        self.cancelled = False
+        self.responded = False
+        self._connections = {}
+        self._lock = threading.Lock()
+
+    def remaining_ms(self) -> Optional[int]:
+        if self.deadline is None:
+            return None
+        return max(int((self.deadline - time.monotonic()) * 1000), 1)
+
+    def expired(self) -> bool:
+        return self.cancelled or (self.deadline is not None and time.monotonic() >= self.deadline)
+
+    def attach(self, transaction, dbapi_connection):
+        with self._lock:
+            self._connections.setdefault(transaction, []).append(dbapi_connection)
+
+    def detach(self, transaction):
+        with self._lock:
+            self._connections.pop(transaction, None)
+
+    def cancel(self):
+        """Abort statements running on this request's connections"""
+        self.cancelled = True
+        with self._lock:
+            connections = [conn for conns in self._connections.values() for conn in conns]
+        for dbapi_connection in connections:
+            try:
+                if isinstance(dbapi_connection, sqlite3.Connection):
+                    dbapi_connection.interrupt()
+                elif hasattr(dbapi_connection, "cancel"):
+                    dbapi_connection.cancel()
+            except Exception:
+                logger.exception("Could not cancel statement")
+
+
+current_query: contextvars.ContextVar[Optional[QueryControl]] = contextvars.ContextVar(
+    "current_query", default=None
+)
+
+
+def statement_timeout_for(path: str) -> int:
+    """Timeout in milliseconds for a request path; the longest matching prefix wins"""
+    matches = [prefix for prefix in settings.STATEMENT_TIMEOUTS if path.startswith(prefix)]
+    if matches:
+        return settings.STATEMENT_TIMEOUTS[max(matches, key=len)]
+    return settings.STATEMENT_TIMEOUT_MS
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_statement_timeout(session, transaction, connection):
+    control = current_query.get()
+    dbapi_connection = connection.connection.dbapi_connection
+    if connection.dialect.name == "sqlite":
+        if control is None or (control.deadline is None):
+            # Clear a handler left behind by an earlier request on this connection
+            dbapi_connection.set_progress_handler(None, 0)
+        else:
+            dbapi_connection.set_progress_handler(
+                lambda: 1 if control.expired() else 0, SQLITE_PROGRESS_STEPS
+            )
+    elif connection.dialect.name == "postgresql" and control is not None and control.deadline is not None:
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {control.remaining_ms()}")
+    if control is not None:
+        control.attach(transaction, dbapi_connection)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _detach_connections(session, transaction):
+    control = current_query.get()
+    if control is not None:
+        control.detach(transaction)
+
+
+def is_statement_timeout(exc: OperationalError) -> bool:
+    """Whether a database error is a statement timeout or cancellation"""
+    if getattr(exc.orig, "pgcode", None) == "57014":  # query_canceled
+        return True
+    return isinstance(exc.orig, sqlite3.OperationalError) and "interrupted" in str(exc.orig)
+
+
+def is_interrupted(exc: BaseException) -> bool:
+    """Whether an exception is a statement aborted by its request's timeout or cancellation"""
+    return isinstance(exc, OperationalError) and is_statement_timeout(exc)
+
+
+class StatementTimeoutMiddleware:
+    """
+    ASGI middleware setting up a QueryControl per request
+
+    The request body is read up front so that the original receive channel
+    can be watched for http.disconnect while the endpoint runs; the app gets
+    the buffered body instead.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        control = QueryControl(statement_timeout_for(scope["path"]))
+        body_messages = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body_messages.append(message)
+            if not message.get("more_body"):
+                break
+
+        disconnected = asyncio.Event()
+
+        async def replay_receive():
+            if body_messages:
+                return body_messages.pop(0)
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def watch_disconnect():
+            message = await receive()
+            while message["type"] != "http.disconnect":
+                message = await receive()
+            disconnected.set()
+            if not control.responded:
+                control.cancel()
+
+        async def tracking_send(message):
+            if message["type"] == "http.response.start":
+                control.responded = True
+            await send(message)
+
+        token = current_query.set(control)
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            await self.app(scope, replay_receive, tracking_send)
+        finally:
+            watcher.cancel()
+            current_query.reset(token)
+
+
+async def _operational_error_handler(request: Request, exc: OperationalError):
+    if not is_statement_timeout(exc):
+        raise exc
+    control = current_query.get()
+    if control is not None and control.cancelled:
+        metrics.increment("db.statements_cancelled")
+        return JSONResponse(status_code=503, content={"detail": "Request cancelled"})
+    if control is not None and control.deadline is not None and not control.expired():
+        # Interrupted on behalf of another request; this one did not time out
+        metrics.increment("db.statements_interrupted")
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Database query was interrupted, retry shortly"},
+            headers={"Retry-After": "1"}
+        )
+    metrics.increment("db.statement_timeouts")
+    return JSONResponse(
+        status_code=504,
+        content={"detail": "Database query exceeded the statement timeout"}
+    )
+
+
+async def _pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    metrics.increment("db.pool_timeouts")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "No database connection available, retry shortly"},
+        headers={"Retry-After": "1"}
+    )
+
+
+def install_statement_timeouts(app: FastAPI):
+    """Add the timeout middleware and the 504/503 error mapping to an app"""
+    app.add_middleware(StatementTimeoutMiddleware)
+    app.add_exception_handler(OperationalError, _operational_error_handler)
+    app.add_exception_handler(PoolTimeoutError, _pool_timeout_handler)
@@ -1,13 +1,42 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.api.v1 import api_router
 from app.core.config import settings
+from app.core.jobs import job_manager
+from app.core.metrics import metrics
+from app.db.integrity import install_integrity_errors
+from app.db.timeouts import install_statement_timeouts
+from app.services.analytics_engine import duckdb_analytics
+from app.services.warmup import readiness
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown"""
+    if settings.ANALYTICS_ENGINE == "duckdb":
+        # Fail at startup rather than with a 500 on the first analytics request
+        duckdb_analytics.check_dependencies()
+    if settings.WARMUP_ENABLED:
+        # Runs before the server accepts connections; a failure leaves the
+        # worker unready and /health/ready retries it
+        await run_in_threadpool(readiness.warm_up)
+    else:
+        readiness.warmed = True
+    yield
+    readiness.draining = True
+    job_manager.shutdown(wait=False)
+    duckdb_analytics.close()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
     description="DataMAx - Pharmaceutical Data Analytics Platform API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -19,6 +48,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Statement timeouts, cancellation on client disconnect and 504/503 mapping
+install_statement_timeouts(app)
+
+# Unique and foreign key violations as 409 Conflict
+install_integrity_errors(app)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
@@ -42,6 +77,32 @@ async def health_check():
     }
 
 
+@app.get("/health/live")
+async def liveness():
+    """Liveness probe: the process is up and serving requests"""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness probe: warmed up and the database answers (503 otherwise)"""
+    ready = not readiness.draining
+    if ready and not readiness.warmed:
+        ready = await run_in_threadpool(readiness.warm_up)
+    if ready:
+        ready = await run_in_threadpool(readiness.check_database)
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", **readiness.status()}
+    )
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Runtime metrics (counters, cache hit rates)"""
+    return metrics.snapshot()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
-from datetime import datetime
+from datetime import date, datetime
 import enum
 from app.db.session import Base
 
@@ -22,9 +22,13 @@ class TrialStatus(str, enum.Enum):
 class Drug(Base):
     """Drug/Medication model"""
     __tablename__ = "drugs"
+    __table_args__ = (
+        Index("idx_drugs_manufacturer", "manufacturer"),
+        Index("idx_drugs_therapeutic_area", "therapeutic_area"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(200), nullable=False, index=True)
+    name = Column(String(200), nullable=False, unique=True, index=True)
     generic_name = Column(String(200))
     manufacturer = Column(String(200))
     approval_date = Column(Date)
@@ -34,18 +38,29 @@ class Drug(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    clinical_trials = relationship("ClinicalTrial", back_populates="drug")
-    adverse_events = relationship("AdverseEvent", back_populates="drug")
+    # Child rows are removed by ON DELETE CASCADE, so the ORM never loads them to delete a drug
+    clinical_trials = relationship(
+        "ClinicalTrial", back_populates="drug", cascade="all", passive_deletes=True
+    )
+    adverse_events = relationship(
+        "AdverseEvent", back_populates="drug", cascade="all", passive_deletes=True
+    )
 
 
 class ClinicalTrial(Base):
     """Clinical Trial model"""
     __tablename__ = "clinical_trials"
+    __table_args__ = (
+        Index("idx_trials_drug_id", "drug_id"),
+        Index("idx_trials_phase", "phase"),
+        Index("idx_trials_status", "status"),
+        Index("idx_trials_drug_id_status", "drug_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     trial_id = Column(String(50), unique=True, nullable=False, index=True)
     title = Column(String(500), nullable=False)
-    drug_id = Column(Integer, ForeignKey("drugs.id"))
+    drug_id = Column(Integer, ForeignKey("drugs.id", ondelete="CASCADE"))
     phase = Column(SQLEnum(TrialPhase))
     status = Column(SQLEnum(TrialStatus))
     start_date = Column(Date)
@@ -58,15 +73,20 @@ class ClinicalTrial(Base):
 
     # Relationships
     drug = relationship("Drug", back_populates="clinical_trials")
-    trial_results = relationship("TrialResult", back_populates="trial")
+    trial_results = relationship(
+        "TrialResult", back_populates="trial", cascade="all", passive_deletes=True
+    )
 
 
 class TrialResult(Base):
     """Clinical Trial Results model"""
     __tablename__ = "trial_results"
+    __table_args__ = (
+        Index("idx_trial_results_trial_id", "trial_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    trial_id = Column(Integer, ForeignKey("clinical_trials.id"))
+    trial_id = Column(Integer, ForeignKey("clinical_trials.id", ondelete="CASCADE"))
     endpoint = Column(String(200))
     result_value = Column(Float)
     unit = Column(String(50))
@@ -82,14 +102,20 @@ class TrialResult(Base):
 class AdverseEvent(Base):
     """Adverse Events model"""
     __tablename__ = "adverse_events"
+    __table_args__ = (
+        Index("idx_adverse_events_drug_id", "drug_id"),
+        Index("idx_adverse_events_severity", "severity"),
+        Index("idx_adverse_events_drug_id_reported_date", "drug_id", "reported_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    drug_id = Column(Integer, ForeignKey("drugs.id"))
+    drug_id = Column(Integer, ForeignKey("drugs.id", ondelete="CASCADE"))
     event_type = Column(String(200))
     severity = Column(String(50))
     frequency = Column(Integer)
     description = Column(String(1000))
-    reported_date = Column(Date)
+    # Partition key on PostgreSQL (see database/schema.sql), so always set
+    reported_date = Column(Date, default=date.today)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
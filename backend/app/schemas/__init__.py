@@ -1,16 +1,20 @@
 """Schemas module"""
 from app.schemas.schemas import (
-    DrugCreate, DrugUpdate, DrugResponse,
-    ClinicalTrialCreate, ClinicalTrialUpdate, ClinicalTrialResponse,
+    DrugCreate, DrugUpdate, DrugUpsert, DrugResponse,
+    ClinicalTrialCreate, ClinicalTrialUpdate, ClinicalTrialUpsert, ClinicalTrialResponse,
     TrialResultCreate, TrialResultResponse,
     AdverseEventCreate, AdverseEventResponse,
-    AnalyticsSummary, DataQualityReport
+    AnalyticsSummary, DataQualityReport,
+    JobCreate, JobResponse,
+    BatchIds, DrugBatchResponse, ClinicalTrialBatchResponse, BulkDeleteResponse
 )
 
 __all__ = [
-    "DrugCreate", "DrugUpdate", "DrugResponse",
-    "ClinicalTrialCreate", "ClinicalTrialUpdate", "ClinicalTrialResponse",
+    "DrugCreate", "DrugUpdate", "DrugUpsert", "DrugResponse",
+    "ClinicalTrialCreate", "ClinicalTrialUpdate", "ClinicalTrialUpsert", "ClinicalTrialResponse",
     "TrialResultCreate", "TrialResultResponse",
     "AdverseEventCreate", "AdverseEventResponse",
-    "AnalyticsSummary", "DataQualityReport"
+    "AnalyticsSummary", "DataQualityReport",
+    "JobCreate", "JobResponse",
+    "BatchIds", "DrugBatchResponse", "ClinicalTrialBatchResponse", "BulkDeleteResponse"
 ]
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import date, datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from enum import Enum
 
 
@@ -41,6 +41,14 @@ class DrugUpdate(BaseModel):
     molecule_type: Optional[str] = None
 
 
+class DrugUpsert(BaseModel):
+    generic_name: Optional[str] = None
+    manufacturer: Optional[str] = None
+    approval_date: Optional[date] = None
+    therapeutic_area: Optional[str] = None
+    molecule_type: Optional[str] = None
+
+
 class DrugResponse(DrugBase):
     id: int
     created_at: datetime
@@ -79,6 +87,18 @@ class ClinicalTrialUpdate(BaseModel):
     sponsor: Optional[str] = None
 
 
+class ClinicalTrialUpsert(BaseModel):
+    title: str = Field(..., min_length=1, max_length=500)
+    drug_id: int
+    phase: TrialPhaseEnum
+    status: TrialStatusEnum
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    patient_count: Optional[int] = None
+    location: Optional[str] = None
+    sponsor: Optional[str] = None
+
+
 class ClinicalTrialResponse(ClinicalTrialBase):
     id: int
     created_at: datetime
@@ -88,6 +108,28 @@ class ClinicalTrialResponse(ClinicalTrialBase):
         from_attributes = True
 
 
+# Batch Schemas
+MAX_BATCH_IDS = 1000
+
+
+class BatchIds(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
+
+
+class DrugBatchResponse(BaseModel):
+    items: List[DrugResponse]
+    missing: List[int]
+
+
+class ClinicalTrialBatchResponse(BaseModel):
+    items: List[ClinicalTrialResponse]
+    missing: List[int]
+
+
+class BulkDeleteResponse(BaseModel):
+    deleted: Dict[str, int]
+
+
 # Trial Result Schemas
 class TrialResultBase(BaseModel):
     trial_id: int
@@ -150,3 +192,31 @@ class DataQualityReport(BaseModel):
     missing_data_percentage: float
     duplicate_records: int
     issues: List[str]
+
+
+# Job Schemas
+class JobStatusEnum(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobCreate(BaseModel):
+    kind: str = Field(..., min_length=1, max_length=100)
+    params: Dict[str, Any] = {}
+
+
+class JobResponse(BaseModel):
+    id: str
+    kind: str
+    status: JobStatusEnum
+    progress: float
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
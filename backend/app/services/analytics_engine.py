@@ -0,0 +1,222 @@
+"""
+DuckDB analytics engine
+
+Answers the aggregate analytics queries from a local Parquet snapshot (see
+app/services/snapshot.py) with an embedded DuckDB instead of the OLTP
+database, so heavy GROUP BYs do not compete with transactional writes.
+Enabled with ANALYTICS_ENGINE=duckdb; results match the SQL path in
+AnalyticsService but can be up to ANALYTICS_SNAPSHOT_MAX_AGE_SECONDS old.
+
+The first query builds a snapshot synchronously. After that a stale
+snapshot keeps serving while a fresh one is exported in the background.
+The previous snapshot is kept on disk until the next swap so queries that
+started on it can finish.
+
+Requires duckdb and pyarrow (both in requirements.txt); the application
+refuses to start with ANALYTICS_ENGINE=duckdb when either is missing.
+"""
+import logging
+import shutil
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.session import SessionLocal
+from app.models.models import TrialPhase, TrialStatus
+from app.schemas.schemas import AnalyticsSummary
+from app.services.snapshot import SNAPSHOT_MODELS, export_parquet_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+class _Snapshot:
+    def __init__(self, path: Path, connection, manifest: dict):
+        self.path = path
+        self.connection = connection
+        self.manifest = manifest
+        self.loaded_at = time.monotonic()
+
+
+class DuckDBAnalytics:
+    """Aggregate analytics over a periodically refreshed Parquet snapshot"""
+
+    def __init__(self, session_factory=SessionLocal, snapshot_dir=None, max_age_seconds: float = None):
+        self.session_factory = session_factory
+        self.snapshot_dir = Path(snapshot_dir or settings.ANALYTICS_SNAPSHOT_DIR)
+        self.max_age_seconds = (
+            settings.ANALYTICS_SNAPSHOT_MAX_AGE_SECONDS if max_age_seconds is None else max_age_seconds
+        )
+        self.refreshes = 0
+        self._current: Optional[_Snapshot] = None
+        self._previous: Optional[_Snapshot] = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.RLock()
+
+    @staticmethod
+    def check_dependencies():
+        """Raise RuntimeError if duckdb or pyarrow is not installed"""
+        missing = []
+        for package in ("duckdb", "pyarrow"):
+            try:
+                __import__(package)
+            except ImportError:
+                missing.append(package)
+        if missing:
+            raise RuntimeError(
+                f"ANALYTICS_ENGINE=duckdb requires {' and '.join(missing)}: pip install {' '.join(missing)}"
+            )
+
+    def refresh(self) -> _Snapshot:
+        """Export a new snapshot and switch queries over to it"""
+        try:
+            import duckdb
+        except ImportError:
+            raise ImportError("ANALYTICS_ENGINE=duckdb requires the 'duckdb' package: pip install duckdb")
+
+        with self._refresh_lock:
+            path = self.snapshot_dir / f"{time.time_ns()}"
+            db = self.session_factory()
+            try:
+                manifest = export_parquet_snapshot(db, path)
+            finally:
+                db.close()
+
+            connection = duckdb.connect(database=":memory:")
+            for model in SNAPSHOT_MODELS:
+                name = model.__tablename__
+                parquet = (path / manifest["tables"][name]["file"]).as_posix().replace("'", "''")
+                connection.execute(f"CREATE VIEW {name} AS SELECT * FROM read_parquet('{parquet}')")
+
+            snapshot = _Snapshot(path, connection, manifest)
+            with self._lock:
+                stale, self._previous, self._current = self._previous, self._current, snapshot
+            if stale is not None:
+                stale.connection.close()
+                shutil.rmtree(stale.path, ignore_errors=True)
+            self.refreshes += 1
+            return snapshot
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Analytics snapshot refresh failed")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="analytics-snapshot-refresh", daemon=True).start()
+
+    def _snapshot(self) -> _Snapshot:
+        snapshot = self._current
+        if snapshot is None:
+            with self._refresh_lock:
+                return self._current or self.refresh()
+        if time.monotonic() - snapshot.loaded_at > self.max_age_seconds:
+            self._refresh_in_background()
+        return snapshot
+
+    def query(self, sql: str, params: Optional[list] = None) -> List[tuple]:
+        """Run SQL against the snapshot tables (drugs, clinical_trials, trial_results, adverse_events)"""
+        cursor = self._snapshot().connection.cursor()
+        try:
+            return cursor.execute(sql, params or []).fetchall()
+        finally:
+            cursor.close()
+
+    def get_summary(self) -> AnalyticsSummary:
+        (total_drugs,), = self.query("SELECT COUNT(*) FROM drugs")
+        (total_trials, active_trials, completed_trials), = self.query(
+            "SELECT COUNT(*), COUNT(*) FILTER (WHERE status = ?), COUNT(*) FILTER (WHERE status = ?) "
+            "FROM clinical_trials",
+            [TrialStatus.ONGOING.value, TrialStatus.COMPLETED.value]
+        )
+        (total_adverse_events,), = self.query("SELECT COUNT(*) FROM adverse_events")
+        trials_by_phase = self.query("SELECT phase, COUNT(*) FROM clinical_trials GROUP BY phase")
+        trials_by_status = self.query("SELECT status, COUNT(*) FROM clinical_trials GROUP BY status")
+
+        # Key the distributions the same way as the SQL path (str of the enum member)
+        return AnalyticsSummary(
+            total_drugs=total_drugs,
+            total_trials=total_trials,
+            active_trials=active_trials,
+            completed_trials=completed_trials,
+            total_adverse_events=total_adverse_events,
+            trials_by_phase={str(TrialPhase(k) if k else k): v for k, v in trials_by_phase},
+            trials_by_status={str(TrialStatus(k) if k else k): v for k, v in trials_by_status}
+        )
+
+    def get_top_manufacturers(self, limit: int = 10) -> List[Dict[str, Any]]:
+        results = self.query(
+            "SELECT manufacturer, COUNT(id) FROM drugs GROUP BY manufacturer "
+            "ORDER BY COUNT(id) DESC, manufacturer NULLS LAST LIMIT ?",
+            [limit]
+        )
+        return [{"manufacturer": r[0], "drug_count": r[1]} for r in results if r[0]]
+
+    def get_trials_by_therapeutic_area(self) -> List[Dict[str, Any]]:
+        results = self.query(
+            "SELECT d.therapeutic_area, COUNT(t.id) FROM drugs d "
+            "JOIN clinical_trials t ON d.id = t.drug_id GROUP BY d.therapeutic_area "
+            "ORDER BY COUNT(t.id) DESC, d.therapeutic_area NULLS LAST"
+        )
+        return [{"therapeutic_area": r[0], "trial_count": r[1]} for r in results if r[0]]
+
+    def get_adverse_events_by_severity(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        drug_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        conditions, params = [], []
+        if drug_id is not None:
+            conditions.append("drug_id = ?")
+            params.append(drug_id)
+        if start_date is not None:
+            conditions.append("reported_date >= ?")
+            params.append(start_date)
+        if end_date is not None:
+            conditions.append("reported_date <= ?")
+            params.append(end_date)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        results = self.query(
+            "SELECT severity, COUNT(id), COALESCE(SUM(frequency), 0) FROM adverse_events "
+            f"{where}GROUP BY severity ORDER BY COUNT(id) DESC, severity NULLS LAST",
+            params
+        )
+        return [
+            {"severity": severity, "event_count": count, "total_frequency": int(total)}
+            for severity, count, total in results
+        ]
+
+    def stats(self) -> dict:
+        snapshot = self._current
+        return {
+            "engine": settings.ANALYTICS_ENGINE,
+            "refreshes": self.refreshes,
+            "data_version": snapshot.manifest["data_version"] if snapshot else None,
+            "snapshot_age_seconds": round(time.monotonic() - snapshot.loaded_at, 1) if snapshot else None,
+        }
+
+    def close(self):
+        """Close the DuckDB connections and remove the snapshots, after any running refresh"""
+        with self._refresh_lock, self._lock:
+            snapshots, self._current, self._previous = [self._current, self._previous], None, None
+        for snapshot in snapshots:
+            if snapshot is not None:
+                snapshot.connection.close()
+                shutil.rmtree(snapshot.path, ignore_errors=True)
+
+
+duckdb_analytics = DuckDBAnalytics()
+metrics.register_collector("analytics_engine", duckdb_analytics.stats)
@@ -0,0 +1,82 @@
+from datetime import date
+from pathlib import Path
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.core.config import settings
+from app.core.jobs import Job, job_manager
+from app.db.partitions import detach_adverse_event_partitions, ensure_adverse_event_partitions
+from app.models.models import Drug, ClinicalTrial
+from app.schemas.schemas import DrugResponse, ClinicalTrialResponse
+from app.services.services import AnalyticsService
+from app.services.snapshot import export_parquet_snapshot
+
+EXPORT_BATCH_SIZE = 1000
+
+
+def _export_table(db: Session, job: Job, model, response_model) -> List[dict]:
+    """Export a full table in primary key order, reporting progress per batch"""
+    total = db.query(model).count()
+    rows = []
+    last_id = 0
+    while True:
+        batch = (
+            db.query(model)
+            .filter(model.id > last_id)
+            .order_by(model.id)
+            .limit(EXPORT_BATCH_SIZE)
+            .all()
+        )
+        if not batch:
+            break
+        rows.extend(response_model.model_validate(row).model_dump() for row in batch)
+        last_id = batch[-1].id
+        db.expunge_all()
+        job.report_progress(len(rows) / total if total else 1.0)
+    return rows
+
+
+@job_manager.register("drugs_export")
+def export_drugs(db: Session, job: Job) -> List[dict]:
+    """Export all drugs"""
+    return _export_table(db, job, Drug, DrugResponse)
+
+
+@job_manager.register("clinical_trials_export")
+def export_clinical_trials(db: Session, job: Job) -> List[dict]:
+    """Export all clinical trials"""
+    return _export_table(db, job, ClinicalTrial, ClinicalTrialResponse)
+
+
+@job_manager.register("analytics_summary")
+def analytics_summary(db: Session, job: Job):
+    """Compute the analytics summary"""
+    return AnalyticsService.get_summary(db)
+
+
+@job_manager.register("data_quality")
+def data_quality(db: Session, job: Job):
+    """Compute the data quality report"""
+    return AnalyticsService.get_data_quality_report(db)
+
+
+@job_manager.register("parquet_snapshot")
+def parquet_snapshot(db: Session, job: Job, batch_size: Optional[int] = None):
+    """Export the analytical tables as a Parquet snapshot under SNAPSHOT_DIR/<job id>"""
+    output_dir = Path(settings.SNAPSHOT_DIR) / job.id
+    manifest = export_parquet_snapshot(db, output_dir, batch_size=batch_size, progress=job.report_progress)
+    return {"path": str(output_dir.resolve()), **manifest}
+
+
+@job_manager.register("adverse_event_partitions")
+def adverse_event_partitions(
+    db: Session,
+    job: Job,
+    months_ahead: Optional[int] = None,
+    detach_before: Optional[str] = None
+):
+    """Create upcoming adverse_events partitions and optionally detach old ones"""
+    created = ensure_adverse_event_partitions(db, months_ahead=months_ahead)
+    detached = []
+    if detach_before:
+        detached = detach_adverse_event_partitions(db, date.fromisoformat(detach_before))
+    return {"created": created, "detached": detached}
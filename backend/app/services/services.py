@@ -1,35 +1,283 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import delete, func, inspect, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, load_only, make_transient_to_detached
+from typing import Any, Dict, List, Optional, Tuple
 from app.models.models import Drug, ClinicalTrial, TrialResult, AdverseEvent, TrialStatus
 from app.schemas.schemas import (
-    DrugCreate, DrugUpdate,
-    ClinicalTrialCreate, ClinicalTrialUpdate,
+    DrugCreate, DrugUpdate, DrugUpsert, DrugResponse,
+    ClinicalTrialCreate, ClinicalTrialUpdate, ClinicalTrialUpsert, ClinicalTrialResponse,
     TrialResultCreate, AdverseEventCreate,
-    AnalyticsSummary
+    AnalyticsSummary, DataQualityReport
 )
-from datetime import datetime
+from app.core.cache import entity_cache
+from app.core.config import settings
+from app.core.events import event_broker
+from app.core.singleflight import single_flight
+from app.services.analytics_engine import duckdb_analytics
+from datetime import date, datetime
+
+
+def _publish_drug(action: str, db_drug: Drug):
+    """Invalidate the cached drug and publish a change event"""
+    entity_cache.invalidate("drug", db_drug.id)
+    data = DrugResponse.model_validate(db_drug).model_dump(mode="json")
+    event_broker.publish("drug", action, db_drug.id, data)
+
+
+def _publish_trial(action: str, db_trial: ClinicalTrial):
+    """Invalidate the cached trial and publish a change event"""
+    entity_cache.invalidate("clinical_trial", db_trial.id)
+    data = ClinicalTrialResponse.model_validate(db_trial).model_dump(mode="json")
+    event_broker.publish("clinical_trial", action, db_trial.id, data)
+
+
+def _commit(db: Session):
+    """
+    Commit, rolling back on a constraint violation so the session stays usable
+
+    The IntegrityError is re-raised and answered with 409 by the app.
+    """
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise
+
+
+def _query(db: Session, model, fields: Optional[List[str]] = None):
+    """Query a model, loading only the given columns if a fieldset is requested"""
+    query = db.query(model)
+    if fields:
+        query = query.options(load_only(*(getattr(model, f) for f in fields)))
+    return query
+
+
+def _reported_between(query, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    """Bound an adverse event query by reported_date (inclusive) for partition pruning"""
+    if start_date is not None:
+        query = query.filter(AdverseEvent.reported_date >= start_date)
+    if end_date is not None:
+        query = query.filter(AdverseEvent.reported_date <= end_date)
+    return query
+
+
+def _get_cached(db: Session, model, entity: str, entity_id: int, fields: Optional[List[str]] = None):
+    """
+    Read-through lookup by primary key
+
+    Hits are attached to the session with merge(load=False), which emits no
+    SQL. Misses load the full row so the cached copy can serve any fieldset.
+    """
+    if not entity_cache.enabled:
+        return _query(db, model, fields).filter(model.id == entity_id).first()
+    
+    snapshot, version = entity_cache.get(entity, entity_id)
+    if snapshot is not None:
+        obj = model(**snapshot)
+        make_transient_to_detached(obj)
+        return db.merge(obj, load=False)
+    
+    obj = db.query(model).filter(model.id == entity_id).first()
+    if obj is not None:
+        entity_cache.put(entity, entity_id, version, _row_snapshot(model, obj))
+    return obj
+
+
+def _row_snapshot(model, obj) -> Dict[str, Any]:
+    """Column values of a loaded row, as stored in the entity cache"""
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(model).column_attrs}
+
+
+def warm_entity_cache(db: Session, limit: int) -> int:
+    """
+    Preload the most recently updated drugs and trials into the entity cache
+
+    Versions are read before the rows are loaded, like a read-through miss,
+    so a write racing the warm-up invalidates what it stored.
+    """
+    if not entity_cache.enabled or limit <= 0:
+        return 0
+    warmed = 0
+    for model, entity in ((Drug, "drug"), (ClinicalTrial, "clinical_trial")):
+        ids = [
+            row[0] for row in
+            db.query(model.id).order_by(model.updated_at.desc(), model.id.desc()).limit(limit).all()
+        ]
+        versions = {entity_id: entity_cache.version(entity, entity_id) for entity_id in ids}
+        for obj in db.query(model).filter(model.id.in_(ids)).all():
+            entity_cache.put(entity, obj.id, versions[obj.id], _row_snapshot(model, obj))
+            warmed += 1
+        db.expunge_all()
+    return warmed
+
+
+def _fetch_by_ids(db: Session, model, ids: List[int], fields: Optional[List[str]] = None):
+    """Resolve a list of primary keys with a single IN query, keeping input order"""
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return [], []
+    found = {row.id: row for row in _query(db, model, fields).filter(model.id.in_(ids)).all()}
+    return [found[i] for i in ids if i in found], [i for i in ids if i not in found]
+
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE ... RETURNING
+NATIVE_UPSERT_DIALECTS = ("postgresql", "sqlite")
+
+
+def _upsert(db: Session, model, key: str, rows: List[Dict[str, Any]]) -> list:
+    """
+    Insert rows or update them on a natural key conflict
+
+    Uses one INSERT ... ON CONFLICT DO UPDATE ... RETURNING statement on
+    PostgreSQL and SQLite, and a select followed by inserts and updates on
+    other databases. Only the columns present in the rows are overwritten
+    on update. Rows with the same key are merged, a later row winning over
+    an earlier one; one row comes back per input row, in input order, so
+    duplicates get the same merged row.
+    """
+    keys = [row[key] for row in rows]
+    rows = list({row[key]: row for row in rows}.values())
+    now = datetime.utcnow()
+    
+    dialect = db.get_bind().dialect.name
+    if dialect not in NATIVE_UPSERT_DIALECTS:
+        returned = _select_then_upsert(db, model, key, rows, now)
+    else:
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        rows = [{**row, "created_at": now, "updated_at": now} for row in rows]
+        stmt = insert(model).values(rows)
+        update_columns = {
+            column: stmt.excluded[column]
+            for column in rows[0] if column not in (key, "created_at")
+        }
+        stmt = stmt.on_conflict_do_update(index_elements=[key], set_=update_columns).returning(model)
+        returned = db.scalars(stmt, execution_options={"populate_existing": True}).all()
+    
+    # Detach before commit so the returned rows stay loaded instead of being expired
+    for obj in returned:
+        db.expunge(obj)
+    _commit(db)
+    by_key = {getattr(obj, key): obj for obj in returned}
+    return [by_key[k] for k in keys]
+
+
+def _select_then_upsert(db: Session, model, key: str, rows: List[Dict[str, Any]], now: datetime) -> list:
+    """
+    Portable upsert: load the rows whose keys exist, update them and insert the rest
+
+    A concurrent insert of the same key surfaces as an IntegrityError on commit.
+    """
+    matches = db.query(model).filter(getattr(model, key).in_([row[key] for row in rows]))
+    existing = {getattr(obj, key): obj for obj in matches}
+    objs = []
+    for row in rows:
+        obj = existing.get(row[key])
+        if obj is None:
+            obj = model(**row, created_at=now, updated_at=now)
+            db.add(obj)
+        else:
+            for name, value in row.items():
+                setattr(obj, name, value)
+            obj.updated_at = now
+        objs.append(obj)
+    db.flush()
+    return objs
+
+
+def _upsert_action(obj) -> str:
+    """Tell an inserted row from an updated one (inserts keep created_at == updated_at)"""
+    return "created" if obj.created_at == obj.updated_at else "updated"
+
+
+def _delete_drugs(db: Session, *conditions) -> Tuple[List[int], Dict[str, int]]:
+    """
+    Delete drugs and their children with set-based statements
+
+    Children are deleted explicitly, child tables first, rather than left to
+    ON DELETE CASCADE: databases created before revision 0004 have foreign
+    keys that do not cascade. Counts come from the statements themselves.
+    Deleted trials are invalidated in the cache and published as deleted,
+    with the fields subscribers filter on; callers publish the drugs.
+    """
+    drug_ids = select(Drug.id).where(*conditions)
+    trial_ids = select(ClinicalTrial.id).where(ClinicalTrial.drug_id.in_(drug_ids))
+    options = {"synchronize_session": False}
+    
+    counts = {
+        "trial_results": db.execute(
+            delete(TrialResult).where(TrialResult.trial_id.in_(trial_ids)), execution_options=options
+        ).rowcount,
+    }
+    cascaded_trials = db.execute(
+        delete(ClinicalTrial).where(ClinicalTrial.drug_id.in_(drug_ids)).returning(
+            ClinicalTrial.id, ClinicalTrial.drug_id, ClinicalTrial.sponsor, ClinicalTrial.status
+        ),
+        execution_options=options
+    ).all()
+    counts["clinical_trials"] = len(cascaded_trials)
+    counts["adverse_events"] = db.execute(
+        delete(AdverseEvent).where(AdverseEvent.drug_id.in_(drug_ids)), execution_options=options
+    ).rowcount
+    deleted_ids = db.scalars(
+        delete(Drug).where(*conditions).returning(Drug.id), execution_options=options
+    ).all()
+    _commit(db)
+    counts["drugs"] = len(deleted_ids)
+    
+    for drug_id in deleted_ids:
+        entity_cache.invalidate("drug", drug_id)
+    for trial in cascaded_trials:
+        entity_cache.invalidate("clinical_trial", trial.id)
+        event_broker.publish("clinical_trial", "deleted", trial.id, {
+            "id": trial.id,
+            "drug_id": trial.drug_id,
+            "sponsor": trial.sponsor,
+            "status": trial.status.value if trial.status else None,
+        })
+    return deleted_ids, counts
+
+
+def _check_drugs_exist(db: Session, drug_ids: List[int]):
+    """Raise ValueError for drug IDs a trial write would reference but that do not exist"""
+    wanted = set(drug_ids)
+    missing = sorted(wanted - set(db.scalars(select(Drug.id).where(Drug.id.in_(wanted)))))
+    if missing:
+        raise ValueError(f"Drug not found: {', '.join(str(i) for i in missing)}")
 
 
 class DrugService:
     """Service layer for Drug operations"""
     
     @staticmethod
-    def get_all_drugs(db: Session, skip: int = 0, limit: int = 100) -> List[Drug]:
+    def get_all_drugs(
+        db: Session, skip: int = 0, limit: int = 100, fields: Optional[List[str]] = None
+    ) -> List[Drug]:
         """Get all drugs with pagination"""
-        return db.query(Drug).offset(skip).limit(limit).all()
+        return _query(db, Drug, fields).offset(skip).limit(limit).all()
     
     @staticmethod
-    def get_drug_by_id(db: Session, drug_id: int) -> Optional[Drug]:
+    def get_drug_by_id(db: Session, drug_id: int, fields: Optional[List[str]] = None) -> Optional[Drug]:
         """Get a specific drug by ID"""
-        return db.query(Drug).filter(Drug.id == drug_id).first()
+        return _get_cached(db, Drug, "drug", drug_id, fields)
+    
+    @staticmethod
+    def get_drugs_by_ids(
+        db: Session, drug_ids: List[int], fields: Optional[List[str]] = None
+    ) -> Tuple[List[Drug], List[int]]:
+        """Get drugs for a list of IDs in one query, in input order, plus the missing IDs"""
+        return _fetch_by_ids(db, Drug, drug_ids, fields)
     
     @staticmethod
     def create_drug(db: Session, drug: DrugCreate) -> Drug:
         """Create a new drug"""
         db_drug = Drug(**drug.model_dump())
         db.add(db_drug)
-        db.commit()
+        _commit(db)
         db.refresh(db_drug)
+        _publish_drug("created", db_drug)
         return db_drug
     
     @staticmethod
@@ -41,46 +289,105 @@ class DrugService:
             for key, value in update_data.items():
                 setattr(db_drug, key, value)
             db_drug.updated_at = datetime.utcnow()
-            db.commit()
+            _commit(db)
             db.refresh(db_drug)
+            _publish_drug("updated", db_drug)
         return db_drug
     
+    @staticmethod
+    def upsert_drug(db: Session, name: str, drug: DrugUpsert) -> Drug:
+        """Create or update a drug identified by its name"""
+        row = {**drug.model_dump(exclude_unset=True), "name": name}
+        db_drug = _upsert(db, Drug, "name", [row])[0]
+        _publish_drug(_upsert_action(db_drug), db_drug)
+        return db_drug
+    
+    @staticmethod
+    def bulk_upsert_drugs(db: Session, drugs: List[DrugCreate]) -> List[Drug]:
+        """Create or update many drugs identified by name in one statement, one result per input"""
+        if not drugs:
+            return []
+        db_drugs = _upsert(db, Drug, "name", [drug.model_dump() for drug in drugs])
+        for db_drug in dict.fromkeys(db_drugs):
+            _publish_drug(_upsert_action(db_drug), db_drug)
+        return db_drugs
+    
     @staticmethod
     def delete_drug(db: Session, drug_id: int) -> bool:
-        """Delete a drug"""
+        """Delete a drug and, through the database cascade, its trials and events"""
         db_drug = db.query(Drug).filter(Drug.id == drug_id).first()
         if db_drug:
-            db.delete(db_drug)
-            db.commit()
+            data = DrugResponse.model_validate(db_drug).model_dump(mode="json")
+            db.expunge(db_drug)
+            _delete_drugs(db, Drug.id == drug_id)
+            event_broker.publish("drug", "deleted", drug_id, data)
             return True
         return False
+    
+    @staticmethod
+    def bulk_delete_drugs(
+        db: Session, drug_ids: Optional[List[int]] = None, manufacturer: Optional[str] = None
+    ) -> Dict[str, int]:
+        """
+        Delete all drugs matching the given IDs and/or manufacturer
+        
+        Returns:
+            Number of deleted rows per table
+        """
+        conditions = []
+        if drug_ids is not None:
+            conditions.append(Drug.id.in_(drug_ids))
+        if manufacturer is not None:
+            conditions.append(Drug.manufacturer == manufacturer)
+        if not conditions:
+            raise ValueError("At least one of drug_ids or manufacturer is required")
+        
+        deleted_ids, counts = _delete_drugs(db, *conditions)
+        for drug_id in deleted_ids:
+            event_broker.publish("drug", "deleted", drug_id, {"id": drug_id})
+        return counts
 
 
 class ClinicalTrialService:
     """Service layer for Clinical Trial operations"""
     
     @staticmethod
-    def get_all_trials(db: Session, skip: int = 0, limit: int = 100) -> List[ClinicalTrial]:
+    def get_all_trials(
+        db: Session, skip: int = 0, limit: int = 100, fields: Optional[List[str]] = None
+    ) -> List[ClinicalTrial]:
         """Get all clinical trials with pagination"""
-        return db.query(ClinicalTrial).offset(skip).limit(limit).all()
+        return _query(db, ClinicalTrial, fields).offset(skip).limit(limit).all()
     
     @staticmethod
-    def get_trial_by_id(db: Session, trial_id: int) -> Optional[ClinicalTrial]:
+    def get_trial_by_id(
+        db: Session, trial_id: int, fields: Optional[List[str]] = None
+    ) -> Optional[ClinicalTrial]:
         """Get a specific trial by ID"""
-        return db.query(ClinicalTrial).filter(ClinicalTrial.id == trial_id).first()
+        return _get_cached(db, ClinicalTrial, "clinical_trial", trial_id, fields)
     
     @staticmethod
-    def get_trials_by_drug(db: Session, drug_id: int) -> List[ClinicalTrial]:
+    def get_trials_by_ids(
+        db: Session, trial_ids: List[int], fields: Optional[List[str]] = None
+    ) -> Tuple[List[ClinicalTrial], List[int]]:
+        """Get trials for a list of IDs in one query, in input order, plus the missing IDs"""
+        return _fetch_by_ids(db, ClinicalTrial, trial_ids, fields)
+    
+    @staticmethod
+    def get_trials_by_drug(
+        db: Session, drug_id: int, fields: Optional[List[str]] = None
+    ) -> List[ClinicalTrial]:
         """Get all trials for a specific drug"""
-        return db.query(ClinicalTrial).filter(ClinicalTrial.drug_id == drug_id).all()
+        return _query(db, ClinicalTrial, fields).filter(ClinicalTrial.drug_id == drug_id).all()
     
     @staticmethod
     def create_trial(db: Session, trial: ClinicalTrialCreate) -> ClinicalTrial:
-        """Create a new clinical trial"""
+        """Create a new clinical trial (ValueError if its drug does not exist)"""
+        _check_drugs_exist(db, [trial.drug_id])
         db_trial = ClinicalTrial(**trial.model_dump())
         db.add(db_trial)
-        db.commit()
+        _commit(db)
         db.refresh(db_trial)
+        _publish_trial("created", db_trial)
         return db_trial
     
     @staticmethod
@@ -92,17 +399,50 @@ class ClinicalTrialService:
             for key, value in update_data.items():
                 setattr(db_trial, key, value)
             db_trial.updated_at = datetime.utcnow()
-            db.commit()
+            _commit(db)
             db.refresh(db_trial)
+            _publish_trial("updated", db_trial)
         return db_trial
+    
+    @staticmethod
+    def upsert_trial(db: Session, trial_id: str, trial: ClinicalTrialUpsert) -> ClinicalTrial:
+        """Create or update a trial identified by its trial_id (ValueError if its drug does not exist)"""
+        _check_drugs_exist(db, [trial.drug_id])
+        row = {**trial.model_dump(exclude_unset=True), "trial_id": trial_id}
+        db_trial = _upsert(db, ClinicalTrial, "trial_id", [row])[0]
+        _publish_trial(_upsert_action(db_trial), db_trial)
+        return db_trial
+    
+    @staticmethod
+    def bulk_upsert_trials(db: Session, trials: List[ClinicalTrialCreate]) -> List[ClinicalTrial]:
+        """
+        Create or update many clinical trials identified by trial_id in one statement
+
+        Returns one trial per input; raises ValueError if any drug does not exist.
+        """
+        if not trials:
+            return []
+        _check_drugs_exist(db, [trial.drug_id for trial in trials])
+        db_trials = _upsert(db, ClinicalTrial, "trial_id", [trial.model_dump() for trial in trials])
+        for db_trial in dict.fromkeys(db_trials):
+            _publish_trial(_upsert_action(db_trial), db_trial)
+        return db_trials
+
+
+def _use_duckdb() -> bool:
+    """Whether aggregates are answered by the DuckDB snapshot engine"""
+    return settings.ANALYTICS_ENGINE == "duckdb"
 
 
 class AnalyticsService:
     """Service layer for Analytics operations"""
     
     @staticmethod
+    @single_flight.coalesced("analytics.summary")
     def get_summary(db: Session) -> AnalyticsSummary:
         """Get analytics summary"""
+        if _use_duckdb():
+            return duckdb_analytics.get_summary()
         total_drugs = db.query(Drug).count()
         total_trials = db.query(ClinicalTrial).count()
         active_trials = db.query(ClinicalTrial).filter(
@@ -137,6 +477,110 @@ class AnalyticsService:
             trials_by_phase={str(k): v for k, v in trials_by_phase.items()},
             trials_by_status={str(k): v for k, v in trials_by_status.items()}
         )
+    
+    @staticmethod
+    @single_flight.coalesced("analytics.top_manufacturers")
+    def get_top_manufacturers(db: Session, limit: int = 10) -> List[Dict[str, Any]]:
+        """Manufacturers with the most drugs"""
+        if _use_duckdb():
+            return duckdb_analytics.get_top_manufacturers(limit)
+        results = (
+            db.query(Drug.manufacturer, func.count(Drug.id))
+            .group_by(Drug.manufacturer)
+            .order_by(func.count(Drug.id).desc(), Drug.manufacturer.asc().nullslast())
+            .limit(limit)
+            .all()
+        )
+        return [{"manufacturer": r[0], "drug_count": r[1]} for r in results if r[0]]
+    
+    @staticmethod
+    @single_flight.coalesced("analytics.trials_by_therapeutic_area")
+    def get_trials_by_therapeutic_area(db: Session) -> List[Dict[str, Any]]:
+        """Number of clinical trials per therapeutic area"""
+        if _use_duckdb():
+            return duckdb_analytics.get_trials_by_therapeutic_area()
+        results = (
+            db.query(Drug.therapeutic_area, func.count(ClinicalTrial.id))
+            .join(ClinicalTrial, Drug.id == ClinicalTrial.drug_id)
+            .group_by(Drug.therapeutic_area)
+            .order_by(func.count(ClinicalTrial.id).desc(), Drug.therapeutic_area.asc().nullslast())
+            .all()
+        )
+        return [{"therapeutic_area": r[0], "trial_count": r[1]} for r in results if r[0]]
+    
+    @staticmethod
+    @single_flight.coalesced("analytics.adverse_events_by_severity")
+    def get_adverse_events_by_severity(
+        db: Session,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        drug_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Adverse event counts and total frequency per severity within a reported_date range"""
+        if _use_duckdb():
+            return duckdb_analytics.get_adverse_events_by_severity(start_date, end_date, drug_id)
+        query = db.query(
+            AdverseEvent.severity,
+            func.count(AdverseEvent.id),
+            func.coalesce(func.sum(AdverseEvent.frequency), 0)
+        )
+        if drug_id is not None:
+            query = query.filter(AdverseEvent.drug_id == drug_id)
+        query = _reported_between(query, start_date, end_date)
+        results = (
+            query.group_by(AdverseEvent.severity)
+            .order_by(func.count(AdverseEvent.id).desc(), AdverseEvent.severity.asc().nullslast())
+            .all()
+        )
+        return [
+            {"severity": severity, "event_count": count, "total_frequency": total}
+            for severity, count, total in results
+        ]
+    
+    @staticmethod
+    @single_flight.coalesced("analytics.data_quality_report")
+    def get_data_quality_report(db: Session) -> DataQualityReport:
+        """Get a data quality report across drugs and clinical trials"""
+        from sqlalchemy import func, or_
+        total_drugs = db.query(Drug).count()
+        total_trials = db.query(ClinicalTrial).count()
+        
+        drugs_missing_fields = db.query(Drug).filter(or_(
+            Drug.manufacturer.is_(None),
+            Drug.therapeutic_area.is_(None),
+            Drug.approval_date.is_(None)
+        )).count()
+        trials_missing_fields = db.query(ClinicalTrial).filter(or_(
+            ClinicalTrial.drug_id.is_(None),
+            ClinicalTrial.start_date.is_(None),
+            ClinicalTrial.patient_count.is_(None)
+        )).count()
+        trials_invalid_dates = db.query(ClinicalTrial).filter(
+            ClinicalTrial.end_date < ClinicalTrial.start_date
+        ).count()
+        duplicate_drugs = total_drugs - db.query(func.count(func.distinct(Drug.name))).scalar()
+        
+        issues = []
+        if drugs_missing_fields:
+            issues.append(f"Found {drugs_missing_fields} drugs with missing fields")
+        if trials_missing_fields:
+            issues.append(f"Found {trials_missing_fields} trials with missing fields")
+        if trials_invalid_dates:
+            issues.append(f"Found {trials_invalid_dates} trials where end_date < start_date")
+        if duplicate_drugs:
+            issues.append(f"Found {duplicate_drugs} duplicate drug names")
+        
+        total_records = total_drugs + total_trials
+        records_with_issues = drugs_missing_fields + trials_missing_fields + trials_invalid_dates
+        return DataQualityReport(
+            total_records=total_records,
+            records_with_issues=records_with_issues,
+            missing_data_percentage=round(
+                (drugs_missing_fields + trials_missing_fields) / total_records * 100, 2
+            ) if total_records else 0.0,
+            duplicate_records=duplicate_drugs,
+            issues=issues
+        )
 
 
 class TrialResultService:
@@ -147,7 +591,7 @@ class TrialResultService:
         """Create a new trial result"""
         db_result = TrialResult(**result.model_dump())
         db.add(db_result)
-        db.commit()
+        _commit(db)
         db.refresh(db_result)
         return db_result
     
@@ -165,11 +609,22 @@ class AdverseEventService:
         """Create a new adverse event"""
         db_event = AdverseEvent(**event.model_dump())
         db.add(db_event)
-        db.commit()
+        _commit(db)
         db.refresh(db_event)
         return db_event
     
     @staticmethod
-    def get_events_by_drug(db: Session, drug_id: int) -> List[AdverseEvent]:
-        """Get all adverse events for a specific drug"""
-        return db.query(AdverseEvent).filter(AdverseEvent.drug_id == drug_id).all()
+    def get_events_by_drug(
+        db: Session,
+        drug_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[AdverseEvent]:
+        """
+        Get adverse events for a specific drug, optionally within a reported_date range
+
+        Date bounds let PostgreSQL prune adverse_events partitions outside the range.
+        """
+        query = db.query(AdverseEvent).filter(AdverseEvent.drug_id == drug_id)
+        query = _reported_between(query, start_date, end_date)
+        return query.order_by(AdverseEvent.reported_date, AdverseEvent.id).all()
@@ -0,0 +1,184 @@
+"""
+Parquet snapshot export of the analytical tables
+
+Writes drugs, clinical_trials, trial_results and adverse_events to one
+Parquet file each, plus a manifest.json with row counts and a data version.
+Rows are streamed from the database in batches inside a single read
+transaction, so the files are consistent with each other and memory use is
+bounded by the batch size. Text and enum columns are dictionary-encoded and
+every row group carries min/max statistics.
+
+Requires pyarrow (pip install pyarrow).
+
+Usage:
+    python -m app.services.snapshot ./snapshots/2024-01-01
+"""
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import Date, DateTime, Enum, Float, Integer, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import Drug, ClinicalTrial, TrialResult, AdverseEvent
+
+SNAPSHOT_MODELS = [Drug, ClinicalTrial, TrialResult, AdverseEvent]
+MANIFEST_FILE = "manifest.json"
+FORMAT_VERSION = 1
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet snapshots require the 'pyarrow' package: pip install pyarrow")
+    return pyarrow, pyarrow.parquet
+
+
+def _arrow_field(pa, column):
+    """Arrow field for a table column; text and enums become dictionary-encoded strings"""
+    if isinstance(column.type, Enum) or not isinstance(column.type, (Integer, Float, Date, DateTime)):
+        arrow_type = pa.dictionary(pa.int32(), pa.string())
+    elif isinstance(column.type, Integer):
+        arrow_type = pa.int64()
+    elif isinstance(column.type, Float):
+        arrow_type = pa.float64()
+    elif isinstance(column.type, DateTime):
+        arrow_type = pa.timestamp("us")
+    else:
+        arrow_type = pa.date32()
+    return pa.field(column.name, arrow_type, nullable=column.nullable)
+
+
+def _to_arrow_batch(pa, schema, rows):
+    """Convert a list of result rows to an Arrow table with the given schema"""
+    columns = list(zip(*rows)) if rows else [[] for _ in schema]
+    arrays = []
+    for field, values in zip(schema, columns):
+        if pa.types.is_dictionary(field.type):
+            values = [v.value if hasattr(v, "value") else v for v in values]
+            arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def export_parquet_snapshot(
+    db: Session,
+    output_dir,
+    batch_size: Optional[int] = None,
+    progress: Optional[Callable[[float], None]] = None
+) -> Dict:
+    """
+    Export the analytical tables to Parquet files in output_dir
+
+    Each fetched batch becomes one row group. The manifest is written last,
+    so a directory with a manifest.json holds a complete snapshot. Its
+    data_version is derived from the file contents: two snapshots of the same
+    data share a version. Returns the manifest.
+    """
+    pa, pq = _require_pyarrow()
+    batch_size = batch_size or settings.SNAPSHOT_BATCH_SIZE
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if db.get_bind().dialect.name == "postgresql":
+        conn = db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    else:
+        conn = db.connection()
+
+    tables = [model.__table__ for model in SNAPSHOT_MODELS]
+    totals = {table.name: conn.execute(select(func.count()).select_from(table)).scalar() for table in tables}
+    grand_total = sum(totals.values())
+    exported = 0
+    manifest_tables = {}
+
+    for table in tables:
+        schema = pa.schema([_arrow_field(pa, column) for column in table.columns])
+        text_columns = [field.name for field in schema if pa.types.is_dictionary(field.type)]
+        path = output_dir / f"{table.name}.parquet"
+        tmp_path = path.with_name(path.name + ".tmp")
+
+        rows_written = 0
+        result = conn.execute(
+            select(table).order_by(*table.primary_key.columns),
+            execution_options={"stream_results": True, "yield_per": batch_size}
+        )
+        with pq.ParquetWriter(
+            tmp_path, schema,
+            use_dictionary=text_columns,
+            write_statistics=True,
+            compression="zstd"
+        ) as writer:
+            for rows in result.partitions():
+                writer.write_table(_to_arrow_batch(pa, schema, rows), row_group_size=batch_size)
+                rows_written += len(rows)
+                exported += len(rows)
+                if progress:
+                    progress(exported / grand_total if grand_total else 1.0)
+            if rows_written == 0:
+                writer.write_table(_to_arrow_batch(pa, schema, []))
+        os.replace(tmp_path, path)
+
+        manifest_tables[table.name] = {
+            "file": path.name,
+            "rows": rows_written,
+            "sha256": _file_digest(path),
+            "columns": {field.name: str(field.type) for field in schema},
+        }
+
+    version = hashlib.sha256()
+    for name in sorted(manifest_tables):
+        version.update(f"{name}:{manifest_tables[name]['sha256']}".encode())
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "data_version": version.hexdigest()[:16],
+        "created_at": datetime.utcnow().isoformat(),
+        "tables": manifest_tables,
+    }
+    manifest_path = output_dir / MANIFEST_FILE
+    tmp_manifest = manifest_path.with_name(MANIFEST_FILE + ".tmp")
+    tmp_manifest.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp_manifest, manifest_path)
+    if progress:
+        progress(1.0)
+    return manifest
+
+
+def main():
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Export a Parquet snapshot of the DataMAx tables")
+    parser.add_argument("output_dir", help="Directory to write the snapshot to")
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.SNAPSHOT_BATCH_SIZE,
+        help="Rows fetched per batch (and per Parquet row group)"
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        manifest = export_parquet_snapshot(db, args.output_dir, batch_size=args.batch_size)
+    finally:
+        db.close()
+    for name, table in manifest["tables"].items():
+        print(f"{name}: {table['rows']} rows -> {table['file']}")
+    print(f"data_version: {manifest['data_version']}")
+
+
+if __name__ == "__main__":
+    main()
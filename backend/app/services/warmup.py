@@ -0,0 +1,121 @@
+"""
+Worker warm-up and readiness
+
+At startup each worker pre-opens database connections, creates upcoming
+adverse_events partitions, preloads hot entities into the entity cache and
+runs the analytics aggregates once, so the first requests it serves do not
+pay for cold connections, caches or query plans. /health/ready reports ready
+only once this has completed and the database still answers.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.partitions import ensure_adverse_event_partitions
+from app.db.session import SessionLocal
+from app.services.services import AnalyticsService, DrugService, warm_entity_cache
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """Warm-up state of this worker"""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self.warmed = False
+        self.draining = False
+        self.steps: Dict[str, dict] = {}
+        self.error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def _step(self, name: str, fn, required: bool = True):
+        started = time.monotonic()
+        try:
+            result = fn()
+        except Exception as e:
+            if required:
+                raise
+            logger.exception(f"Warm-up step '{name}' failed")
+            result = f"failed: {e}"
+        self.steps[name] = {"ms": round((time.monotonic() - started) * 1000, 1), "result": result}
+
+    def _open_connections(self) -> int:
+        """Check out connections concurrently so the pool holds them open"""
+        count = max(settings.WARMUP_POOL_CONNECTIONS, 1)
+        bind = self.session_factory.kw.get("bind")
+        pool_size = getattr(getattr(bind, "pool", None), "size", None)
+        # Pools without a size (StaticPool, SingletonThreadPool) hold a single connection
+        count = min(count, pool_size()) if callable(pool_size) else 1
+
+        def ping(_):
+            db = self.session_factory()
+            try:
+                db.execute(text("SELECT 1"))
+            finally:
+                db.close()
+
+        with ThreadPoolExecutor(max_workers=count) as pool:
+            list(pool.map(ping, range(count)))
+        return count
+
+    def _with_session(self, fn):
+        db = self.session_factory()
+        try:
+            return fn(db)
+        finally:
+            db.close()
+
+    def _warm_queries(self, db) -> int:
+        """Run the hot read paths once to compile statements and load the pages they touch"""
+        DrugService.get_all_drugs(db, limit=100)
+        AnalyticsService.get_summary(db)
+        AnalyticsService.get_top_manufacturers(db)
+        AnalyticsService.get_trials_by_therapeutic_area(db)
+        AnalyticsService.get_adverse_events_by_severity(db)
+        db.expunge_all()
+        return 5
+
+    def warm_up(self) -> bool:
+        """Run the warm-up steps; returns whether the worker is warm"""
+        with self._lock:
+            if self.warmed:
+                return True
+            try:
+                self._step("connections", self._open_connections)
+                self._step("partitions", lambda: self._with_session(ensure_adverse_event_partitions),
+                           required=False)
+                self._step("entity_cache", lambda: self._with_session(
+                    lambda db: warm_entity_cache(db, settings.WARMUP_CACHE_ENTITIES)
+                ))
+                self._step("queries", lambda: self._with_session(self._warm_queries))
+            except Exception as e:
+                self.error = str(e)
+                logger.exception("Warm-up failed")
+                return False
+            self.error = None
+            self.warmed = True
+            return True
+
+    def check_database(self) -> bool:
+        try:
+            self._with_session(lambda db: db.execute(text("SELECT 1")))
+            return True
+        except Exception:
+            return False
+
+    def status(self) -> dict:
+        return {
+            "warmed": self.warmed,
+            "draining": self.draining,
+            "steps": self.steps,
+            "error": self.error,
+        }
+
+
+readiness = Readiness()
@@ -0,0 +1,98 @@
+"""Initial schema
+
+Creates the four core tables. Tables that already exist (databases set up
+from database/schema.sql or Base.metadata.create_all) are left untouched, so
+every deployment can be brought under migration control with `upgrade head`;
+revision 0004 later rebuilds their foreign keys with ON DELETE CASCADE.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "drugs" not in existing:
+        op.create_table(
+            "drugs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(200), nullable=False),
+            sa.Column("generic_name", sa.String(200)),
+            sa.Column("manufacturer", sa.String(200)),
+            sa.Column("approval_date", sa.Date()),
+            sa.Column("therapeutic_area", sa.String(100)),
+            sa.Column("molecule_type", sa.String(100)),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("updated_at", sa.DateTime()),
+        )
+        op.create_index("ix_drugs_name", "drugs", ["name"], unique=True)
+
+    if "clinical_trials" not in existing:
+        op.create_table(
+            "clinical_trials",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("trial_id", sa.String(50), nullable=False),
+            sa.Column("title", sa.String(500), nullable=False),
+            sa.Column("drug_id", sa.Integer(), sa.ForeignKey("drugs.id", ondelete="CASCADE")),
+            sa.Column("phase", sa.Enum("PHASE_1", "PHASE_2", "PHASE_3", "PHASE_4", name="trialphase")),
+            sa.Column(
+                "status",
+                sa.Enum("PLANNED", "ONGOING", "COMPLETED", "TERMINATED", name="trialstatus")
+            ),
+            sa.Column("start_date", sa.Date()),
+            sa.Column("end_date", sa.Date()),
+            sa.Column("patient_count", sa.Integer()),
+            sa.Column("location", sa.String(200)),
+            sa.Column("sponsor", sa.String(200)),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("updated_at", sa.DateTime()),
+        )
+        op.create_index("ix_clinical_trials_trial_id", "clinical_trials", ["trial_id"], unique=True)
+
+    if "trial_results" not in existing:
+        op.create_table(
+            "trial_results",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "trial_id", sa.Integer(), sa.ForeignKey("clinical_trials.id", ondelete="CASCADE")
+            ),
+            sa.Column("endpoint", sa.String(200)),
+            sa.Column("result_value", sa.Float()),
+            sa.Column("unit", sa.String(50)),
+            sa.Column("p_value", sa.Float()),
+            sa.Column("confidence_interval", sa.String(100)),
+            sa.Column("notes", sa.String(1000)),
+            sa.Column("created_at", sa.DateTime()),
+        )
+
+    if "adverse_events" not in existing:
+        op.create_table(
+            "adverse_events",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("drug_id", sa.Integer(), sa.ForeignKey("drugs.id", ondelete="CASCADE")),
+            sa.Column("event_type", sa.String(200)),
+            sa.Column("severity", sa.String(50)),
+            sa.Column("frequency", sa.Integer()),
+            sa.Column("description", sa.String(1000)),
+            sa.Column("reported_date", sa.Date()),
+            sa.Column("created_at", sa.DateTime()),
+        )
+
+
+def downgrade():
+    op.drop_table("adverse_events")
+    op.drop_table("trial_results")
+    op.drop_table("clinical_trials")
+    op.drop_table("drugs")
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TYPE IF EXISTS trialstatus")
+        op.execute("DROP TYPE IF EXISTS trialphase")
@@ -0,0 +1,81 @@
+"""Index parity with database/schema.sql plus composite indexes
+
+Creates every index declared in app/models/models.py and schema.sql that is
+missing. An index is considered present if any existing index or unique
+constraint covers exactly the same columns, whatever its name, so databases
+created from schema.sql (idx_*), create_all (ix_*) or revision 0001 all end
+up with the same set. On PostgreSQL indexes are built CONCURRENTLY so tables
+stay writable during the upgrade.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, unique)
+INDEXES = [
+    ("unique_drug_name", "drugs", ["name"], True),
+    ("idx_drugs_manufacturer", "drugs", ["manufacturer"], False),
+    ("idx_drugs_therapeutic_area", "drugs", ["therapeutic_area"], False),
+    ("idx_trials_drug_id", "clinical_trials", ["drug_id"], False),
+    ("idx_trials_phase", "clinical_trials", ["phase"], False),
+    ("idx_trials_status", "clinical_trials", ["status"], False),
+    ("idx_trials_drug_id_status", "clinical_trials", ["drug_id", "status"], False),
+    ("idx_trial_results_trial_id", "trial_results", ["trial_id"], False),
+    ("idx_adverse_events_drug_id", "adverse_events", ["drug_id"], False),
+    ("idx_adverse_events_severity", "adverse_events", ["severity"], False),
+    ("idx_adverse_events_drug_id_reported_date", "adverse_events", ["drug_id", "reported_date"], False),
+]
+
+
+def _existing_indexes(inspector, table):
+    """Column lists (with uniqueness) of all indexes and unique constraints on a table"""
+    existing = [(idx["column_names"], bool(idx["unique"])) for idx in inspector.get_indexes(table)]
+    existing += [(uc["column_names"], True) for uc in inspector.get_unique_constraints(table)]
+    return existing
+
+
+def _missing_indexes():
+    inspector = sa.inspect(op.get_bind())
+    missing = []
+    for name, table, columns, unique in INDEXES:
+        covered = any(
+            cols == columns and (is_unique or not unique)
+            for cols, is_unique in _existing_indexes(inspector, table)
+        )
+        if not covered:
+            missing.append((name, table, columns, unique))
+    return missing
+
+
+def upgrade():
+    missing = _missing_indexes()
+    if not missing:
+        return
+    if op.get_bind().dialect.name == "postgresql":
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+        with op.get_context().autocommit_block():
+            for name, table, columns, unique in missing:
+                op.create_index(
+                    name, table, columns, unique=unique,
+                    postgresql_concurrently=True, if_not_exists=True
+                )
+    else:
+        for name, table, columns, unique in missing:
+            op.create_index(name, table, columns, unique=unique, if_not_exists=True)
+
+
+def downgrade():
+    # Only the composite indexes are new relative to schema.sql
+    for name, table in [
+        ("idx_adverse_events_drug_id_reported_date", "adverse_events"),
+        ("idx_trials_drug_id_status", "clinical_trials"),
+    ]:
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,186 @@
+"""Partition adverse_events by month of reported_date
+
+Rebuilds adverse_events as a RANGE-partitioned table with one partition per
+month plus a DEFAULT partition, matching database/schema.sql. Existing rows
+are copied across (a missing reported_date is backfilled from created_at)
+and the id sequence is kept so ids stay stable. The partitioned table
+requires drug_id, so the migration refuses to run while events without a
+drug exist rather than dropping them. PostgreSQL only; on other databases,
+or when the table is already partitioned, this is a no-op.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+ENSURE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION ensure_adverse_event_partitions(from_date DATE, to_date DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    month_start DATE := date_trunc('month', from_date)::date;
+    month_end DATE;
+    partition_name TEXT;
+    created INTEGER := 0;
+BEGIN
+    WHILE month_start <= to_date LOOP
+        month_end := (month_start + INTERVAL '1 month')::date;
+        partition_name := format('adverse_events_y%sm%s', to_char(month_start, 'YYYY'), to_char(month_start, 'MM'));
+        IF to_regclass(partition_name) IS NULL THEN
+            IF EXISTS (
+                SELECT 1 FROM adverse_events_default
+                WHERE reported_date >= month_start AND reported_date < month_end
+            ) THEN
+                ALTER TABLE adverse_events DETACH PARTITION adverse_events_default;
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF adverse_events FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, month_start, month_end
+                );
+                INSERT INTO adverse_events SELECT * FROM adverse_events_default
+                    WHERE reported_date >= month_start AND reported_date < month_end;
+                DELETE FROM adverse_events_default
+                    WHERE reported_date >= month_start AND reported_date < month_end;
+                ALTER TABLE adverse_events ATTACH PARTITION adverse_events_default DEFAULT;
+            ELSE
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF adverse_events FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, month_start, month_end
+                );
+            END IF;
+            created := created + 1;
+        END IF;
+        month_start := month_end;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+COLUMNS = "id, drug_id, event_type, severity, frequency, description, reported_date, created_at"
+
+
+def _is_partitioned(bind) -> bool:
+    return bool(bind.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = 'adverse_events')"
+    )).scalar())
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql" or _is_partitioned(bind):
+        return
+
+    orphans = bind.execute(
+        sa.text("SELECT COUNT(*) FROM adverse_events WHERE drug_id IS NULL")
+    ).scalar()
+    if orphans:
+        raise RuntimeError(
+            f"{orphans} adverse_events rows have no drug_id, which the partitioned table requires. "
+            "Assign them to a drug or delete them, then re-run the migration."
+        )
+
+    sequence = bind.execute(
+        sa.text("SELECT pg_get_serial_sequence('adverse_events', 'id')")
+    ).scalar()
+
+    op.execute("ALTER TABLE adverse_events RENAME TO adverse_events_legacy")
+    op.execute("ALTER TABLE adverse_events_legacy RENAME CONSTRAINT adverse_events_pkey TO adverse_events_legacy_pkey")
+    for name in (
+        "idx_adverse_events_drug_id",
+        "idx_adverse_events_severity",
+        "idx_adverse_events_drug_id_reported_date",
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    op.execute(f"""
+        CREATE TABLE adverse_events (
+            id INTEGER NOT NULL DEFAULT nextval('{sequence}'),
+            drug_id INTEGER NOT NULL REFERENCES drugs(id) ON DELETE CASCADE,
+            event_type VARCHAR(200),
+            severity VARCHAR(50),
+            frequency INTEGER CHECK (frequency >= 0),
+            description TEXT,
+            reported_date DATE NOT NULL DEFAULT CURRENT_DATE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (id, reported_date)
+        ) PARTITION BY RANGE (reported_date)
+    """)
+    op.execute("CREATE TABLE adverse_events_default PARTITION OF adverse_events DEFAULT")
+    op.execute(ENSURE_PARTITIONS_FUNCTION)
+
+    # Create the partitions before copying so rows go straight to their month
+    op.execute(f"""
+        SELECT ensure_adverse_event_partitions(
+            LEAST(
+                COALESCE((SELECT MIN(COALESCE(reported_date, created_at::date)) FROM adverse_events_legacy), CURRENT_DATE),
+                (CURRENT_DATE - INTERVAL '12 months')::date
+            ),
+            GREATEST(
+                COALESCE((SELECT MAX(COALESCE(reported_date, created_at::date)) FROM adverse_events_legacy), CURRENT_DATE),
+                (CURRENT_DATE + INTERVAL '{MONTHS_AHEAD} months')::date
+            )
+        )
+    """)
+    op.execute(f"""
+        INSERT INTO adverse_events ({COLUMNS})
+        SELECT id, drug_id, event_type, severity, frequency, description,
+               COALESCE(reported_date, created_at::date, CURRENT_DATE), created_at
+        FROM adverse_events_legacy
+    """)
+    op.execute(f"ALTER SEQUENCE {sequence} OWNED BY adverse_events.id")
+    op.execute("DROP TABLE adverse_events_legacy")
+
+    op.create_index("idx_adverse_events_drug_id", "adverse_events", ["drug_id"])
+    op.create_index("idx_adverse_events_severity", "adverse_events", ["severity"])
+    op.create_index(
+        "idx_adverse_events_drug_id_reported_date", "adverse_events", ["drug_id", "reported_date"]
+    )
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql" or not _is_partitioned(bind):
+        return
+
+    sequence = bind.execute(
+        sa.text("SELECT pg_get_serial_sequence('adverse_events', 'id')")
+    ).scalar()
+
+    op.execute("ALTER TABLE adverse_events RENAME TO adverse_events_partitioned")
+    for name in (
+        "idx_adverse_events_drug_id",
+        "idx_adverse_events_severity",
+        "idx_adverse_events_drug_id_reported_date",
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute(f"""
+        CREATE TABLE adverse_events (
+            id INTEGER PRIMARY KEY DEFAULT nextval('{sequence}'),
+            drug_id INTEGER REFERENCES drugs(id) ON DELETE CASCADE,
+            event_type VARCHAR(200),
+            severity VARCHAR(50),
+            frequency INTEGER CHECK (frequency >= 0),
+            description TEXT,
+            reported_date DATE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    op.execute(f"INSERT INTO adverse_events ({COLUMNS}) SELECT {COLUMNS} FROM adverse_events_partitioned")
+    op.execute(f"ALTER SEQUENCE {sequence} OWNED BY adverse_events.id")
+    op.execute("DROP TABLE adverse_events_partitioned CASCADE")
+    op.execute("DROP FUNCTION IF EXISTS ensure_adverse_event_partitions(DATE, DATE)")
+
+    op.create_index("idx_adverse_events_drug_id", "adverse_events", ["drug_id"])
+    op.create_index("idx_adverse_events_severity", "adverse_events", ["severity"])
+    op.create_index(
+        "idx_adverse_events_drug_id_reported_date", "adverse_events", ["drug_id", "reported_date"]
+    )
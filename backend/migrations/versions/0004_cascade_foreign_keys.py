@@ -0,0 +1,77 @@
+"""Rebuild foreign keys without ON DELETE CASCADE
+
+Databases created by Base.metadata.create_all before the models declared
+ondelete="CASCADE" (and adopted unchanged by revision 0001) have plain
+foreign keys, so deleting a drug with trials, results or adverse events
+fails once foreign keys are enforced. Every such key is rebuilt with ON
+DELETE CASCADE: on SQLite by recreating the table in batch mode, on
+PostgreSQL by dropping and re-adding the constraint. Keys that already
+cascade (schema.sql, revision 0001 on an empty database, the partitioned
+adverse_events of revision 0003) are left alone.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+# (table, column, referred table)
+FOREIGN_KEYS = [
+    ("clinical_trials", "drug_id", "drugs"),
+    ("trial_results", "trial_id", "clinical_trials"),
+    ("adverse_events", "drug_id", "drugs"),
+]
+
+# Name given to unnamed SQLite foreign keys so batch mode can drop them
+NAMING_CONVENTION = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+
+
+def _foreign_key(inspector, table, column, referred):
+    """The reflected foreign key on table.column, or None"""
+    for fk in inspector.get_foreign_keys(table):
+        if fk["constrained_columns"] == [column] and fk["referred_table"] == referred:
+            return fk
+    return None
+
+
+def _cascades(fk) -> bool:
+    return (fk.get("options") or {}).get("ondelete", "").upper() == "CASCADE"
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    for table, column, referred in FOREIGN_KEYS:
+        if table not in tables:
+            continue
+        fk = _foreign_key(inspector, table, column, referred)
+        if fk is None or _cascades(fk):
+            continue
+
+        if bind.dialect.name == "sqlite":
+            name = fk["name"] or NAMING_CONVENTION["fk"] % {
+                "table_name": table, "column_0_name": column, "referred_table_name": referred
+            }
+            with op.batch_alter_table(
+                table, recreate="always", naming_convention=NAMING_CONVENTION
+            ) as batch_op:
+                batch_op.drop_constraint(name, type_="foreignkey")
+                batch_op.create_foreign_key(name, referred, [column], ["id"], ondelete="CASCADE")
+        else:
+            name = fk["name"]
+            op.drop_constraint(name, table, type_="foreignkey")
+            op.create_foreign_key(name, table, referred, [column], ["id"], ondelete="CASCADE")
+
+
+def downgrade():
+    # The rebuilt keys match the models; restoring non-cascading keys would
+    # only bring back the failing deletes
+    pass
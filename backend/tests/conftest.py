@@ -1,12 +1,15 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import MetaData, create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.db.session import Base, get_db
+from app.core.cache import entity_cache
+from app.core.jobs import job_manager
+from app.db.session import Base, get_db, configure_sqlite
 from app.models.models import Drug, ClinicalTrial
+from app.services.warmup import readiness
 
 # Create in-memory SQLite database for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -16,13 +19,16 @@ engine = create_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
+configure_sqlite(engine)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+readiness.session_factory = TestingSessionLocal
 
 
 @pytest.fixture
 def db_session():
     """Create a fresh database session for each test"""
     Base.metadata.create_all(bind=engine)
+    entity_cache.clear()
     session = TestingSessionLocal()
     try:
         yield session
@@ -41,6 +47,7 @@ def client(db_session):
             pass
     
     app.dependency_overrides[get_db] = override_get_db
+    readiness.warmed = readiness.draining = False
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -79,3 +86,30 @@ def sample_trial(db_session, sample_drug):
     db_session.commit()
     db_session.refresh(trial)
     return trial
+
+
+@pytest.fixture
+def jobs(tmp_path):
+    """Point the job manager at the test database and a temporary results dir"""
+    original = (job_manager.session_factory, job_manager.results_dir)
+    job_manager.session_factory = TestingSessionLocal
+    job_manager.results_dir = tmp_path / "job_results"
+    yield job_manager
+    job_manager.shutdown()
+    job_manager.session_factory, job_manager.results_dir = original
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    """
+    SQLite file database with the tables create_all built before the models
+    declared ON DELETE CASCADE: same columns, foreign keys that do not cascade
+    """
+    metadata = MetaData()
+    for table in Base.metadata.sorted_tables:
+        for constraint in table.to_metadata(metadata).foreign_key_constraints:
+            constraint.ondelete = None
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    metadata.create_all(bind=legacy)
+    yield legacy
+    legacy.dispose()
@@ -40,3 +40,37 @@ def test_get_trials_by_therapeutic_area(client, sample_drug, sample_trial):
     if len(data) > 0:
         assert "therapeutic_area" in data[0]
         assert "trial_count" in data[0]
+
+
+def test_adverse_events_by_severity_date_range(client, db_session, sample_drug):
+    """Test severity counts are limited to the reported_date range"""
+    from datetime import date
+    from app.models.models import AdverseEvent
+    db_session.add_all([
+        AdverseEvent(drug_id=sample_drug.id, event_type="Nausea", severity="Mild",
+                     frequency=5, reported_date=date(2022, 1, 10)),
+        AdverseEvent(drug_id=sample_drug.id, event_type="Rash", severity="Mild",
+                     frequency=2, reported_date=date(2022, 2, 3)),
+        AdverseEvent(drug_id=sample_drug.id, event_type="Fever", severity="Severe",
+                     frequency=1, reported_date=date(2022, 6, 1)),
+    ])
+    db_session.commit()
+    
+    response = client.get("/api/v1/analytics/adverse-events/by-severity")
+    assert response.json() == [
+        {"severity": "Mild", "event_count": 2, "total_frequency": 7},
+        {"severity": "Severe", "event_count": 1, "total_frequency": 1},
+    ]
+    
+    response = client.get(
+        "/api/v1/analytics/adverse-events/by-severity?start_date=2022-02-01&end_date=2022-06-30"
+    )
+    assert response.status_code == 200
+    assert sorted((r["severity"], r["event_count"]) for r in response.json()) == [
+        ("Mild", 1), ("Severe", 1)
+    ]
+    
+    response = client.get(
+        "/api/v1/analytics/adverse-events/by-severity?start_date=2022-06-30&end_date=2022-01-01"
+    )
+    assert response.status_code == 422
@@ -0,0 +1,112 @@
+import sys
+import time
+from datetime import date
+import pytest
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pyarrow")
+
+from app.core.config import settings
+from app.models.models import Drug, ClinicalTrial, AdverseEvent, TrialPhase, TrialStatus
+from app.services import services
+from app.services.analytics_engine import DuckDBAnalytics
+from app.services.services import AnalyticsService
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def analytics_data(db_session):
+    drugs = [
+        Drug(name="A", manufacturer="Pfizer", therapeutic_area="Oncology"),
+        Drug(name="B", manufacturer="Pfizer", therapeutic_area="Cardiology"),
+        Drug(name="C", manufacturer="Bayer", therapeutic_area="Oncology"),
+        Drug(name="D", manufacturer="Novartis"),
+        Drug(name="E"),
+    ]
+    db_session.add_all(drugs)
+    db_session.flush()
+    db_session.add_all([
+        ClinicalTrial(trial_id="NCT1", title="T1", drug_id=drugs[0].id,
+                      phase=TrialPhase.PHASE_3, status=TrialStatus.ONGOING),
+        ClinicalTrial(trial_id="NCT2", title="T2", drug_id=drugs[0].id,
+                      phase=TrialPhase.PHASE_2, status=TrialStatus.COMPLETED),
+        ClinicalTrial(trial_id="NCT3", title="T3", drug_id=drugs[1].id,
+                      phase=TrialPhase.PHASE_3, status=TrialStatus.COMPLETED),
+        ClinicalTrial(trial_id="NCT4", title="T4", drug_id=drugs[3].id),
+    ])
+    db_session.add_all([
+        AdverseEvent(drug_id=drugs[0].id, event_type="Nausea", severity="Mild",
+                     frequency=10, reported_date=date(2022, 1, 5)),
+        AdverseEvent(drug_id=drugs[0].id, event_type="Rash", severity="Severe",
+                     frequency=None, reported_date=date(2022, 3, 1)),
+        AdverseEvent(drug_id=drugs[2].id, event_type="Fever", severity="Mild",
+                     frequency=4, reported_date=date(2022, 6, 9)),
+        AdverseEvent(drug_id=drugs[2].id, event_type="Other", severity=None,
+                     frequency=1, reported_date=date(2022, 6, 10)),
+    ])
+    db_session.commit()
+    return drugs
+
+
+@pytest.fixture
+def engine(tmp_path):
+    duck = DuckDBAnalytics(session_factory=TestingSessionLocal, snapshot_dir=tmp_path)
+    yield duck
+    duck.close()
+
+
+def test_duckdb_matches_sql(db_session, analytics_data, engine):
+    """Test that every aggregate gives the same result on both engines"""
+    assert engine.get_summary() == AnalyticsService.get_summary(db_session)
+    assert engine.get_top_manufacturers() == AnalyticsService.get_top_manufacturers(db_session)
+    assert engine.get_trials_by_therapeutic_area() == \
+        AnalyticsService.get_trials_by_therapeutic_area(db_session)
+    for bounds in [
+        {},
+        {"start_date": date(2022, 2, 1)},
+        {"start_date": date(2022, 1, 1), "end_date": date(2022, 3, 31)},
+        {"drug_id": analytics_data[2].id},
+    ]:
+        assert engine.get_adverse_events_by_severity(**bounds) == \
+            AnalyticsService.get_adverse_events_by_severity(db_session, **bounds)
+
+
+def test_duckdb_engine_setting(client, db_session, analytics_data, engine, monkeypatch):
+    """Test that ANALYTICS_ENGINE=duckdb routes the endpoints to the snapshot"""
+    expected = client.get("/api/v1/analytics/summary").json()
+    monkeypatch.setattr(settings, "ANALYTICS_ENGINE", "duckdb")
+    monkeypatch.setattr(services, "duckdb_analytics", engine)
+
+    assert client.get("/api/v1/analytics/summary").json() == expected
+    assert engine.refreshes == 1
+    assert client.get("/api/v1/analytics/drugs/top-manufacturers").json()[0] == {
+        "manufacturer": "Pfizer", "drug_count": 2
+    }
+
+
+def test_stale_snapshot_refreshes_in_background(db_session, analytics_data, engine):
+    """Test that a stale snapshot keeps serving while a new one is built"""
+    assert engine.get_summary().total_drugs == 5
+    db_session.add(Drug(name="F"))
+    db_session.commit()
+    assert engine.get_summary().total_drugs == 5
+
+    engine.max_age_seconds = 0
+    assert engine.get_summary().total_drugs == 5
+    deadline = time.time() + 5
+    while engine.refreshes < 2 and time.time() < deadline:
+        time.sleep(0.02)
+    engine.max_age_seconds = 300
+    assert engine.get_summary().total_drugs == 6
+
+
+def test_duckdb_engine_fails_at_startup_without_packages(monkeypatch):
+    """Test that selecting the DuckDB engine without duckdb installed stops startup"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    monkeypatch.setattr(settings, "ANALYTICS_ENGINE", "duckdb")
+    monkeypatch.setitem(sys.modules, "duckdb", None)
+    with pytest.raises(RuntimeError, match="requires duckdb"):
+        with TestClient(app):
+            pass
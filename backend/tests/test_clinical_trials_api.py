@@ -88,3 +88,91 @@ def test_trial_status_validation(client, sample_drug):
     }
     response = client.post("/api/v1/clinical-trials/", json=trial_data)
     assert response.status_code == 201
+
+
+def test_get_trials_by_ids(client, sample_trial):
+    """Test fetching trials by a list of IDs"""
+    response = client.get(f"/api/v1/clinical-trials/?ids=9999,{sample_trial.id}")
+    assert response.status_code == 200
+    assert [t["id"] for t in response.json()] == [sample_trial.id]
+    assert response.headers["X-Missing-Ids"] == "9999"
+
+
+def test_get_trials_batch(client, sample_trial):
+    """Test fetching trials by ID with the POST batch endpoint"""
+    response = client.post("/api/v1/clinical-trials/batch", json={"ids": [sample_trial.id, 9999]})
+    assert response.status_code == 200
+    data = response.json()
+    assert [t["trial_id"] for t in data["items"]] == [sample_trial.trial_id]
+    assert data["missing"] == [9999]
+
+
+def test_get_trials_sparse_fields(client, sample_trial):
+    """Test returning only selected trial fields"""
+    response = client.get(f"/api/v1/clinical-trials/?ids={sample_trial.id},9999&fields=status")
+    assert response.status_code == 200
+    assert response.json() == [{"id": sample_trial.id, "status": "Ongoing"}]
+    assert response.headers["X-Missing-Ids"] == "9999"
+
+
+def test_upsert_trial_by_trial_id(client, sample_trial):
+    """Test updating an existing trial and creating a new one by trial_id"""
+    body = {
+        "title": "Updated Trial",
+        "drug_id": sample_trial.drug_id,
+        "phase": "Phase 4",
+        "status": "Completed"
+    }
+    response = client.put(f"/api/v1/clinical-trials/by-trial-id/{sample_trial.trial_id}", json=body)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["id"] == sample_trial.id
+    assert data["status"] == "Completed"
+    assert data["sponsor"] == "Test Sponsor"
+    
+    response = client.put("/api/v1/clinical-trials/by-trial-id/NCT77777", json=body)
+    assert response.status_code == 200
+    assert response.json()["id"] != sample_trial.id
+
+
+def test_bulk_upsert_trials(client, sample_drug):
+    """Test upserting a batch of trials in one request"""
+    trials = [
+        {"trial_id": f"NCT0{i}", "title": f"Trial {i}", "drug_id": sample_drug.id,
+         "phase": "Phase 2", "status": "Ongoing"}
+        for i in range(3)
+    ]
+    response = client.post("/api/v1/clinical-trials/bulk-upsert", json=trials)
+    assert response.status_code == 200
+    assert [t["trial_id"] for t in response.json()] == ["NCT00", "NCT01", "NCT02"]
+    
+    trials[0]["status"] = "Completed"
+    response = client.post("/api/v1/clinical-trials/bulk-upsert", json=trials)
+    assert response.json()[0]["status"] == "Completed"
+    assert len(client.get("/api/v1/clinical-trials/").json()) == 3
+
+
+def test_trial_with_unknown_drug(client, sample_drug):
+    """Test that a trial referencing a missing drug is rejected with 422"""
+    trial = {"trial_id": "NCT404", "title": "Orphan", "drug_id": sample_drug.id + 1,
+             "phase": "Phase 1", "status": "Planned"}
+    response = client.post("/api/v1/clinical-trials/", json=trial)
+    assert response.status_code == 422
+    assert str(sample_drug.id + 1) in response.json()["detail"]
+    
+    body = {key: value for key, value in trial.items() if key != "trial_id"}
+    assert client.put("/api/v1/clinical-trials/by-trial-id/NCT404", json=body).status_code == 422
+    
+    valid = {**trial, "trial_id": "NCT200", "drug_id": sample_drug.id}
+    response = client.post("/api/v1/clinical-trials/bulk-upsert", json=[valid, trial])
+    assert response.status_code == 422
+    assert client.get("/api/v1/clinical-trials/").json() == []
+
+
+def test_duplicate_trial_id_conflicts(client, sample_trial):
+    """Test that a unique constraint violation is a 409 instead of a 500"""
+    trial = {"trial_id": sample_trial.trial_id, "title": "Copy", "drug_id": sample_trial.drug_id,
+             "phase": "Phase 1", "status": "Planned"}
+    response = client.post("/api/v1/clinical-trials/", json=trial)
+    assert response.status_code == 409
+    assert response.json()["detail"] == "A row with the same unique value already exists"
@@ -63,6 +63,16 @@ def test_delete_drug(client, sample_drug):
     assert get_response.status_code == 404
 
 
+def test_duplicate_drug_name_conflicts(client, sample_drug):
+    """Test that creating or renaming to a taken drug name is a 409 instead of a 500"""
+    response = client.post("/api/v1/drugs/", json={"name": sample_drug.name})
+    assert response.status_code == 409
+    
+    other = client.post("/api/v1/drugs/", json={"name": "Other Drug"}).json()
+    response = client.put(f"/api/v1/drugs/{other['id']}", json={"name": sample_drug.name})
+    assert response.status_code == 409
+
+
 def test_get_multiple_drugs(client):
     """Test getting multiple drugs"""
     # Create multiple drugs
@@ -96,3 +106,208 @@ def test_pagination(client):
     assert response.status_code == 200
     data = response.json()
     assert len(data) == 5
+
+
+def test_get_drugs_by_ids(client):
+    """Test fetching drugs by a list of IDs"""
+    ids = [client.post("/api/v1/drugs/", json={"name": f"Drug {i}"}).json()["id"] for i in range(3)]
+    
+    response = client.get(f"/api/v1/drugs/?ids={ids[2]},9999,{ids[0]}")
+    assert response.status_code == 200
+    assert [d["id"] for d in response.json()] == [ids[2], ids[0]]
+    assert response.headers["X-Missing-Ids"] == "9999"
+
+
+def test_get_drugs_by_ids_invalid(client):
+    """Test fetching drugs with a malformed ID list"""
+    response = client.get("/api/v1/drugs/?ids=1,abc")
+    assert response.status_code == 422
+
+
+def test_get_drugs_batch(client):
+    """Test fetching drugs by ID with the POST batch endpoint"""
+    ids = [client.post("/api/v1/drugs/", json={"name": f"Drug {i}"}).json()["id"] for i in range(3)]
+    
+    response = client.post("/api/v1/drugs/batch", json={"ids": [ids[1], 9999, ids[0], ids[1]]})
+    assert response.status_code == 200
+    data = response.json()
+    assert [d["id"] for d in data["items"]] == [ids[1], ids[0]]
+    assert data["missing"] == [9999]
+
+
+def test_get_drugs_sparse_fields(client, sample_drug):
+    """Test returning only selected drug fields"""
+    response = client.get("/api/v1/drugs/?fields=name,manufacturer")
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": sample_drug.id, "name": "Test Drug", "manufacturer": "Test Pharma"}
+    ]
+    
+    response = client.get(f"/api/v1/drugs/{sample_drug.id}?fields=name")
+    assert response.status_code == 200
+    assert response.json() == {"id": sample_drug.id, "name": "Test Drug"}
+
+
+def test_get_drugs_unknown_field(client):
+    """Test requesting a field that does not exist"""
+    response = client.get("/api/v1/drugs/?fields=name,secret")
+    assert response.status_code == 422
+
+
+def test_upsert_drug_by_name(client):
+    """Test creating and then updating a drug by name"""
+    response = client.put("/api/v1/drugs/by-name/Aspirin", json={"manufacturer": "Bayer"})
+    assert response.status_code == 200
+    created = response.json()
+    assert created["name"] == "Aspirin"
+    assert created["manufacturer"] == "Bayer"
+    
+    response = client.put("/api/v1/drugs/by-name/Aspirin", json={"therapeutic_area": "Cardiology"})
+    assert response.status_code == 200
+    updated = response.json()
+    assert updated["id"] == created["id"]
+    assert updated["manufacturer"] == "Bayer"
+    assert updated["therapeutic_area"] == "Cardiology"
+    assert len(client.get("/api/v1/drugs/").json()) == 1
+
+
+def test_bulk_upsert_drugs(client, sample_drug):
+    """Test upserting a batch of drugs in one request"""
+    drugs = [
+        {"name": "New Drug", "manufacturer": "Pharma A"},
+        {"name": sample_drug.name, "manufacturer": "Pharma B"},
+    ]
+    response = client.post("/api/v1/drugs/bulk-upsert", json=drugs)
+    assert response.status_code == 200
+    data = response.json()
+    assert [d["name"] for d in data] == ["New Drug", sample_drug.name]
+    assert data[1]["id"] == sample_drug.id
+    assert data[1]["manufacturer"] == "Pharma B"
+    
+    # Retrying the same batch does not create duplicates
+    client.post("/api/v1/drugs/bulk-upsert", json=drugs)
+    assert len(client.get("/api/v1/drugs/").json()) == 2
+
+
+def test_bulk_upsert_drugs_repeating_a_name(client):
+    """Test that repeated names are merged and still get one entry per input"""
+    drugs = [
+        {"name": "Aspirin", "manufacturer": "Bayer"},
+        {"name": "Ibuprofen"},
+        {"name": "Aspirin", "manufacturer": "Generic"},
+    ]
+    response = client.post("/api/v1/drugs/bulk-upsert", json=drugs)
+    assert response.status_code == 200
+    data = response.json()
+    assert [d["name"] for d in data] == ["Aspirin", "Ibuprofen", "Aspirin"]
+    assert data[0] == data[2]
+    assert data[0]["manufacturer"] == "Generic"
+    assert len(client.get("/api/v1/drugs/").json()) == 2
+
+
+def test_bulk_upsert_drugs_without_native_upsert(client, monkeypatch, sample_drug):
+    """Test the select-then-insert/update upsert used on other databases"""
+    from app.services import services
+    monkeypatch.setattr(services, "NATIVE_UPSERT_DIALECTS", ())
+    drugs = [
+        {"name": "New Drug", "manufacturer": "Pharma A"},
+        {"name": sample_drug.name, "manufacturer": "Pharma B"},
+    ]
+    response = client.post("/api/v1/drugs/bulk-upsert", json=drugs)
+    assert response.status_code == 200
+    data = response.json()
+    assert [d["name"] for d in data] == ["New Drug", sample_drug.name]
+    assert data[1]["id"] == sample_drug.id
+    assert data[1]["manufacturer"] == "Pharma B"
+    assert len(client.get("/api/v1/drugs/").json()) == 2
+
+
+def test_bulk_delete_drugs_cascades(client, db_session, sample_drug, sample_trial):
+    """Test deleting drugs by manufacturer removes their trials, results and events"""
+    from app.models.models import TrialResult, AdverseEvent, ClinicalTrial
+    db_session.add(TrialResult(trial_id=sample_trial.id, endpoint="Survival"))
+    db_session.add_all([AdverseEvent(drug_id=sample_drug.id, event_type="Nausea") for _ in range(3)])
+    db_session.commit()
+    trial_id = sample_trial.id
+    other = client.post("/api/v1/drugs/", json={"name": "Other", "manufacturer": "Other Pharma"}).json()
+    
+    response = client.delete("/api/v1/drugs/?manufacturer=Test Pharma")
+    assert response.status_code == 200
+    assert response.json()["deleted"] == {
+        "drugs": 1, "clinical_trials": 1, "trial_results": 1, "adverse_events": 3
+    }
+    
+    db_session.expire_all()
+    assert db_session.query(ClinicalTrial).count() == 0
+    assert db_session.query(AdverseEvent).count() == 0
+    assert client.get(f"/api/v1/clinical-trials/{trial_id}").status_code == 404
+    assert client.get(f"/api/v1/drugs/{other['id']}").status_code == 200
+
+
+def test_delete_drug_without_cascading_foreign_keys(legacy_engine):
+    """Test that deleting a drug removes its children where the foreign keys do not cascade"""
+    from sqlalchemy.orm import Session
+    from app.db.session import configure_sqlite
+    from app.models.models import AdverseEvent, ClinicalTrial, Drug, TrialResult
+    from app.services.services import DrugService
+    configure_sqlite(legacy_engine)
+    with Session(legacy_engine) as session:
+        drug = Drug(name="Legacy")
+        session.add(drug)
+        session.flush()
+        trial = ClinicalTrial(trial_id="NCT1", title="T", drug_id=drug.id, phase="Phase 1", status="Ongoing")
+        session.add_all([trial, AdverseEvent(drug_id=drug.id, event_type="Rash")])
+        session.flush()
+        session.add(TrialResult(trial_id=trial.id, endpoint="Survival"))
+        session.commit()
+        
+        assert DrugService.bulk_delete_drugs(session, drug_ids=[drug.id]) == {
+            "drugs": 1, "clinical_trials": 1, "trial_results": 1, "adverse_events": 1
+        }
+        for model in (Drug, ClinicalTrial, TrialResult, AdverseEvent):
+            assert session.query(model).count() == 0
+
+
+def test_removing_trial_from_drug_keeps_trial(db_session, sample_drug, sample_trial):
+    """Test that detaching a trial from its drug unlinks it instead of deleting it"""
+    from app.models.models import ClinicalTrial
+    sample_drug.clinical_trials.remove(sample_trial)
+    db_session.commit()
+
+    db_session.expire_all()
+    trial = db_session.get(ClinicalTrial, sample_trial.id)
+    assert trial is not None
+    assert trial.drug_id is None
+
+
+def test_bulk_delete_drugs_requires_filter(client):
+    """Test that bulk delete refuses to run without a filter"""
+    response = client.delete("/api/v1/drugs/")
+    assert response.status_code == 422
+
+
+def test_get_drug_adverse_events_date_range(client, db_session, sample_drug):
+    """Test listing a drug's adverse events within a reported_date range"""
+    from datetime import date
+    from app.models.models import AdverseEvent
+    db_session.add_all([
+        AdverseEvent(drug_id=sample_drug.id, event_type="Nausea", severity="Mild",
+                     reported_date=date(2022, 3, 15)),
+        AdverseEvent(drug_id=sample_drug.id, event_type="Headache", severity="Mild",
+                     reported_date=date(2022, 1, 5)),
+        AdverseEvent(drug_id=sample_drug.id, event_type="Rash", severity="Moderate"),
+    ])
+    db_session.commit()
+    
+    response = client.get(f"/api/v1/drugs/{sample_drug.id}/adverse-events")
+    assert response.status_code == 200
+    events = response.json()
+    assert [e["event_type"] for e in events] == ["Headache", "Nausea", "Rash"]
+    assert events[2]["reported_date"] == date.today().isoformat()
+    
+    response = client.get(
+        f"/api/v1/drugs/{sample_drug.id}/adverse-events?start_date=2022-03-01&end_date=2022-03-31"
+    )
+    assert [e["event_type"] for e in response.json()] == ["Nausea"]
+    
+    assert client.get("/api/v1/drugs/999/adverse-events").status_code == 404
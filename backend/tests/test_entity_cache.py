@@ -0,0 +1,57 @@
+import pytest
+from app.core.cache import EntityCache, entity_cache
+
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted first"""
+    cache = EntityCache(max_size=2)
+    for i in range(2):
+        _, version = cache.get("drug", i)
+        cache.put("drug", i, version, {"id": i})
+    cache.get("drug", 0)
+    _, version = cache.get("drug", 2)
+    cache.put("drug", 2, version, {"id": 2})
+
+    assert cache.get("drug", 0)[0] == {"id": 0}
+    assert cache.get("drug", 1)[0] is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_version_bump_makes_entry_stale():
+    """Test that invalidation stales an entry, even one stored with an old version"""
+    cache = EntityCache(max_size=10)
+    _, version = cache.get("drug", 1)
+    cache.invalidate("drug", 1)
+    cache.put("drug", 1, version, {"id": 1})
+
+    assert cache.get("drug", 1)[0] is None
+
+
+def test_get_drug_served_from_cache(client, sample_drug):
+    """Test that repeated lookups hit the cache and updates invalidate it"""
+    client.get(f"/api/v1/drugs/{sample_drug.id}")
+    response = client.get(f"/api/v1/drugs/{sample_drug.id}")
+    assert response.status_code == 200
+    assert response.json()["name"] == sample_drug.name
+    assert entity_cache.stats()["hits"] == 1
+
+    client.put(f"/api/v1/drugs/{sample_drug.id}", json={"manufacturer": "New Pharma"})
+    response = client.get(f"/api/v1/drugs/{sample_drug.id}")
+    assert response.json()["manufacturer"] == "New Pharma"
+
+
+def test_deleted_drug_not_served_from_cache(client, sample_drug):
+    """Test that a deleted drug is not returned from the cache"""
+    client.get(f"/api/v1/drugs/{sample_drug.id}")
+    client.delete(f"/api/v1/drugs/{sample_drug.id}")
+    assert client.get(f"/api/v1/drugs/{sample_drug.id}").status_code == 404
+
+
+def test_cache_metrics_reported(client, sample_trial):
+    """Test that cache hit rates are reported on /metrics"""
+    client.get(f"/api/v1/clinical-trials/{sample_trial.id}")
+    client.get(f"/api/v1/clinical-trials/{sample_trial.id}?fields=status")
+
+    data = client.get("/metrics").json()
+    assert data["entity_cache"]["hits"] == 1
+    assert data["entity_cache"]["hit_rate"] == 0.5
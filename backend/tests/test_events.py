@@ -0,0 +1,165 @@
+import asyncio
+from app.core.config import settings
+from app.core.events import EventBroker, event_broker
+from app.api.v1.endpoints.events import format_sse
+from app.main import app
+
+
+def stream(query: str = "", last_event_id: int = None, messages: int = 1, on_message=None):
+    """
+    Read the first messages of /api/v1/events/stream, then disconnect
+
+    The ASGI app is called directly: TestClient waits for a response to
+    finish, which an event stream never does. on_message, if given, is
+    called with each message as it arrives.
+    """
+    received = []
+    enough = asyncio.Event()
+    headers = [(b"last-event-id", str(last_event_id).encode())] if last_event_id is not None else []
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/api/v1/events/stream", "raw_path": b"/api/v1/events/stream",
+        "query_string": query.encode(), "headers": headers, "client": ("test", 1), "server": ("test", 80),
+    }
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await enough.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            for part in message["body"].decode().split("\n\n"):
+                if part:
+                    received.append(part)
+                    if on_message is not None:
+                        on_message(part)
+            if len(received) >= messages:
+                enough.set()
+
+    asyncio.run(asyncio.wait_for(app(scope, receive, send), timeout=5))
+    return received[:messages]
+
+
+def test_read_since_returns_newer_events():
+    """Test reading events after a sequence number"""
+    broker = EventBroker(buffer_size=10)
+    for i in range(3):
+        broker.publish("drug", "created", i, {})
+
+    events, gap = broker.read_since(1)
+    assert [e.seq for e in events] == [2, 3]
+    assert not gap
+    assert broker.read_since(3) == ([], False)
+
+
+def test_slow_subscriber_gets_gap():
+    """Test that a subscriber behind the ring buffer is told to resync"""
+    broker = EventBroker(buffer_size=2)
+    for i in range(5):
+        broker.publish("drug", "updated", i, {})
+
+    events, gap = broker.read_since(0)
+    assert gap
+    assert [e.seq for e in events] == [4, 5]
+
+
+def test_event_filters():
+    """Test subscriber filters on drug, sponsor and status"""
+    broker = EventBroker()
+    trial = broker.publish("clinical_trial", "updated", 7, {
+        "drug_id": 3, "sponsor": "Pfizer", "status": "Completed"
+    })
+    drug = broker.publish("drug", "updated", 3, {"name": "Aspirin"})
+
+    assert trial.matches(drug_id=3, sponsor="Pfizer", status="Completed")
+    assert not trial.matches(status="Ongoing")
+    assert drug.matches(drug_id=3)
+    assert not drug.matches(sponsor="Pfizer")
+    assert not drug.matches(entity="clinical_trial")
+
+
+def test_wait_for_wakes_on_publish():
+    """Test that waiting subscribers are woken from another thread"""
+    broker = EventBroker()
+
+    async def wait_and_publish():
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.01, lambda: loop.run_in_executor(
+            None, broker.publish, "drug", "created", 1, {}
+        ))
+        await asyncio.wait_for(broker.wait_for(0, timeout=5), timeout=2)
+
+    asyncio.run(wait_and_publish())
+    assert broker.last_seq == 1
+
+
+def test_services_publish_changes(client, sample_drug):
+    """Test that drug and trial changes are published"""
+    start = event_broker.last_seq
+    client.put(f"/api/v1/drugs/{sample_drug.id}", json={"manufacturer": "New Pharma"})
+    client.post("/api/v1/clinical-trials/", json={
+        "trial_id": "NCT555", "title": "Trial", "drug_id": sample_drug.id,
+        "phase": "Phase 1", "status": "Planned", "sponsor": "New Pharma"
+    })
+    client.delete(f"/api/v1/drugs/{sample_drug.id}")
+
+    events, _ = event_broker.read_since(start)
+    assert [(e.entity, e.action) for e in events] == [
+        ("drug", "updated"), ("clinical_trial", "created"),
+        ("clinical_trial", "deleted"), ("drug", "deleted")
+    ]
+    assert all(e.drug_id == sample_drug.id for e in events)
+    assert events[1].data["sponsor"] == "New Pharma"
+    assert events[2].entity_id == events[1].entity_id
+    assert events[2].matches(sponsor="New Pharma", status="Planned")
+
+
+def test_format_sse():
+    """Test Server-Sent Events message format"""
+    event = EventBroker().publish("drug", "created", 1, {"name": "Aspirin"})
+    message = format_sse(event)
+    assert message.startswith("id: 1\nevent: drug.created\ndata: ")
+    assert message.endswith("\n\n")
+
+
+def test_stream_sends_published_events_and_resumes():
+    """Test reading a published event from the stream and resuming from Last-Event-ID"""
+    first = event_broker.publish("drug", "created", 101, {"name": "Aspirin"})
+    second = event_broker.publish("drug", "updated", 101, {"name": "Aspirin"})
+
+    message, = stream(query=f"since={first.seq - 1}")
+    assert message == format_sse(first).rstrip("\n")
+
+    message, = stream(last_event_id=first.seq)
+    assert message.startswith(f"id: {second.seq}\nevent: drug.updated\n")
+
+
+def test_stream_resets_a_cursor_ahead_of_the_broker():
+    """Test that resuming past the last event (e.g. after a restart) asks the client to resync"""
+    message, = stream(last_event_id=event_broker.last_seq + 50)
+    assert message == f'event: reset\ndata: {{"seq": {event_broker.last_seq}}}'
+
+
+def test_stream_keep_alive_only_when_idle(monkeypatch):
+    """Test that the keep-alive comment is sent on heartbeat timeouts, not after every batch"""
+    event = event_broker.publish("drug", "created", 102, {"name": "Ibuprofen"})
+    scheduled = []
+
+    def publish_later(message):
+        # Publish once the stream has sent the first event and waits for more
+        if not scheduled:
+            scheduled.append(asyncio.get_running_loop().call_later(
+                0.05, event_broker.publish, "drug", "updated", 102, {"name": "Ibuprofen"}
+            ))
+
+    messages = stream(query=f"since={event.seq - 1}", messages=2, on_message=publish_later)
+    assert messages[0].startswith(f"id: {event.seq}\n")
+    assert messages[1].startswith(f"id: {event.seq + 1}\nevent: drug.updated\n")
+
+    monkeypatch.setattr(settings, "EVENT_HEARTBEAT_SECONDS", 0.05)
+    assert stream() == [": keep-alive"]
@@ -0,0 +1,94 @@
+import time
+import pytest
+
+
+def wait_for_job(client, job_id, timeout=5.0):
+    """Poll a job until it finishes"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        data = client.get(f"/api/v1/jobs/{job_id}").json()
+        if data["status"] in ("succeeded", "failed"):
+            return data
+        time.sleep(0.02)
+    raise AssertionError(f"Job {job_id} did not finish in {timeout}s")
+
+
+def test_create_job_unknown_kind(client, jobs):
+    """Test creating a job of an unknown kind"""
+    response = client.post("/api/v1/jobs/", json={"kind": "does_not_exist"})
+    assert response.status_code == 400
+
+
+def test_analytics_summary_job(client, jobs, sample_drug, sample_trial):
+    """Test running the analytics summary as a background job"""
+    response = client.post("/api/v1/jobs/", json={"kind": "analytics_summary"})
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] in ("queued", "running", "succeeded")
+
+    job = wait_for_job(client, job["id"])
+    assert job["status"] == "succeeded"
+    assert job["progress"] == 1.0
+    assert job["expires_at"] is not None
+
+    result = client.get(f"/api/v1/jobs/{job['id']}/result")
+    assert result.status_code == 200
+    assert result.json()["total_drugs"] == 1
+    assert result.json()["active_trials"] == 1
+
+
+def test_drugs_export_job(client, jobs):
+    """Test exporting all drugs as a background job"""
+    for i in range(3):
+        client.post("/api/v1/drugs/", json={"name": f"Drug {i}"})
+
+    job_id = client.post("/api/v1/jobs/", json={"kind": "drugs_export"}).json()["id"]
+    assert wait_for_job(client, job_id)["status"] == "succeeded"
+
+    data = client.get(f"/api/v1/jobs/{job_id}/result").json()
+    assert [d["name"] for d in data] == ["Drug 0", "Drug 1", "Drug 2"]
+
+
+def test_job_result_expires(client, jobs):
+    """Test that job results are removed after their TTL"""
+    jobs.ttl_seconds = 0
+    try:
+        job_id = client.post("/api/v1/jobs/", json={"kind": "data_quality"}).json()["id"]
+        deadline = time.time() + 5
+        while jobs.get(job_id) is not None and time.time() < deadline:
+            time.sleep(0.02)
+        assert client.get(f"/api/v1/jobs/{job_id}").status_code == 404
+        assert not list(jobs.results_dir.glob("*.json"))
+    finally:
+        jobs.ttl_seconds = 3600
+
+
+def test_job_not_found(client, jobs):
+    """Test getting a non-existent job"""
+    assert client.get("/api/v1/jobs/missing").status_code == 404
+    assert client.get("/api/v1/jobs/missing/result").status_code == 404
+
+
+def test_create_job_invalid_params(client, jobs):
+    """Test that parameters the handler does not accept are rejected up front"""
+    response = client.post("/api/v1/jobs/", json={"kind": "drugs_export", "params": {"limit": 10}})
+    assert response.status_code == 400
+    assert "limit" in response.json()["detail"]
+
+    response = client.post("/api/v1/jobs/", json={"kind": "adverse_event_partitions", "params": {"months_ahead": 1}})
+    assert response.status_code == 202
+
+
+def test_job_result_purged_during_read(client, jobs):
+    """Test that a result file removed after the job lookup gives 404, not 500"""
+    job_id = client.post("/api/v1/jobs/", json={"kind": "data_quality"}).json()["id"]
+    assert wait_for_job(client, job_id)["status"] == "succeeded"
+
+    jobs._result_path(job_id).unlink()
+    assert client.get(f"/api/v1/jobs/{job_id}/result").status_code == 404
+
+
+def test_create_job_docs_list_every_kind(jobs):
+    """Test that the endpoint description names every registered job kind"""
+    from app.api.v1.endpoints.jobs import create_job
+    assert all(kind in create_job.__doc__ for kind in jobs.kinds)
@@ -22,3 +22,38 @@ def test_api_docs_available(client):
     """Test that API documentation is available"""
     response = client.get("/docs")
     assert response.status_code == 200
+
+
+def test_liveness(client):
+    """Test liveness probe"""
+    response = client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+
+
+def test_readiness_after_warm_up(client):
+    """Test that startup warms the worker before it reports ready"""
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ready"
+    assert set(data["steps"]) == {"connections", "partitions", "entity_cache", "queries"}
+
+
+def test_warm_up_preloads_entity_cache(db_session, sample_drug):
+    """Test that warm-up puts recently updated drugs in the entity cache"""
+    from app.core.cache import entity_cache
+    from app.services.services import warm_entity_cache
+    assert warm_entity_cache(db_session, limit=10) == 1
+    snapshot, _ = entity_cache.get("drug", sample_drug.id)
+    assert snapshot["name"] == "Test Drug"
+
+
+def test_readiness_while_draining(client):
+    """Test that a draining or failed worker reports not ready"""
+    from app.services.warmup import readiness
+    readiness.draining = True
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "not_ready"
+    readiness.draining = False
@@ -0,0 +1,103 @@
+import re
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect
+
+from app.db.session import Base
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SCHEMA_SQL = BACKEND_DIR.parent / "database" / "schema.sql"
+
+
+def alembic_config(url):
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    config.set_main_option("sqlalchemy.url", url)
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def indexed_columns(engine):
+    """Set of (table, columns) covered by an index or unique constraint"""
+    inspector = inspect(engine)
+    covered = set()
+    for table in inspector.get_table_names():
+        for idx in inspector.get_indexes(table) + inspector.get_unique_constraints(table):
+            covered.add((table, tuple(idx["column_names"])))
+    return covered
+
+
+def model_indexes():
+    return {
+        (table.name, tuple(col.name for col in index.columns))
+        for table in Base.metadata.sorted_tables
+        for index in table.indexes
+        if not (len(index.columns) == 1 and list(index.columns)[0].primary_key)
+    }
+
+
+def test_models_cover_schema_sql_indexes():
+    """Test that every index in schema.sql is declared on the ORM models"""
+    schema_indexes = {
+        (table, tuple(c.strip() for c in columns.split(",")))
+        for table, columns in re.findall(r"CREATE INDEX \w+ ON (\w+)\(([^)]+)\)", SCHEMA_SQL.read_text())
+    }
+    assert schema_indexes <= model_indexes()
+
+
+def test_upgrade_empty_database(tmp_path):
+    """Test that migrating an empty database yields the model indexes"""
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    command.upgrade(alembic_config(url), "head")
+
+    engine = create_engine(url)
+    assert model_indexes() <= indexed_columns(engine)
+    assert ("drugs", ("name",)) in indexed_columns(engine)
+    engine.dispose()
+
+
+def test_upgrade_existing_create_all_database(tmp_path):
+    """Test that a create_all database is adopted without duplicate indexes"""
+    url = f"sqlite:///{tmp_path / 'existing.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    before = {t: len(inspect(engine).get_indexes(t)) for t in inspect(engine).get_table_names()}
+
+    command.upgrade(alembic_config(url), "head")
+
+    after = {t: len(inspect(engine).get_indexes(t)) for t in before}
+    assert after == before
+    engine.dispose()
+
+
+def test_upgrade_rebuilds_legacy_foreign_keys(legacy_engine):
+    """Test that foreign keys created without ON DELETE CASCADE are rebuilt to cascade"""
+    def cascading(engine):
+        inspector = inspect(engine)
+        return {
+            (table, fk["constrained_columns"][0]): fk["options"].get("ondelete")
+            for table in ("clinical_trials", "trial_results", "adverse_events")
+            for fk in inspector.get_foreign_keys(table)
+        }
+
+    assert set(cascading(legacy_engine).values()) == {None}
+    with legacy_engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO drugs (id, name) VALUES (1, 'Legacy')")
+        conn.exec_driver_sql(
+            "INSERT INTO clinical_trials (id, trial_id, title, drug_id) VALUES (1, 'NCT1', 'T', 1)"
+        )
+        conn.exec_driver_sql("INSERT INTO trial_results (id, trial_id) VALUES (1, 1)")
+        conn.exec_driver_sql("INSERT INTO adverse_events (id, drug_id) VALUES (1, 1)")
+
+    command.upgrade(alembic_config(str(legacy_engine.url)), "head")
+
+    legacy_engine.dispose()
+    assert set(cascading(legacy_engine).values()) == {"CASCADE"}
+    with legacy_engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+        conn.exec_driver_sql("DELETE FROM drugs WHERE id = 1")
+        for table in ("clinical_trials", "trial_results", "adverse_events"):
+            assert conn.exec_driver_sql(f"SELECT COUNT(*) FROM {table}").scalar() == 0
@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base, RoutingSession, configure_sqlite, is_sqlite_file
+from app.models.models import Drug
+
+
+@pytest.fixture
+def tuned_engines(tmp_path):
+    """Read and write engines on a file database with the tuned profile"""
+    url = f"sqlite:///{tmp_path / 'tuned.db'}"
+    read_engine = create_engine(url, connect_args={"check_same_thread": False})
+    write_engine = create_engine(
+        url, connect_args={"check_same_thread": False}, pool_size=1, max_overflow=0
+    )
+    configure_sqlite(read_engine, tuned=True)
+    configure_sqlite(write_engine, tuned=True)
+    Base.metadata.create_all(bind=write_engine)
+    yield read_engine, write_engine
+    read_engine.dispose()
+    write_engine.dispose()
+
+
+def test_tuned_pragmas(tuned_engines):
+    """Test that the tuned profile sets WAL and the performance pragmas"""
+    read_engine, _ = tuned_engines
+    with read_engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() > 0
+
+
+def test_routing_session_sends_writes_to_write_engine(tuned_engines):
+    """Test that flushes and DML go to the write engine and reads do not"""
+    read_engine, write_engine = tuned_engines
+    Session = sessionmaker(bind=read_engine, class_=RoutingSession, write_bind=write_engine)
+    db = Session()
+    try:
+        assert db.get_bind(clause=select(Drug)) is read_engine
+        assert db.get_bind(clause=insert(Drug)) is write_engine
+
+        db.add(Drug(name="Aspirin"))
+        db.commit()
+        assert db.query(Drug).count() == 1
+    finally:
+        db.close()
+
+
+def test_is_sqlite_file():
+    """Test detection of on-disk SQLite URLs"""
+    assert is_sqlite_file("sqlite:///./datamax.db")
+    assert not is_sqlite_file("sqlite:///:memory:")
+    assert not is_sqlite_file("sqlite://")
+    assert not is_sqlite_file("postgresql://localhost/datamax")
@@ -0,0 +1,102 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+def run_concurrently(fn, n):
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        futures = [pool.submit(fn) for _ in range(n)]
+        return [f.result() for f in futures]
+
+
+def test_identical_calls_share_one_execution():
+    """Test that concurrent calls with the same key run the function once"""
+    flight = SingleFlight()
+    executions = []
+
+    def compute():
+        executions.append(1)
+        time.sleep(0.2)
+        return {"total": 42}
+
+    results = run_concurrently(lambda: flight.do("summary", compute), 8)
+
+    assert len(executions) == 1
+    assert all(r is results[0] for r in results)
+    assert flight.stats()["calls"] == 8
+    assert flight.stats()["coalescing_ratio"] == pytest.approx(7 / 8)
+
+
+def test_completed_calls_are_not_cached():
+    """Test that a call after the previous one finished runs again"""
+    flight = SingleFlight()
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.do("k", lambda: 2) == 2
+    assert flight.stats()["coalesced"] == 0
+
+
+def test_errors_reach_every_waiter():
+    """Test that followers receive the leader's exception"""
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("boom")
+
+    def follower():
+        started.wait()
+        return flight.do("k", fail)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flight.do, "k", fail)] + [pool.submit(follower) for _ in range(3)]
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+    assert flight.stats()["executions"] == 1
+
+
+def test_coalesced_decorator_normalizes_arguments():
+    """Test that the key ignores the session and applies defaults"""
+    flight = SingleFlight()
+    executions = []
+
+    @flight.coalesced("top")
+    def top(db, limit=10):
+        executions.append(limit)
+        time.sleep(0.2)
+        return limit
+
+    calls = [lambda: top(object()), lambda: top(object(), limit=10), lambda: top(object(), 10)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(call) for call in calls] + [pool.submit(top, None, 5)]
+        assert [f.result() for f in futures] == [10, 10, 10, 5]
+    assert sorted(executions) == [5, 10]
+
+
+def test_leader_only_errors_make_followers_retry():
+    """Test that followers run the call again instead of receiving a leader-only error"""
+    flight = SingleFlight(leader_only=lambda error: isinstance(error, TimeoutError))
+    started = threading.Event()
+
+    def leader():
+        started.set()
+        time.sleep(0.1)
+        raise TimeoutError("leader's deadline")
+
+    def follower():
+        started.wait()
+        return flight.do("k", lambda: "follower result")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leading = pool.submit(flight.do, "k", leader)
+        following = pool.submit(follower)
+        with pytest.raises(TimeoutError):
+            leading.result()
+        assert following.result() == "follower result"
+    assert flight.stats()["retries"] == 1
+    assert flight.stats()["executions"] == 2
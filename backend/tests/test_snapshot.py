@@ -0,0 +1,67 @@
+import json
+from datetime import date
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from app.models.models import AdverseEvent, TrialResult
+from app.services.snapshot import export_parquet_snapshot
+from tests.test_jobs_api import wait_for_job
+
+
+@pytest.fixture
+def snapshot_data(db_session, sample_drug, sample_trial):
+    db_session.add(TrialResult(trial_id=sample_trial.id, endpoint="Survival", result_value=0.8))
+    db_session.add_all([
+        AdverseEvent(drug_id=sample_drug.id, event_type="Nausea", severity="Mild",
+                     reported_date=date(2022, 1, day))
+        for day in range(1, 6)
+    ])
+    db_session.commit()
+
+
+def test_export_parquet_snapshot(db_session, snapshot_data, tmp_path):
+    """Test that each table is written in row groups with dictionary-encoded text"""
+    progress = []
+    manifest = export_parquet_snapshot(db_session, tmp_path, batch_size=2, progress=progress.append)
+
+    assert {name: t["rows"] for name, t in manifest["tables"].items()} == {
+        "drugs": 1, "clinical_trials": 1, "trial_results": 1, "adverse_events": 5
+    }
+    assert json.loads((tmp_path / "manifest.json").read_text()) == manifest
+    assert progress[-1] == 1.0
+
+    events = pq.ParquetFile(tmp_path / "adverse_events.parquet")
+    assert events.metadata.num_row_groups == 3
+    assert events.metadata.row_group(0).column(0).statistics.has_min_max
+    table = events.read()
+    assert pa.types.is_dictionary(table.schema.field("severity").type)
+    assert table.column("reported_date").to_pylist()[0] == date(2022, 1, 1)
+
+    trials = pq.read_table(tmp_path / "clinical_trials.parquet")
+    assert trials.column("phase").to_pylist() == ["Phase 3"]
+
+
+def test_snapshot_data_version(db_session, snapshot_data, tmp_path):
+    """Test that the data version only changes when the data does"""
+    first = export_parquet_snapshot(db_session, tmp_path / "a")
+    second = export_parquet_snapshot(db_session, tmp_path / "b")
+    assert first["data_version"] == second["data_version"]
+
+    db_session.add(AdverseEvent(drug_id=1, event_type="Rash", reported_date=date(2022, 2, 1)))
+    db_session.commit()
+    third = export_parquet_snapshot(db_session, tmp_path / "c")
+    assert third["data_version"] != first["data_version"]
+
+
+def test_parquet_snapshot_job(client, jobs, snapshot_data, tmp_path, monkeypatch):
+    """Test running the snapshot export as a background job"""
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    job = client.post("/api/v1/jobs/", json={"kind": "parquet_snapshot"}).json()
+    assert wait_for_job(client, job["id"])["status"] == "succeeded"
+
+    result = client.get(f"/api/v1/jobs/{job['id']}/result").json()
+    assert result["tables"]["adverse_events"]["rows"] == 5
+    assert pq.read_table(f"{result['path']}/drugs.parquet").num_rows == 1
@@ -0,0 +1,186 @@
+import asyncio
+import sqlite3
+import threading
+import time
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.singleflight import SingleFlight
+from app.db.timeouts import (
+    QueryControl, _operational_error_handler, current_query, install_statement_timeouts, is_interrupted,
+    statement_timeout_for,
+)
+from tests.conftest import TestingSessionLocal
+
+# Runs for tens of seconds on SQLite unless interrupted
+SLOW_QUERY = text(
+    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 100000000) "
+    "SELECT COUNT(*) FROM n"
+)
+
+
+def get_session():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def slow_app(monkeypatch):
+    monkeypatch.setattr(settings, "STATEMENT_TIMEOUTS", {"/slow": 100})
+    metrics.reset()
+    app = FastAPI()
+    install_statement_timeouts(app)
+
+    @app.get("/slow")
+    def slow(db=Depends(get_session)):
+        return {"count": db.execute(SLOW_QUERY).scalar()}
+
+    @app.get("/fast")
+    def fast(db=Depends(get_session)):
+        return {"value": db.execute(text("SELECT 1")).scalar()}
+
+    return app
+
+
+def test_statement_timeout_for_path(monkeypatch):
+    """Test that the longest matching prefix sets the timeout"""
+    monkeypatch.setattr(settings, "STATEMENT_TIMEOUT_MS", 30000)
+    monkeypatch.setattr(settings, "STATEMENT_TIMEOUTS", {"/api/v1": 5000, "/api/v1/analytics": 60000})
+    assert statement_timeout_for("/api/v1/analytics/summary") == 60000
+    assert statement_timeout_for("/api/v1/drugs/") == 5000
+    assert statement_timeout_for("/health") == 30000
+
+
+def test_slow_query_returns_504(slow_app):
+    """Test that a query past its route timeout is aborted with a 504"""
+    client = TestClient(slow_app)
+    started = time.monotonic()
+    response = client.get("/slow")
+    assert response.status_code == 504
+    assert time.monotonic() - started < 5
+    assert metrics.get("db.statement_timeouts") == 1
+
+    # The connection is usable again and fast queries are unaffected
+    assert client.get("/fast").json() == {"value": 1}
+
+
+def test_cancel_interrupts_running_query():
+    """Test that cancelling a request's control aborts its running statement"""
+    control = QueryControl(timeout_ms=0)
+    errors = []
+
+    def run():
+        current_query.set(control)
+        db = TestingSessionLocal()
+        try:
+            db.execute(SLOW_QUERY)
+        except OperationalError as e:
+            errors.append(e)
+        finally:
+            db.close()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    time.sleep(0.2)
+    control.cancel()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert "interrupted" in str(errors[0])
+
+
+def test_client_disconnect_cancels_query(slow_app, monkeypatch):
+    """Test that a client going away cancels the in-flight query"""
+    monkeypatch.setattr(settings, "STATEMENT_TIMEOUTS", {})
+    monkeypatch.setattr(settings, "STATEMENT_TIMEOUT_MS", 0)
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/slow", "raw_path": b"/slow", "root_path": "",
+        "query_string": b"", "headers": [], "client": ("test", 1), "server": ("test", 80),
+    }
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(0.2)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    started = time.monotonic()
+    asyncio.run(slow_app(scope, receive, send))
+    assert time.monotonic() - started < 5
+    assert sent[0]["status"] == 503
+    assert metrics.get("db.statements_cancelled") == 1
+
+
+def test_leader_disconnect_does_not_fail_waiting_follower():
+    """Test that a coalesced follower re-runs the query when the leader's client disconnects"""
+    flight = SingleFlight(leader_only=is_interrupted)
+    leader_control, follower_control = QueryControl(timeout_ms=0), QueryControl(timeout_ms=60000)
+    leader_started = threading.Event()
+    outcomes = {}
+
+    def request(name, control, query):
+        current_query.set(control)
+        db = TestingSessionLocal()
+
+        def run():
+            leader_started.set()
+            return db.execute(query).scalar()
+
+        try:
+            outcomes[name] = flight.do("summary", run)
+        except OperationalError as e:
+            outcomes[name] = e
+        finally:
+            db.close()
+
+    leader = threading.Thread(target=request, args=("leader", leader_control, SLOW_QUERY))
+    leader.start()
+    leader_started.wait(5)
+    follower = threading.Thread(target=request, args=("follower", follower_control, text("SELECT 7")))
+    follower.start()
+    time.sleep(0.2)
+    assert flight.stats()["in_flight"] == 1
+
+    leader_control.cancel()
+    leader.join(timeout=5)
+    follower.join(timeout=5)
+    assert "interrupted" in str(outcomes["leader"])
+    assert outcomes["follower"] == 7
+    assert not follower_control.expired()
+    assert flight.stats()["retries"] == 1
+
+
+def test_interrupt_without_own_timeout_is_not_504():
+    """Test that a request whose own deadline has not passed never gets a 504"""
+    metrics.reset()
+    error = OperationalError("SELECT 1", {}, sqlite3.OperationalError("interrupted"))
+
+    token = current_query.set(QueryControl(timeout_ms=60000))
+    try:
+        response = asyncio.run(_operational_error_handler(None, error))
+    finally:
+        current_query.reset(token)
+    assert response.status_code == 503
+    assert metrics.get("db.statement_timeouts") == 0
+    assert metrics.get("db.statements_interrupted") == 1
+
+    expired = QueryControl(timeout_ms=1)
+    time.sleep(0.01)
+    token = current_query.set(expired)
+    try:
+        assert asyncio.run(_operational_error_handler(None, error)).status_code == 504
+    finally:
+        current_query.reset(token)
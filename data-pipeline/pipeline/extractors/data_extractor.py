@@ -1,23 +1,39 @@
 import pandas as pd
 import logging
-from typing import Optional
+from typing import Iterator, Optional
 from pathlib import Path
 
+from pipeline.schema import apply_schema, read_dtypes
+
 logger = logging.getLogger(__name__)
 
 
 class DataExtractor:
     """Extract data from various sources"""
     
-    def __init__(self, source_path: str):
+    def __init__(self, source_path: str, typed: bool = False):
+        """
+        Args:
+            source_path: Directory holding the source files
+            typed: Read text as categorical/pyarrow strings and downcast
+                integers (see pipeline.frames)
+        """
         self.source_path = Path(source_path)
+        self.typed = typed
+    
+    def _read_options(self, file_path: Path, entity: Optional[str]) -> dict:
+        if entity is None:
+            return {}
+        header = pd.read_csv(file_path, nrows=0).columns
+        return {'dtype': read_dtypes(entity, header, self.typed)}
         
-    def extract_from_csv(self, filename: str) -> Optional[pd.DataFrame]:
+    def extract_from_csv(self, filename: str, entity: Optional[str] = None) -> Optional[pd.DataFrame]:
         """
         Extract data from CSV file
         
         Args:
             filename: Name of the CSV file
+            entity: Schema (see pipeline.schema) to apply while reading
             
         Returns:
             DataFrame containing the extracted data
@@ -26,7 +42,9 @@ class DataExtractor:
             file_path = self.source_path / filename
             logger.info(f"Extracting data from {file_path}")
             
-            df = pd.read_csv(file_path)
+            df = pd.read_csv(file_path, **self._read_options(file_path, entity))
+            if entity is not None:
+                df = apply_schema(df, entity, self.typed)
             logger.info(f"Successfully extracted {len(df)} records from {filename}")
             
             return df
@@ -38,22 +56,70 @@ class DataExtractor:
             logger.error(f"Error extracting data from {filename}: {str(e)}")
             return None
     
+    def iter_csv(self, filename: str, chunk_size: int, entity: Optional[str] = None) -> Iterator[pd.DataFrame]:
+        """
+        Stream a CSV file in chunks of at most chunk_size rows
+        
+        Args:
+            filename: Name of the CSV file
+            chunk_size: Rows per chunk
+            entity: Schema (see pipeline.schema) to apply to each chunk
+            
+        Yields:
+            DataFrame chunks
+        """
+        file_path = self.source_path / filename
+        logger.info(f"Streaming data from {file_path} in chunks of {chunk_size}")
+        
+        total = 0
+        with pd.read_csv(file_path, chunksize=chunk_size, **self._read_options(file_path, entity)) as reader:
+            for chunk in reader:
+                total += len(chunk)
+                yield apply_schema(chunk, entity, self.typed) if entity is not None else chunk
+        logger.info(f"Streamed {total} records from {filename}")
+    
     def extract_drugs_data(self) -> Optional[pd.DataFrame]:
         """Extract drug data"""
-        return self.extract_from_csv("drugs.csv")
+        return self.extract_from_csv("drugs.csv", "drugs")
     
     def extract_clinical_trials_data(self) -> Optional[pd.DataFrame]:
         """Extract clinical trials data"""
-        return self.extract_from_csv("clinical_trials.csv")
+        return self.extract_from_csv("clinical_trials.csv", "clinical_trials")
+    
+    def extract_trial_results_data(self) -> Optional[pd.DataFrame]:
+        """Extract trial results data"""
+        return self.extract_from_csv("trial_results.csv", "trial_results")
     
     def extract_adverse_events_data(self) -> Optional[pd.DataFrame]:
         """Extract adverse events data"""
-        return self.extract_from_csv("adverse_events.csv")
+        return self.extract_from_csv("adverse_events.csv", "adverse_events")
+    
+    def iter_drugs_data(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """Stream drug data in chunks"""
+        return self.iter_csv("drugs.csv", chunk_size, "drugs")
+    
+    def iter_clinical_trials_data(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """Stream clinical trials data in chunks"""
+        return self.iter_csv("clinical_trials.csv", chunk_size, "clinical_trials")
+    
+    def iter_trial_results_data(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """Stream trial results data in chunks"""
+        return self.iter_csv("trial_results.csv", chunk_size, "trial_results")
+    
+    def iter_adverse_events_data(self, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """Stream adverse events data in chunks"""
+        return self.iter_csv("adverse_events.csv", chunk_size, "adverse_events")
 
 
 class MockDataExtractor:
     """Mock extractor for generating sample data"""
     
+    @staticmethod
+    def iter_chunks(df: pd.DataFrame, chunk_size: int) -> Iterator[pd.DataFrame]:
+        """Split a generated dataframe into chunks, mirroring DataExtractor.iter_csv"""
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+    
     @staticmethod
     def generate_drugs_data() -> pd.DataFrame:
         """Generate sample drug data"""
@@ -89,3 +155,54 @@ class MockDataExtractor:
             'sponsor': ['Bayer', 'Pfizer', 'GSK', 'Novartis', 'Merck']
         }
         return pd.DataFrame(data)
+    
+    @staticmethod
+    def generate_trial_results_data() -> pd.DataFrame:
+        """Generate sample trial result data"""
+        data = {
+            'trial_id': [1, 1, 3, 5],
+            'endpoint': [
+                'Cardiovascular events reduction',
+                'Major bleeding events',
+                'Fever reduction time',
+                'HbA1c reduction'
+            ],
+            'result_value': [25.5, 1.2, 4.2, 1.5],
+            'unit': ['percentage', 'percentage', 'hours', 'percentage'],
+            'p_value': [0.001, 0.04, 0.003, 0.0001],
+            'confidence_interval': ['95% CI: 18-33%', '95% CI: 0.1-2.3%', '95% CI: 3.8-4.6 hours', '95% CI: 1.2-1.8%'],
+            'notes': [
+                'Significant reduction in primary endpoint',
+                None,
+                'Effective fever management',
+                'Significant glycemic control improvement'
+            ]
+        }
+        return pd.DataFrame(data)
+    
+    @staticmethod
+    def generate_adverse_events_data() -> pd.DataFrame:
+        """Generate sample adverse event data"""
+        data = {
+            'drug_id': [1, 2, 3, 4, 5, 2],
+            'event_type': [
+                'Gastrointestinal bleeding',
+                'Stomach upset',
+                'Liver toxicity',
+                'Allergic reaction',
+                'Lactic acidosis',
+                'Headache'
+            ],
+            'severity': ['Moderate', 'mild', 'Severe', 'moderate', 'SEVERE', 'Mild'],
+            'frequency': [150, 500, 25, 200, 10, 80],
+            'description': [
+                'Upper GI bleeding in chronic users',
+                'Mild gastrointestinal discomfort',
+                'Elevated liver enzymes at high doses',
+                'Skin rash and itching',
+                'Rare but serious metabolic complication',
+                None
+            ],
+            'reported_date': ['2022-06-15', '2022-08-20', '2022-03-10', '2022-05-12', '2021-12-05', '2022-09-01']
+        }
+        return pd.DataFrame(data)
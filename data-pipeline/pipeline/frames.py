@@ -0,0 +1,72 @@
+"""
+Memory-lean typed frames
+
+In typed mode, sources are read with low-cardinality text columns as
+categoricals and other text as pyarrow-backed strings (plain pandas strings
+when pyarrow is not installed), and integer columns are downcast to the
+smallest type that holds them; pipeline.schema declares which column is
+which. Floats stay float64: float32 would change the values written to the
+database.
+"""
+import logging
+import sys
+from typing import Dict, Optional
+
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def string_dtype() -> str:
+    """pyarrow-backed strings when pyarrow is installed"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return 'string'
+    return 'string[pyarrow]'
+
+
+def downcast_integers(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast integer columns to the smallest integer type that holds them"""
+    for col in df.select_dtypes(include='integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+
+def frame_memory(frames: Dict[str, pd.DataFrame]) -> int:
+    """Bytes held by the frames, including string payloads"""
+    return int(sum(df.memory_usage(deep=True).sum() for df in frames.values()))
+
+
+def peak_rss() -> Optional[int]:
+    """Peak resident set size of this process in bytes, if the platform reports it"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MemoryReport:
+    """Frame memory and peak RSS recorded after each pipeline stage"""
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    def record(self, stage: str, frames: Dict[str, pd.DataFrame]):
+        peak = peak_rss()
+        self.stages[stage] = {
+            'frames_mb': round(frame_memory(frames) / 2 ** 20, 2),
+            'peak_rss_mb': round(peak / 2 ** 20, 1) if peak is not None else None,
+        }
+
+    def log(self):
+        for stage, usage in self.stages.items():
+            logger.info(
+                f"Memory after {stage}: frames {usage['frames_mb']} MB, peak RSS {usage['peak_rss_mb']} MB"
+            )
@@ -1,11 +1,49 @@
+import csv
+import io
+import time
 import pandas as pd
 import logging
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker
-from typing import Optional
+from typing import Dict
+
+from pipeline.schema import parse_dates, to_dates, without_schema_errors
 
 logger = logging.getLogger(__name__)
 
+# Rows per COPY statement; bounds the size of the in-memory CSV buffer
+COPY_CHUNK_SIZE = 50000
+
+LOAD_MODES = ('append', 'merge')
+
+# Natural key each table is merged on (its unique constraint). Trial results
+# and adverse events have none; a merge load replaces their contents instead,
+# so it must be given every row of the source.
+MERGE_KEYS = {
+    'drugs': 'name',
+    'clinical_trials': 'trial_id',
+}
+
+
+def copy_insert(table, conn, keys, data_iter):
+    """
+    pandas to_sql method that loads rows with PostgreSQL COPY FROM STDIN
+    
+    Rows are written as CSV into an in-memory buffer and streamed to the
+    server in one COPY per to_sql chunk, avoiding per-row INSERT overhead.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(data_iter)
+    buffer.seek(0)
+    
+    columns = ', '.join(f'"{key}"' for key in keys)
+    table_name = f'"{table.schema}"."{table.name}"' if table.schema else f'"{table.name}"'
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(f'COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT csv)', buffer)
+    finally:
+        cursor.close()
+
 
 class DataLoader:
     """Load transformed data into database"""
@@ -15,10 +53,26 @@ class DataLoader:
         Initialize DataLoader
         
         Args:
-            database_url: PostgreSQL connection string
+            database_url: Database connection string (PostgreSQL loads use COPY)
         """
         self.engine = create_engine(database_url)
         self.Session = sessionmaker(bind=self.engine)
+        # Rows, seconds and rows/sec per table, accumulated over all loads
+        self.load_stats: Dict[str, Dict] = {}
+        # Inserted/updated/unchanged rows per table for merge loads
+        self.merge_stats: Dict[str, Dict[str, int]] = {}
+    
+    @property
+    def uses_copy(self) -> bool:
+        """COPY is used on PostgreSQL (psycopg2); other databases use multi-row INSERTs"""
+        return self.engine.dialect.name == 'postgresql' and self.engine.dialect.driver == 'psycopg2'
+    
+    def _record_stats(self, table_name: str, rows: int, seconds: float):
+        stats = self.load_stats.setdefault(table_name, {'rows': 0, 'seconds': 0.0})
+        stats['rows'] += rows
+        stats['seconds'] += seconds
+        stats['method'] = 'copy' if self.uses_copy else 'insert'
+        stats['rows_per_sec'] = round(stats['rows'] / stats['seconds'], 1) if stats['seconds'] else None
     
     def load_dataframe(
         self,
@@ -39,51 +93,231 @@ class DataLoader:
         """
         try:
             logger.info(f"Loading {len(df)} records into table '{table_name}'...")
+            started = time.perf_counter()
             
-            df.to_sql(
-                name=table_name,
-                con=self.engine,
-                if_exists=if_exists,
-                index=False,
-                method='multi',
-                chunksize=1000
-            )
+            # One transaction per call, so each streamed chunk commits on its own
+            with self.engine.begin() as conn:
+                self._bulk_insert(conn, df, table_name, if_exists)
             
-            logger.info(f"Successfully loaded data into '{table_name}'")
+            elapsed = time.perf_counter() - started
+            self._record_stats(table_name, len(df), elapsed)
+            rate = f"{len(df) / elapsed:,.0f}" if elapsed else "n/a"
+            logger.info(f"Successfully loaded data into '{table_name}' ({rate} rows/sec)")
             return True
             
         except Exception as e:
             logger.error(f"Error loading data into '{table_name}': {str(e)}")
             return False
     
-    def load_drugs(self, df: pd.DataFrame) -> bool:
-        """Load drug data"""
+    def _bulk_insert(self, conn, df: pd.DataFrame, table_name: str, if_exists: str = 'append'):
+        df.to_sql(
+            name=table_name,
+            con=conn,
+            if_exists=if_exists,
+            index=False,
+            method=copy_insert if self.uses_copy else 'multi',
+            chunksize=COPY_CHUNK_SIZE if self.uses_copy else 1000
+        )
+    
+    def replace_dataframe(self, df: pd.DataFrame, table_name: str) -> bool:
+        """
+        Replace a table's rows with df in one transaction
+        
+        Used to merge tables without a natural key: the rows are deleted
+        (not truncated, so concurrent readers keep seeing the old rows until
+        commit) and df is bulk-loaded, which makes re-runs idempotent.
+        
+        Args:
+            df: Every row the table should hold
+            table_name: Target table name
+            
+        Returns:
+            Success status
+        """
+        try:
+            logger.info(f"Replacing the rows of table '{table_name}' with {len(df)} records...")
+            started = time.perf_counter()
+            
+            with self.engine.begin() as conn:
+                deleted = conn.execute(text(f"DELETE FROM {table_name}")).rowcount
+                self._bulk_insert(conn, df, table_name)
+            
+            self._record_stats(table_name, len(df), time.perf_counter() - started)
+            logger.info(f"Replaced {deleted} rows of '{table_name}' with {len(df)}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error replacing data in '{table_name}': {str(e)}")
+            return False
+    
+    def merge_dataframe(self, df: pd.DataFrame, table_name: str, key: str) -> bool:
+        """
+        Upsert dataframe into a table on its natural key
+        
+        Rows are bulk-loaded into a temporary staging table, then applied
+        with a single INSERT ... ON CONFLICT DO UPDATE that only rewrites
+        rows whose values differ. Re-running with the same data changes
+        nothing. Counts are accumulated in merge_stats.
+        
+        Args:
+            df: DataFrame to merge
+            table_name: Target table name
+            key: Column with a unique constraint to match rows on
+            
+        Returns:
+            Success status
+        """
+        stage = f"{table_name}_staging"
+        # The last occurrence of a key wins; ON CONFLICT cannot touch a row twice
+        df = df.drop_duplicates(subset=key, keep='last')
+        columns = list(df.columns)
+        column_list = ', '.join(columns)
+        distinct = 'IS DISTINCT FROM' if self.engine.dialect.name == 'postgresql' else 'IS NOT'
+        
+        def changed(target: str, source: str) -> str:
+            """Predicate that is true when any non-key column differs (NULL-safe)"""
+            return ' OR '.join(
+                f"{target}.{col} {distinct} {source}.{col}" for col in columns if col != key
+            ) or '1 = 0'
+        
+        try:
+            logger.info(f"Merging {len(df)} records into table '{table_name}'...")
+            started = time.perf_counter()
+            
+            with self.engine.begin() as conn:
+                target_columns = {col['name'] for col in inspect(conn).get_columns(table_name)}
+                conn.execute(text(f"DROP TABLE IF EXISTS {stage}"))
+                conn.execute(text(
+                    f"CREATE TEMPORARY TABLE {stage} AS SELECT {column_list} FROM {table_name} WHERE 1 = 0"
+                ))
+                self._bulk_insert(conn, df, stage)
+                
+                inserted = conn.execute(text(
+                    f"SELECT COUNT(*) FROM {stage} s "
+                    f"WHERE NOT EXISTS (SELECT 1 FROM {table_name} t WHERE t.{key} = s.{key})"
+                )).scalar()
+                updated = conn.execute(text(
+                    f"SELECT COUNT(*) FROM {stage} s JOIN {table_name} t ON t.{key} = s.{key} "
+                    f"WHERE {changed('t', 's')}"
+                )).scalar()
+                
+                assignments = [f"{col} = excluded.{col}" for col in columns if col != key]
+                if 'updated_at' in target_columns and 'updated_at' not in columns:
+                    assignments.append("updated_at = CURRENT_TIMESTAMP")
+                upsert = (
+                    # WHERE true keeps SQLite from reading ON CONFLICT as a join clause
+                    f"INSERT INTO {table_name} ({column_list}) SELECT {column_list} FROM {stage} s WHERE true "
+                    f"ON CONFLICT ({key}) "
+                )
+                if len(columns) > 1:
+                    upsert += (
+                        f"DO UPDATE SET {', '.join(assignments)} "
+                        f"WHERE {changed(table_name, 'excluded')}"
+                    )
+                else:
+                    upsert += "DO NOTHING"
+                conn.execute(text(upsert))
+                conn.execute(text(f"DROP TABLE {stage}"))
+            
+            elapsed = time.perf_counter() - started
+            self._record_stats(table_name, len(df), elapsed)
+            counts = self.merge_stats.setdefault(table_name, {'inserted': 0, 'updated': 0, 'unchanged': 0})
+            counts['inserted'] += inserted
+            counts['updated'] += updated
+            counts['unchanged'] += len(df) - inserted - updated
+            logger.info(
+                f"Merged into '{table_name}': {inserted} inserted, {updated} updated, "
+                f"{len(df) - inserted - updated} unchanged"
+            )
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error merging data into '{table_name}': {str(e)}")
+            return False
+    
+    def _write(self, df: pd.DataFrame, table_name: str, mode: str) -> bool:
+        df = without_schema_errors(df)
+        if mode == 'merge' and table_name in MERGE_KEYS:
+            return self.merge_dataframe(df, table_name, MERGE_KEYS[table_name])
+        if mode == 'merge':
+            return self.replace_dataframe(df, table_name)
+        return self.load_dataframe(df, table_name, if_exists='append')
+    
+    def load_drugs(self, df: pd.DataFrame, mode: str = 'append') -> bool:
+        """Load drug data ('append' or 'merge' on name)"""
         # Prepare data for loading
-        df_load = df.copy()
+        df_load = df.copy(deep=False)
         
         # Remove auto-increment columns if present
         if 'id' in df_load.columns:
             df_load = df_load.drop('id', axis=1)
         
-        # Convert dates to proper format
-        if 'approval_date' in df_load.columns:
-            df_load['approval_date'] = pd.to_datetime(df_load['approval_date'], errors='coerce')
+        # No-op for frames typed at extraction
+        df_load = parse_dates(df_load, 'drugs')
         
-        return self.load_dataframe(df_load, 'drugs', if_exists='append')
+        return self._write(df_load, 'drugs', mode)
     
-    def load_clinical_trials(self, df: pd.DataFrame) -> bool:
-        """Load clinical trial data"""
-        df_load = df.copy()
+    def load_clinical_trials(self, df: pd.DataFrame, mode: str = 'append') -> bool:
+        """Load clinical trial data ('append' or 'merge' on trial_id)"""
+        df_load = df.copy(deep=False)
         
         if 'id' in df_load.columns:
             df_load = df_load.drop('id', axis=1)
         
-        # Convert dates
-        for col in ['start_date', 'end_date']:
-            if col in df_load.columns:
-                df_load[col] = pd.to_datetime(df_load[col], errors='coerce')
+        df_load = parse_dates(df_load, 'clinical_trials')
+        
+        return self._write(df_load, 'clinical_trials', mode)
+    
+    def load_trial_results(self, df: pd.DataFrame, mode: str = 'append') -> bool:
+        """Load trial result data ('append', or 'merge' to replace the table's rows with df)"""
+        df_load = df.copy(deep=False)
+        
+        if 'id' in df_load.columns:
+            df_load = df_load.drop('id', axis=1)
+        
+        return self._write(df_load, 'trial_results', mode)
+    
+    def ensure_adverse_event_partitions(self, reported_dates: pd.Series) -> int:
+        """
+        Create the monthly adverse_events partitions a batch will land in
+
+        Only applies to PostgreSQL, where adverse_events is partitioned by
+        reported_date; rows for months without a partition would otherwise
+        pile up in the default partition.
+        """
+        if self.engine.dialect.name != 'postgresql' or reported_dates.empty:
+            return 0
+        with self.engine.begin() as conn:
+            return conn.execute(
+                text("SELECT ensure_adverse_event_partitions(:start, :end)"),
+                {"start": reported_dates.min().date(), "end": reported_dates.max().date()}
+            ).scalar() or 0
+    
+    def load_adverse_events(self, df: pd.DataFrame, mode: str = 'append') -> bool:
+        """Load adverse event data ('append', or 'merge' to replace the table's rows with df)"""
+        df_load = df.copy(deep=False)
+        
+        if 'id' in df_load.columns:
+            df_load = df_load.drop('id', axis=1)
+        
+        # reported_date is the partition key and may not be null; inventing one
+        # would misdate the event, so such rows are quarantined by validation
+        if 'reported_date' not in df_load.columns:
+            logger.error("Error loading adverse_events: no reported_date column")
+            return False
+        df_load['reported_date'] = to_dates(df_load['reported_date'])
+        missing = int(df_load['reported_date'].isna().sum())
+        if missing:
+            logger.error(f"Error loading adverse_events: {missing} rows have no reported_date")
+            return False
+        
+        try:
+            self.ensure_adverse_event_partitions(df_load['reported_date'])
+        except Exception as e:
+            logger.error(f"Error creating adverse_events partitions: {str(e)}")
+            return False
         
-        return self.load_dataframe(df_load, 'clinical_trials', if_exists='append')
+        return self._write(df_load, 'adverse_events', mode)
     
     def truncate_table(self, table_name: str) -> bool:
         """
@@ -8,130 +8,250 @@ import argparse
 import logging
 import sys
 from pathlib import Path
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, NamedTuple, Optional
 from dotenv import load_dotenv
 import os
+import pandas as pd
 
 from pipeline.extractors import DataExtractor, MockDataExtractor
 from pipeline.transformers import DataTransformer
-from pipeline.validators import DataValidator
+from pipeline.transformers import parallel
+from pipeline.validators import RULESETS, DataValidator
 from pipeline.loaders import DataLoader
+from pipeline.loaders.data_loader import LOAD_MODES, MERGE_KEYS
+from pipeline.state import WatermarkState
+from pipeline.frames import MemoryReport
+from pipeline.quarantine import Quarantine
+from pipeline.schema import apply_schema, without_schema_errors
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, os.getenv('LOG_LEVEL', 'INFO')),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('pipeline.log')
-    ]
-)
-
 logger = logging.getLogger(__name__)
 
 
+class Entity(NamedTuple):
+    """How one source moves through the pipeline"""
+    filename: str
+    output_file: str
+    clean: Callable
+    key: Callable  # dedup key the parallel transform partitions on
+    load: str  # DataLoader method
+    required: bool = True
+
+
+ENTITIES: Dict[str, Entity] = {
+    'drugs': Entity(
+        'drugs.csv', 'drugs_transformed.csv',
+        DataTransformer.clean_drug_data, DataTransformer.drug_key,
+        'load_drugs'
+    ),
+    'clinical_trials': Entity(
+        'clinical_trials.csv', 'trials_transformed.csv',
+        DataTransformer.clean_clinical_trial_data, DataTransformer.clinical_trial_key,
+        'load_clinical_trials'
+    ),
+    'trial_results': Entity(
+        'trial_results.csv', 'trial_results_transformed.csv',
+        DataTransformer.clean_trial_result_data, DataTransformer.trial_result_key,
+        'load_trial_results', required=False
+    ),
+    'adverse_events': Entity(
+        'adverse_events.csv', 'adverse_events_transformed.csv',
+        DataTransformer.clean_adverse_event_data, DataTransformer.adverse_event_key,
+        'load_adverse_events', required=False
+    ),
+}
+
+# Foreign-key order: clinical trials reference drugs, trial results reference
+# clinical trials and adverse events reference drugs. Tables in one group only
+# depend on earlier groups and are loaded concurrently.
+LOAD_ORDER = [['drugs'], ['clinical_trials'], ['trial_results', 'adverse_events']]
+
+
 class DataPipeline:
     """Main ETL Pipeline orchestrator"""
     
-    def __init__(self, mode: str = 'full', use_mock_data: bool = True):
+    def __init__(
+        self,
+        mode: str = 'full',
+        use_mock_data: bool = True,
+        chunk_size: Optional[int] = None,
+        load_mode: str = 'append',
+        incremental: bool = False,
+        workers: int = 1,
+        typed_frames: bool = False
+    ):
         """
         Initialize pipeline
         
         Args:
             mode: Pipeline mode ('full', 'extract', 'transform', 'load')
             use_mock_data: Whether to use mock data or read from files
+            chunk_size: Stream the data through every stage in chunks of
+                this many rows instead of loading whole files
+            load_mode: 'append' inserts every row; 'merge' upserts on the
+                natural keys so re-runs only touch changed rows
+            incremental: Only process rows that are new or changed since the
+                last successful run (requires load_mode='merge'); sources
+                without a natural key are reloaded in full when they change
+            workers: Processes used to clean large sources in hash
+                partitions (whole-file runs only); 1 cleans in-process
+            typed_frames: Hold text as categorical/pyarrow strings and
+                downcast integers from extraction onward to cut memory
         """
+        if load_mode not in LOAD_MODES:
+            raise ValueError(f"load_mode must be one of {LOAD_MODES}")
+        if incremental and load_mode != 'merge':
+            raise ValueError("incremental runs require load_mode='merge'")
         self.mode = mode
         self.use_mock_data = use_mock_data
+        self.chunk_size = chunk_size
+        self.load_mode = load_mode
+        self.workers = workers
+        self.typed_frames = typed_frames
+        self.memory = MemoryReport()
+        # Sources skipped as unchanged on an incremental run; never loaded
+        self.unchanged = set()
         
         # Initialize components
         self.source_path = os.getenv('DATA_SOURCE_PATH', './data/source')
         self.output_path = os.getenv('DATA_OUTPUT_PATH', './data/processed')
         self.database_url = os.getenv('DATABASE_URL')
+        self.state = WatermarkState(
+            os.getenv('PIPELINE_STATE_PATH', str(Path(self.output_path) / 'pipeline_state.json'))
+        ) if incremental else None
         
         if not self.database_url:
             logger.warning("DATABASE_URL not set. Loading to database will be skipped.")
         
         # Create directories if they don't exist
         Path(self.output_path).mkdir(parents=True, exist_ok=True)
+        self.quarantine = Quarantine(self.output_path)
+    
+    def extract_source(self, extractor: Optional[DataExtractor], name: str) -> Optional[pd.DataFrame]:
+        """
+        Extract one source; on incremental runs only its new or changed rows
+        
+        Returns None if the source failed to extract or is an optional file
+        that does not exist.
+        """
+        if extractor is None:
+            df = getattr(MockDataExtractor, f'generate_{name}_data')()
+            df = apply_schema(df, name, self.typed_frames)
+            return self.changed_rows(name, df) if self.filters_rows(name) else df
+        
+        entity = ENTITIES[name]
+        if not entity.required and not (extractor.source_path / entity.filename).exists():
+            logger.info(f"{name}: no {entity.filename} in {self.source_path}, skipping")
+            return None
+        unchanged = self.unchanged_file(extractor, name, entity.filename)
+        if unchanged is not None:
+            return unchanged
+        df = getattr(extractor, f'extract_{name}_data')()
+        if df is not None and self.filters_rows(name):
+            df = self.changed_rows(name, df)
+        return df
     
-    def extract(self):
-        """Extract data from sources"""
+    def extract(self) -> Optional[Dict[str, pd.DataFrame]]:
+        """Extract all sources concurrently"""
         logger.info("=" * 50)
         logger.info("EXTRACTION PHASE")
         logger.info("=" * 50)
         
         if self.use_mock_data:
             logger.info("Using mock data generator...")
-            drugs_df = MockDataExtractor.generate_drugs_data()
-            trials_df = MockDataExtractor.generate_clinical_trials_data()
+            extractor = None
         else:
             logger.info(f"Extracting data from {self.source_path}...")
-            extractor = DataExtractor(self.source_path)
-            drugs_df = extractor.extract_drugs_data()
-            trials_df = extractor.extract_clinical_trials_data()
+            extractor = DataExtractor(self.source_path, typed=self.typed_frames)
         
-        if drugs_df is None or trials_df is None:
-            logger.error("Extraction failed")
-            return None, None
+        with ThreadPoolExecutor(max_workers=len(ENTITIES)) as pool:
+            futures = {name: pool.submit(self.extract_source, extractor, name) for name in ENTITIES}
+            extracted = {name: future.result() for name, future in futures.items()}
         
-        logger.info(f"Extracted {len(drugs_df)} drugs and {len(trials_df)} clinical trials")
+        failed = [name for name, df in extracted.items() if df is None and ENTITIES[name].required]
+        if failed:
+            logger.error(f"Extraction failed for {failed}")
+            return None
         
-        return drugs_df, trials_df
+        frames = {name: df for name, df in extracted.items() if df is not None}
+        logger.info("Extracted " + ", ".join(f"{len(df)} {name}" for name, df in frames.items()))
+        
+        return frames
+    
+    def transform_source(self, name: str, df: pd.DataFrame, pool: Optional[Executor] = None) -> pd.DataFrame:
+        """Clean one source, on the process pool if it is large enough, and save the result"""
+        entity = ENTITIES[name]
+        if pool is not None and len(df) >= parallel.MIN_PARALLEL_ROWS:
+            df_clean = parallel.parallel_clean(entity.clean, df, entity.key, pool, self.workers * 2)
+        else:
+            df_clean = entity.clean(df)
+        without_schema_errors(df_clean).to_csv(Path(self.output_path) / entity.output_file, index=False)
+        return df_clean
     
-    def transform(self, drugs_df, trials_df):
-        """Transform and clean data"""
+    def transform(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """
+        Transform and clean data
+        
+        Cleaning only looks at a source's own rows, so all sources are
+        transformed concurrently. With more than one worker, large sources
+        are split into hash partitions cleaned on a shared process pool.
+        """
         logger.info("=" * 50)
         logger.info("TRANSFORMATION PHASE")
         logger.info("=" * 50)
         
-        # Clean data
-        logger.info("Cleaning drug data...")
-        drugs_clean = DataTransformer.clean_drug_data(drugs_df)
-        
-        logger.info("Cleaning clinical trial data...")
-        trials_clean = DataTransformer.clean_clinical_trial_data(trials_df)
-        
-        # Save transformed data
-        drugs_output = Path(self.output_path) / 'drugs_transformed.csv'
-        trials_output = Path(self.output_path) / 'trials_transformed.csv'
-        
-        drugs_clean.to_csv(drugs_output, index=False)
-        trials_clean.to_csv(trials_output, index=False)
+        large = any(len(df) >= parallel.MIN_PARALLEL_ROWS for df in frames.values())
+        process_pool = parallel.create_process_pool(self.workers) if self.workers > 1 and large else None
+        try:
+            with ThreadPoolExecutor(max_workers=len(frames) or 1) as pool:
+                futures = {
+                    name: pool.submit(self.transform_source, name, df, process_pool)
+                    for name, df in frames.items()
+                }
+                cleaned = {name: future.result() for name, future in futures.items()}
+        finally:
+            if process_pool is not None:
+                process_pool.shutdown()
         
         logger.info(f"Transformed data saved to {self.output_path}")
         
-        return drugs_clean, trials_clean
+        return cleaned
     
-    def validate(self, drugs_df, trials_df):
-        """Validate data quality"""
+    def validate(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """
+        Validate data quality and quarantine invalid rows
+        
+        Returns the frames reduced to the rows that passed every rule; the
+        others are written to the quarantine with the rules they failed.
+        """
         logger.info("=" * 50)
         logger.info("VALIDATION PHASE")
         logger.info("=" * 50)
         
-        # Validate drugs
-        drugs_valid, drugs_issues = DataValidator.validate_drug_data(drugs_df)
-        if not drugs_valid:
-            logger.warning(f"Drug data validation issues: {drugs_issues}")
-        
-        # Validate trials
-        trials_valid, trials_issues = DataValidator.validate_clinical_trial_data(trials_df)
-        if not trials_valid:
-            logger.warning(f"Clinical trial data validation issues: {trials_issues}")
-        
-        # Generate quality reports
-        drugs_report = DataValidator.generate_quality_report(drugs_df, 'drugs')
-        trials_report = DataValidator.generate_quality_report(trials_df, 'clinical_trials')
-        
-        logger.info(f"Drug Data Quality: {drugs_report['completeness_score']:.2f}% complete")
-        logger.info(f"Clinical Trial Data Quality: {trials_report['completeness_score']:.2f}% complete")
+        valid = {}
+        for name, df in frames.items():
+            validation = RULESETS[name].validation()
+            valid[name] = self.quarantine.split(name, df, validation)
+            issues = validation.issues()
+            if issues:
+                logger.warning(f"{name} validation issues: {issues}")
+            
+            report = DataValidator.generate_quality_report(df, name)
+            logger.info(f"{name} quality: {report['completeness_score']:.2f}% complete")
         
-        return drugs_valid and trials_valid
+        self.quarantine.log()
+        return valid
     
-    def load(self, drugs_df, trials_df):
-        """Load data into database"""
+    def load(self, frames: Dict[str, pd.DataFrame]) -> bool:
+        """
+        Load data into database in foreign-key order
+        
+        Tables in the same LOAD_ORDER group are loaded concurrently. Loading
+        stops at the first group that fails, since later tables reference it.
+        """
         logger.info("=" * 50)
         logger.info("LOADING PHASE")
         logger.info("=" * 50)
@@ -143,51 +263,218 @@ class DataPipeline:
         try:
             loader = DataLoader(self.database_url)
             
-            # Load drugs
-            logger.info("Loading drug data...")
-            drugs_success = loader.load_drugs(drugs_df)
+            def load_source(name: str) -> bool:
+                logger.info(f"Loading {name} data...")
+                return getattr(loader, ENTITIES[name].load)(frames[name], mode=self.load_mode)
             
-            # Load clinical trials
-            logger.info("Loading clinical trial data...")
-            trials_success = loader.load_clinical_trials(trials_df)
+            success = True
+            for group in LOAD_ORDER:
+                names = [name for name in group if name in frames and name not in self.unchanged]
+                if not names:
+                    continue
+                with ThreadPoolExecutor(max_workers=len(names)) as pool:
+                    failed = [name for name, ok in zip(names, pool.map(load_source, names)) if not ok]
+                if failed:
+                    logger.error(f"Failed to load {failed}; skipping the tables that depend on them")
+                    success = False
+                    break
             
-            if drugs_success and trials_success:
+            self.log_load_stats(loader)
+            if success:
                 logger.info("Data successfully loaded into database")
-                return True
             else:
                 logger.error("Some data failed to load")
-                return False
+            return success
                 
         except Exception as e:
             logger.error(f"Error loading data: {str(e)}")
             return False
     
+    def unchanged_file(self, extractor: DataExtractor, source: str, filename: str) -> Optional[pd.DataFrame]:
+        """
+        Empty frame with the file's columns if this is an incremental run and
+        the file has not changed since the last successful run, otherwise None
+        """
+        if self.state is None:
+            return None
+        file_path = extractor.source_path / filename
+        if not file_path.exists() or self.state.file_changed(source, file_path):
+            return None
+        logger.info(f"{source}: {filename} unchanged since last run, skipping")
+        self.unchanged.add(source)
+        return apply_schema(pd.read_csv(file_path, nrows=0), source, self.typed_frames)
+    
+    def filters_rows(self, source: str) -> bool:
+        """
+        Whether an incremental run passes on only the source's changed rows
+        
+        Only sources with a natural key are merged row by row; the others
+        replace their table on a merge load, so they need every row.
+        """
+        return self.state is not None and source in MERGE_KEYS
+    
+    def changed_rows(self, source: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Drop rows already processed by the last successful run"""
+        changed = self.state.filter_changed(source, df)
+        logger.info(f"{source}: {len(changed)} of {len(df)} rows new or changed since last run")
+        return changed
+    
+    def iter_source(self, extractor: Optional[DataExtractor], name: str) -> Optional[Iterator[pd.DataFrame]]:
+        """Chunk iterator for one source, or None for a missing optional file"""
+        if extractor is None:
+            df = getattr(MockDataExtractor, f'generate_{name}_data')()
+            df = apply_schema(df, name, self.typed_frames)
+            chunks = MockDataExtractor.iter_chunks(df, self.chunk_size)
+        else:
+            entity = ENTITIES[name]
+            if not entity.required and not (extractor.source_path / entity.filename).exists():
+                logger.info(f"{name}: no {entity.filename} in {self.source_path}, skipping")
+                return None
+            if self.unchanged_file(extractor, name, entity.filename) is not None:
+                chunks = iter(())
+            else:
+                chunks = getattr(extractor, f'iter_{name}_data')(self.chunk_size)
+        
+        if self.filters_rows(name):
+            chunks = self.iter_changed_rows(name, chunks)
+        return chunks
+    
+    def iter_changed_rows(self, source: str, chunks: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Filter each chunk down to its new or changed rows"""
+        for chunk in chunks:
+            yield self.state.filter_changed(source, chunk)
+    
+    def run_streaming(self) -> bool:
+        """
+        Extract, transform, validate and load one chunk at a time
+        
+        Memory is bounded by the chunk size plus the set of keys seen so
+        far, which keeps deduplication correct across chunks. Sources are
+        streamed one after another in foreign-key order and every chunk is
+        committed on its own, without the rows quarantined by validation.
+        """
+        loader = DataLoader(self.database_url) if self.database_url else None
+        if loader is None:
+            logger.warning("DATABASE_URL not set. Skipping database load.")
+        
+        if self.use_mock_data:
+            logger.info("Using mock data generator...")
+            extractor = None
+        else:
+            logger.info(f"Streaming data from {self.source_path}...")
+            extractor = DataExtractor(self.source_path, typed=self.typed_frames)
+        
+        success = True
+        for name, entity in ENTITIES.items():
+            chunks = self.iter_source(extractor, name)
+            if chunks is None:
+                continue
+            load = getattr(loader, entity.load) if loader else None
+            output = Path(self.output_path) / entity.output_file
+            seen = set()
+            validation = RULESETS[name].validation()
+            # A merge load replaces a table without a natural key: the first
+            # chunk replaces its rows (even if empty) and later chunks append
+            replaces = self.load_mode == 'merge' and name not in MERGE_KEYS
+            extracted = kept = loaded = 0
+            
+            for index, chunk in enumerate(chunks):
+                extracted += len(chunk)
+                chunk_clean = entity.clean(chunk, seen)
+                kept += len(chunk_clean)
+                without_schema_errors(chunk_clean).to_csv(output, mode='w' if index == 0 else 'a', header=index == 0, index=False)
+                
+                chunk_valid = self.quarantine.split(name, chunk_clean, validation)
+                
+                mode = 'append' if replaces and index > 0 else self.load_mode
+                if load is not None and (not chunk_valid.empty or replaces and index == 0):
+                    if load(chunk_valid, mode=mode):
+                        loaded += len(chunk_valid)
+                    else:
+                        logger.error(f"Failed to load {name} chunk {index}")
+                        success = False
+            
+            issues = validation.issues()
+            if issues:
+                logger.warning(f"{name} validation issues: {issues}")
+            logger.info(f"{name}: extracted {extracted}, kept {kept} after deduplication, loaded {loaded}")
+        
+        self.quarantine.log()
+        if loader is not None:
+            self.log_load_stats(loader)
+            if success and self.state is not None:
+                self.state.save()
+        return success
+    
+    @staticmethod
+    def log_load_stats(loader: DataLoader):
+        """Log load throughput per table"""
+        for table, stats in loader.load_stats.items():
+            logger.info(
+                f"Loaded {stats['rows']} rows into '{table}' in {stats['seconds']:.2f}s "
+                f"({stats['rows_per_sec']} rows/sec, {stats['method']})"
+            )
+        for table, counts in loader.merge_stats.items():
+            logger.info(
+                f"Merged '{table}': {counts['inserted']} inserted, {counts['updated']} updated, "
+                f"{counts['unchanged']} unchanged"
+            )
+    
     def run(self):
-        """Run the complete pipeline"""
+        """
+        Run the complete pipeline
+        
+        Stages hand frames to each other without defensive copies; with
+        copy-on-write, enabled for the run only, a shared column is copied
+        only when a stage modifies it.
+        """
+        with pd.option_context('mode.copy_on_write', True):
+            return self._run()
+    
+    def _run(self):
+        self.unchanged = set()
         logger.info("Starting DataMAx ETL Pipeline")
         logger.info(f"Mode: {self.mode}")
         
+        if self.chunk_size:
+            logger.info(f"Streaming in chunks of {self.chunk_size} rows")
+            try:
+                if not self.run_streaming():
+                    return False
+                logger.info("=" * 50)
+                logger.info("PIPELINE COMPLETED SUCCESSFULLY")
+                logger.info("=" * 50)
+                return True
+            except Exception as e:
+                logger.error(f"Pipeline failed: {str(e)}", exc_info=True)
+                return False
+        
         try:
             # Extract
             if self.mode in ['full', 'extract']:
-                drugs_df, trials_df = self.extract()
-                if drugs_df is None:
+                frames = self.extract()
+                if frames is None:
                     return False
+                self.memory.record('extract', frames)
             
             # Transform
             if self.mode in ['full', 'transform']:
-                drugs_df, trials_df = self.transform(drugs_df, trials_df)
+                frames = self.transform(frames)
+                self.memory.record('transform', frames)
             
-            # Validate
+            # Validate; invalid rows are quarantined instead of failing the load
             if self.mode in ['full', 'validate']:
-                is_valid = self.validate(drugs_df, trials_df)
-                if not is_valid:
-                    logger.warning("Data validation found issues, but continuing...")
+                frames = self.validate(frames)
             
             # Load
             if self.mode in ['full', 'load']:
-                self.load(drugs_df, trials_df)
+                loaded = self.load(frames)
+                self.memory.record('load', frames)
+                # Watermarks only advance once their rows are in the database
+                if loaded and self.state is not None:
+                    self.state.save()
             
+            self.memory.log()
             logger.info("=" * 50)
             logger.info("PIPELINE COMPLETED SUCCESSFULLY")
             logger.info("=" * 50)
@@ -212,11 +499,71 @@ def main():
         action='store_true',
         help='Use CSV files instead of mock data'
     )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=None,
+        help='Stream rows through the pipeline in chunks of this size (full mode only)'
+    )
+    parser.add_argument(
+        '--load-mode',
+        choices=LOAD_MODES,
+        default=None,
+        help="'append' inserts every row; 'merge' upserts on drug name / trial ID via a staging table "
+             "(default: append, or merge with --incremental)"
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Processes used to clean large sources in parallel (whole-file runs only)'
+    )
+    parser.add_argument(
+        '--typed-frames',
+        action='store_true',
+        help='Use categorical/pyarrow string columns and downcast integers to reduce memory'
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only process rows that are new or changed since the last successful run (full mode only)'
+    )
     
     args = parser.parse_args()
+    if args.chunk_size is not None:
+        if args.chunk_size <= 0:
+            parser.error('--chunk-size must be positive')
+        if args.mode != 'full':
+            parser.error('--chunk-size is only supported with --mode full')
+    if args.incremental:
+        if args.mode != 'full':
+            parser.error('--incremental is only supported with --mode full')
+        if args.load_mode == 'append':
+            parser.error('--incremental requires --load-mode merge')
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    load_mode = args.load_mode or ('merge' if args.incremental else 'append')
+    
+    # Configure logging
+    logging.basicConfig(
+        level=getattr(logging, os.getenv('LOG_LEVEL', 'INFO')),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+            logging.FileHandler('pipeline.log')
+        ]
+    )
     
     # Run pipeline
-    pipeline = DataPipeline(mode=args.mode, use_mock_data=not args.use_files)
+    pipeline = DataPipeline(
+        mode=args.mode,
+        use_mock_data=not args.use_files,
+        chunk_size=args.chunk_size,
+        load_mode=load_mode,
+        incremental=args.incremental,
+        workers=args.workers,
+        typed_frames=args.typed_frames
+    )
     success = pipeline.run()
     
     sys.exit(0 if success else 1)
@@ -0,0 +1,106 @@
+"""
+Quarantine of rows that fail validation
+
+Instead of loading a frame all-or-nothing, each frame (or chunk) is split
+with its validation bitmap: valid rows go on to the loader, invalid rows are
+written to `<output>/quarantine` with a `failed_rules` column naming the
+rules they broke (which also covers values apply_schema could not coerce,
+so its per-row record is dropped). With pyarrow installed each entity gets a Parquet dataset
+directory (one part file per frame or chunk), otherwise a single CSV file.
+"""
+import logging
+import shutil
+from pathlib import Path
+from typing import Dict
+
+import pandas as pd
+
+from pipeline.schema import without_schema_errors
+from pipeline.validators.rules import Validation
+
+logger = logging.getLogger(__name__)
+
+FAILED_RULES_COLUMN = 'failed_rules'
+
+
+def quarantine_format() -> str:
+    """'parquet' when pyarrow is installed, otherwise 'csv'"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return 'csv'
+    return 'parquet'
+
+
+class Quarantine:
+    """Invalid rows set aside per entity during one pipeline run"""
+
+    def __init__(self, output_path: str, format: str = None):
+        self.path = Path(output_path) / 'quarantine'
+        self.format = format or quarantine_format()
+        self.metrics: Dict[str, Dict] = {}
+        self._parts: Dict[str, int] = {}
+
+    def location(self, name: str) -> Path:
+        return self.path / name if self.format == 'parquet' else self.path / f'{name}.csv'
+
+    def split(self, name: str, df: pd.DataFrame, validation: Validation) -> pd.DataFrame:
+        """
+        Validate df, quarantine its invalid rows and return the valid ones
+
+        Args:
+            name: Entity name
+            df: Frame or chunk to validate
+            validation: The entity's running validation; chunks of one
+                source must share it so duplicate keys are found across them
+
+        Returns:
+            The rows of df that passed every rule
+        """
+        if name not in self.metrics:
+            self._clear(name)
+        bitmap = validation.update(df)
+        invalid = bitmap != 0
+        metrics = self.metrics.setdefault(name, {'rows': 0, 'quarantined': 0, 'rules': {}})
+        metrics['rows'] += len(df)
+        metrics['quarantined'] += int(invalid.sum())
+        metrics['rules'] = {rule: count for rule, count in validation.counts.items() if count}
+
+        df = without_schema_errors(df)
+        if invalid.any():
+            rejected = df[invalid].assign(**{FAILED_RULES_COLUMN: validation.failed_rules(bitmap[invalid])})
+            self._write(name, rejected)
+        return df[~invalid]
+
+    def _clear(self, name: str):
+        """Remove what an earlier run quarantined for this entity"""
+        location = self.location(name)
+        if location.is_dir():
+            shutil.rmtree(location)
+        elif location.exists():
+            location.unlink()
+
+    def _write(self, name: str, rejected: pd.DataFrame):
+        part = self._parts.get(name, 0)
+        location = self.location(name)
+        self.path.mkdir(parents=True, exist_ok=True)
+        if self.format == 'parquet':
+            # Text columns are written as strings so a part where one is all
+            # null still has the same schema as the other parts
+            text = rejected.select_dtypes(include='object').columns
+            rejected = rejected.astype({col: 'string' for col in text})
+            location.mkdir(exist_ok=True)
+            rejected.to_parquet(location / f'part-{part:05d}.parquet', index=False)
+        else:
+            rejected.to_csv(location, mode='w' if part == 0 else 'a', header=part == 0, index=False)
+        self._parts[name] = part + 1
+
+    def log(self):
+        for name, metrics in self.metrics.items():
+            if not metrics['quarantined']:
+                continue
+            share = metrics['quarantined'] / metrics['rows'] * 100
+            logger.warning(
+                f"Quarantined {metrics['quarantined']} of {metrics['rows']} {name} rows ({share:.2f}%) "
+                f"to {self.location(name)}; failed rules: {metrics['rules']}"
+            )
@@ -0,0 +1,201 @@
+"""
+Typed schema contract for every pipeline entity
+
+Each source column is declared once with its kind (text, category, enum,
+integer, float or date) and, for enums, the allowed values. The schema is
+applied at extraction: numbers are coerced and dates parsed with the
+declared format, so no stage runs format inference and later stages trust
+the typed columns instead of parsing them again. Columns a source has but
+the schema does not declare are passed through untouched. Values that do
+not fit their type are recorded per row in SCHEMA_ERRORS_COLUMN, so
+validation can reject those rows instead of loading them as missing.
+"""
+import logging
+import re
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pipeline.frames import downcast_integers, string_dtype
+
+logger = logging.getLogger(__name__)
+
+# Source dates are ISO 8601 (2020-01-15, optionally with a time). Parsing with
+# an explicit format takes pandas' fast path; anything else becomes NaT.
+DATE_FORMAT = 'ISO8601'
+
+PHASES = ('Phase 1', 'Phase 2', 'Phase 3', 'Phase 4')
+STATUSES = ('Planned', 'Ongoing', 'Completed', 'Terminated')
+SEVERITIES = ('Mild', 'Moderate', 'Severe')
+
+# Comma-separated names of the columns whose value in a row did not fit the
+# schema; only added to frames that have such rows, and never loaded or saved
+SCHEMA_ERRORS_COLUMN = '_schema_errors'
+
+
+class Column(NamedTuple):
+    """Declared type of a source column"""
+    kind: str  # 'text', 'category', 'enum', 'int', 'float' or 'date'
+    domain: Optional[Tuple[str, ...]] = None  # allowed values of an enum
+
+
+TEXT = Column('text')
+CATEGORY = Column('category')
+INT = Column('int')
+FLOAT = Column('float')
+DATE = Column('date')
+
+SCHEMAS: Dict[str, Dict[str, Column]] = {
+    'drugs': {
+        'name': TEXT,
+        'generic_name': TEXT,
+        'manufacturer': CATEGORY,
+        'approval_date': DATE,
+        'therapeutic_area': CATEGORY,
+        'molecule_type': CATEGORY,
+    },
+    'clinical_trials': {
+        'trial_id': TEXT,
+        'title': TEXT,
+        'drug_id': INT,
+        'phase': Column('enum', PHASES),
+        'status': Column('enum', STATUSES),
+        'start_date': DATE,
+        'end_date': DATE,
+        'patient_count': INT,
+        'location': CATEGORY,
+        'sponsor': CATEGORY,
+    },
+    'trial_results': {
+        'trial_id': INT,
+        'endpoint': TEXT,
+        'result_value': FLOAT,
+        'unit': CATEGORY,
+        'p_value': FLOAT,
+        'confidence_interval': TEXT,
+        'notes': TEXT,
+    },
+    'adverse_events': {
+        'drug_id': INT,
+        'event_type': CATEGORY,
+        'severity': Column('enum', SEVERITIES),
+        'frequency': INT,
+        'description': TEXT,
+        'reported_date': DATE,
+    },
+}
+
+
+def date_columns(entity: str) -> Tuple[str, ...]:
+    return tuple(col for col, column in SCHEMAS[entity].items() if column.kind == 'date')
+
+
+def read_dtypes(entity: str, columns: Iterable[str], typed: bool = False) -> Dict[str, str]:
+    """
+    read_csv dtypes for an entity's columns
+
+    Text-like columns are always read as text so values such as trial IDs
+    are never guessed as numbers. In typed mode, enums, categories and dates
+    (which repeat heavily until parsed) are read as categoricals and free
+    text as pyarrow strings, so they are never built as Python objects.
+    """
+    text = string_dtype() if typed else 'object'
+    dtypes = {}
+    for col in columns:
+        column = SCHEMAS[entity].get(col)
+        if column is None or column.kind in ('int', 'float'):
+            continue
+        if column.kind == 'text':
+            dtypes[col] = text
+        else:
+            dtypes[col] = 'category' if typed else 'object'
+    return dtypes
+
+
+def is_parsed(series: pd.Series) -> bool:
+    return pd.api.types.is_datetime64_any_dtype(series)
+
+
+def to_dates(series: pd.Series) -> pd.Series:
+    """A date column as datetimes; parsed columns are returned as they are"""
+    if is_parsed(series):
+        return series
+    return pd.to_datetime(series, format=DATE_FORMAT, errors='coerce')
+
+
+def invalid_dates(series: pd.Series) -> int:
+    """Values that are present but not valid dates (0 for parsed columns)"""
+    if is_parsed(series):
+        return 0
+    return int((series.notna() & to_dates(series).isna()).sum())
+
+
+def parse_dates(df: pd.DataFrame, entity: str) -> pd.DataFrame:
+    """Parse the entity's date columns that are not parsed yet"""
+    for col in date_columns(entity):
+        if col in df.columns and not is_parsed(df[col]):
+            df[col] = to_dates(df[col])
+    return df
+
+
+def coercion_failures(df: pd.DataFrame, col: str) -> pd.Series:
+    """Rows whose value in col was present but did not fit the schema"""
+    if SCHEMA_ERRORS_COLUMN not in df.columns:
+        return pd.Series(False, index=df.index)
+    pattern = rf'(?:^|,){re.escape(col)}(?:,|$)'
+    return df[SCHEMA_ERRORS_COLUMN].astype(object).str.contains(pattern, na=False).astype(bool)
+
+
+def without_schema_errors(df: pd.DataFrame) -> pd.DataFrame:
+    """df without the coercion record, for saving or loading it"""
+    if SCHEMA_ERRORS_COLUMN not in df.columns:
+        return df
+    return df.drop(columns=SCHEMA_ERRORS_COLUMN)
+
+
+def _record_failures(df: pd.DataFrame, failed: Dict[str, np.ndarray]) -> pd.Series:
+    """SCHEMA_ERRORS_COLUMN values naming each row's failed columns (None if it has none)"""
+    names = np.full(len(df), '', dtype=object)
+    for col, mask in failed.items():
+        names[mask] += f'{col},'
+    return pd.Series(names, index=df.index, dtype=object).str.rstrip(',').replace('', None)
+
+
+def apply_schema(df: pd.DataFrame, entity: str, typed: bool = False) -> pd.DataFrame:
+    """
+    Give an extracted frame the entity's declared types
+
+    Dates are parsed with DATE_FORMAT and numbers coerced; values that do
+    not fit become missing, are counted in the log and are named per row in
+    SCHEMA_ERRORS_COLUMN. In typed mode, text columns not already read with
+    their typed dtype are converted and integer columns downcast.
+    """
+    schema = SCHEMAS[entity]
+    df = df.copy(deep=False)
+    if typed:
+        dtypes = read_dtypes(entity, df.columns, typed=True)
+        df = df.astype({col: dtype for col, dtype in dtypes.items() if df[col].dtype == object})
+
+    failed: Dict[str, np.ndarray] = {}
+    for col in df.columns:
+        column = schema.get(col)
+        if column is None:
+            continue
+        if column.kind == 'date' and not is_parsed(df[col]):
+            parsed = to_dates(df[col])
+        elif column.kind in ('int', 'float') and not pd.api.types.is_numeric_dtype(df[col]):
+            parsed = pd.to_numeric(df[col], errors='coerce')
+        else:
+            continue
+        mask = (df[col].notna() & parsed.isna()).to_numpy(dtype=bool, na_value=False)
+        df[col] = parsed
+        if mask.any():
+            failed[col] = mask
+
+    if failed:
+        counts = {col: int(mask.sum()) for col, mask in failed.items()}
+        logger.warning(f"{entity}: values not matching the schema set to missing: {counts}")
+        df[SCHEMA_ERRORS_COLUMN] = _record_failures(df, failed)
+    return downcast_integers(df) if typed else df
+
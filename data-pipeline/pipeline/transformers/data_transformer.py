@@ -1,74 +1,145 @@
 import pandas as pd
 import numpy as np
 import logging
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict, Set, Union
+
+from pipeline.schema import parse_dates
 
 logger = logging.getLogger(__name__)
 
 
+def _drop_seen(df: pd.DataFrame, key: Union[str, List[str]], seen: Optional[Set]) -> pd.DataFrame:
+    """
+    Drop rows whose key is already in `seen` and record the new keys
+
+    Lets chunked runs deduplicate across chunks; only the keys are kept.
+    Composite keys are recorded as tuples.
+    """
+    if seen is None:
+        return df
+    if isinstance(key, list):
+        keys = pd.MultiIndex.from_frame(df[key]) if not df.empty else pd.Index([])
+        df = df[~keys.isin(seen)]
+        seen.update(df[key].itertuples(index=False, name=None))
+        return df
+    df = df[~df[key].isin(seen)]
+    seen.update(df[key].dropna())
+    return df
+
+
+def _map_text(series: pd.Series, func: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    """
+    Apply a vectorized text transform to a column
+
+    Categorical columns (typed frames) only transform their categories and
+    re-map the codes, so the work scales with distinct values, not rows.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return func(series)
+    categories = series.cat.categories
+    mapped = func(pd.Series(categories.astype(object)))
+    new_categories = pd.Index(mapped.dropna().unique())
+    recode = new_categories.get_indexer(mapped)
+    codes = series.cat.codes.to_numpy()
+    new_codes = np.where(codes >= 0, recode[codes], -1)
+    return pd.Series(
+        pd.Categorical.from_codes(new_codes, new_categories), index=series.index, name=series.name
+    )
+
+
+def _fill_text(series: pd.Series, value: str) -> pd.Series:
+    """fillna that also works on categorical columns"""
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        series = series.cat.add_categories([value])
+    return series.fillna(value)
+
+
 class DataTransformer:
     """Transform and clean pharmaceutical data"""
     
     @staticmethod
-    def clean_drug_data(df: pd.DataFrame) -> pd.DataFrame:
+    def drug_key(df: pd.DataFrame) -> pd.Series:
+        """Normalized drug name that drug rows are deduplicated on"""
+        return df['name'].str.strip().str.title()
+    
+    @staticmethod
+    def clinical_trial_key(df: pd.DataFrame) -> pd.Series:
+        """Normalized trial ID that clinical trial rows are deduplicated on"""
+        return df['trial_id'].str.upper().str.strip()
+    
+    @staticmethod
+    def trial_result_key(df: pd.DataFrame) -> pd.Series:
+        """Trial of a result; duplicate results always share it"""
+        return pd.to_numeric(df['trial_id'], errors='coerce')
+    
+    @staticmethod
+    def adverse_event_key(df: pd.DataFrame) -> pd.Series:
+        """Drug of an adverse event; duplicate events always share it"""
+        return pd.to_numeric(df['drug_id'], errors='coerce')
+    
+    @staticmethod
+    def clean_drug_data(df: pd.DataFrame, seen_names: Optional[Set[str]] = None) -> pd.DataFrame:
         """
         Clean and standardize drug data
         
         Args:
             df: Raw drug dataframe
+            seen_names: Names kept from earlier chunks; rows with these names
+                are dropped and new names are added
             
         Returns:
             Cleaned dataframe
         """
         logger.info("Cleaning drug data...")
         
-        # Create a copy to avoid modifying original
-        df_clean = df.copy()
-        
-        # Remove duplicates
-        df_clean = df_clean.drop_duplicates(subset=['name'], keep='first')
+        # New frame sharing the input's columns; columns are only ever
+        # replaced, never written in place, so the caller's frame stays intact
+        df_clean = df.copy(deep=False)
         
         # Handle missing values
         df_clean['generic_name'] = df_clean['generic_name'].fillna(df_clean['name'])
-        df_clean['manufacturer'] = df_clean['manufacturer'].fillna('Unknown')
+        df_clean['manufacturer'] = _fill_text(df_clean['manufacturer'], 'Unknown')
         
         # Standardize text fields
-        df_clean['name'] = df_clean['name'].str.strip().str.title()
-        df_clean['manufacturer'] = df_clean['manufacturer'].str.strip()
+        df_clean['name'] = DataTransformer.drug_key(df_clean)
+        df_clean['manufacturer'] = _map_text(df_clean['manufacturer'], lambda s: s.str.strip())
+        
+        # Remove duplicates on the normalized name
+        df_clean = df_clean.drop_duplicates(subset=['name'], keep='first')
+        df_clean = _drop_seen(df_clean, 'name', seen_names)
         
-        # Convert dates
-        if 'approval_date' in df_clean.columns:
-            df_clean['approval_date'] = pd.to_datetime(df_clean['approval_date'], errors='coerce')
+        # Dates are parsed at extraction; raw frames are parsed here once
+        df_clean = parse_dates(df_clean, 'drugs')
         
         logger.info(f"Cleaned drug data: {len(df_clean)} records")
         return df_clean
     
     @staticmethod
-    def clean_clinical_trial_data(df: pd.DataFrame) -> pd.DataFrame:
+    def clean_clinical_trial_data(df: pd.DataFrame, seen_trial_ids: Optional[Set[str]] = None) -> pd.DataFrame:
         """
         Clean and standardize clinical trial data
         
         Args:
             df: Raw clinical trial dataframe
+            seen_trial_ids: Trial IDs kept from earlier chunks; rows with these
+                IDs are dropped and new IDs are added
             
         Returns:
             Cleaned dataframe
         """
         logger.info("Cleaning clinical trial data...")
         
-        df_clean = df.copy()
-        
-        # Remove duplicates based on trial_id
-        df_clean = df_clean.drop_duplicates(subset=['trial_id'], keep='first')
+        df_clean = df.copy(deep=False)
         
         # Standardize trial_id format
-        df_clean['trial_id'] = df_clean['trial_id'].str.upper().str.strip()
+        df_clean['trial_id'] = DataTransformer.clinical_trial_key(df_clean)
         
-        # Convert dates
-        date_columns = ['start_date', 'end_date']
-        for col in date_columns:
-            if col in df_clean.columns:
-                df_clean[col] = pd.to_datetime(df_clean[col], errors='coerce')
+        # Remove duplicates based on the normalized trial_id
+        df_clean = df_clean.drop_duplicates(subset=['trial_id'], keep='first')
+        df_clean = _drop_seen(df_clean, 'trial_id', seen_trial_ids)
+        
+        # Dates are parsed at extraction; raw frames are parsed here once
+        df_clean = parse_dates(df_clean, 'clinical_trials')
         
         # Validate patient_count
         if 'patient_count' in df_clean.columns:
@@ -87,7 +158,7 @@ class DataTransformer:
                 'phase iii': 'Phase 3',
                 'phase iv': 'Phase 4'
             }
-            df_clean['phase'] = df_clean['phase'].str.lower().map(phase_mapping).fillna(df_clean['phase'])
+            df_clean['phase'] = _map_text(df_clean['phase'], lambda s: s.str.lower().map(phase_mapping).fillna(s))
         
         if 'status' in df_clean.columns:
             status_mapping = {
@@ -98,11 +169,102 @@ class DataTransformer:
                 'terminated': 'Terminated',
                 'stopped': 'Terminated'
             }
-            df_clean['status'] = df_clean['status'].str.lower().map(status_mapping).fillna(df_clean['status'])
+            df_clean['status'] = _map_text(
+                df_clean['status'], lambda s: s.str.lower().map(status_mapping).fillna(s)
+            )
         
         logger.info(f"Cleaned clinical trial data: {len(df_clean)} records")
         return df_clean
     
+    @staticmethod
+    def clean_trial_result_data(df: pd.DataFrame, seen_results: Optional[Set[tuple]] = None) -> pd.DataFrame:
+        """
+        Clean and standardize trial result data
+        
+        Args:
+            df: Raw trial result dataframe
+            seen_results: (trial_id, endpoint) pairs kept from earlier chunks
+            
+        Returns:
+            Cleaned dataframe
+        """
+        logger.info("Cleaning trial result data...")
+        
+        df_clean = df.copy(deep=False)
+        
+        # Results must belong to a trial
+        df_clean['trial_id'] = pd.to_numeric(df_clean['trial_id'], errors='coerce')
+        df_clean = df_clean.dropna(subset=['trial_id'])
+        df_clean['trial_id'] = df_clean['trial_id'].astype('int64')
+        
+        if 'endpoint' in df_clean.columns:
+            df_clean['endpoint'] = df_clean['endpoint'].str.strip()
+        if 'unit' in df_clean.columns:
+            df_clean['unit'] = _map_text(df_clean['unit'], lambda s: s.str.strip().str.lower())
+        
+        # One result per endpoint of a trial
+        df_clean = df_clean.drop_duplicates(subset=['trial_id', 'endpoint'], keep='first')
+        df_clean = _drop_seen(df_clean, ['trial_id', 'endpoint'], seen_results)
+        
+        for col in ['result_value', 'p_value']:
+            if col in df_clean.columns:
+                df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
+        
+        # p-values outside [0, 1] are data entry errors
+        if 'p_value' in df_clean.columns:
+            df_clean['p_value'] = df_clean['p_value'].where(df_clean['p_value'].between(0, 1))
+        
+        logger.info(f"Cleaned trial result data: {len(df_clean)} records")
+        return df_clean
+    
+    @staticmethod
+    def clean_adverse_event_data(df: pd.DataFrame, seen_events: Optional[Set[tuple]] = None) -> pd.DataFrame:
+        """
+        Clean and standardize adverse event data
+        
+        Args:
+            df: Raw adverse event dataframe
+            seen_events: (drug_id, event_type, reported_date) keys kept from
+                earlier chunks
+            
+        Returns:
+            Cleaned dataframe
+        """
+        logger.info("Cleaning adverse event data...")
+        
+        df_clean = df.copy(deep=False)
+        
+        df_clean['drug_id'] = pd.to_numeric(df_clean['drug_id'], errors='coerce')
+        df_clean = df_clean.dropna(subset=['drug_id'])
+        df_clean['drug_id'] = df_clean['drug_id'].astype('int64')
+        
+        df_clean['event_type'] = _map_text(df_clean['event_type'], lambda s: s.str.strip())
+        
+        # Dates must be parsed before deduplicating so equal dates compare equal
+        df_clean = parse_dates(df_clean, 'adverse_events')
+        
+        # The same event reported twice for a drug on one day is a duplicate
+        key = [col for col in ['drug_id', 'event_type', 'reported_date'] if col in df_clean.columns]
+        df_clean = df_clean.drop_duplicates(subset=key, keep='first')
+        df_clean = _drop_seen(df_clean, key, seen_events)
+        
+        if 'frequency' in df_clean.columns:
+            df_clean['frequency'] = pd.to_numeric(df_clean['frequency'], errors='coerce').clip(lower=0)
+        
+        if 'severity' in df_clean.columns:
+            severity_mapping = {
+                'mild': 'Mild',
+                'moderate': 'Moderate',
+                'severe': 'Severe',
+                'serious': 'Severe'
+            }
+            df_clean['severity'] = _map_text(
+                df_clean['severity'], lambda s: s.str.strip().str.lower().map(severity_mapping).fillna(s)
+            )
+        
+        logger.info(f"Cleaned adverse event data: {len(df_clean)} records")
+        return df_clean
+    
     @staticmethod
     def enrich_data(df: pd.DataFrame, enrichment_fields: Dict) -> pd.DataFrame:
         """
@@ -117,12 +279,7 @@ class DataTransformer:
         """
         logger.info("Enriching data...")
         
-        df_enriched = df.copy()
-        
-        for field_name, field_value in enrichment_fields.items():
-            df_enriched[field_name] = field_value
-        
-        return df_enriched
+        return df.assign(**enrichment_fields)
     
     @staticmethod
     def aggregate_trial_metrics(df: pd.DataFrame) -> pd.DataFrame:
@@ -0,0 +1,86 @@
+"""
+Partitioned transformation on a process pool
+
+Cleaning is single-threaded pandas string work, so large frames are split
+into hash partitions of their deduplication key and cleaned in worker
+processes. Every duplicate of a key lands in the same partition and keeps its
+original relative order, so `keep='first'` deduplication inside a partition
+matches the serial result; the cleaned partitions are put back in the
+original row order and index.
+"""
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, List
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Below this many rows, process start-up and pickling cost more than they save
+MIN_PARALLEL_ROWS = 100000
+
+
+def _enable_copy_on_write():
+    # Workers only run pipeline transforms, so copy-on-write can stay on
+    pd.set_option('mode.copy_on_write', True)
+
+
+def create_process_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool for partitioned transforms
+
+    Uses forkserver where available (spawn elsewhere) rather than fork, since
+    the pipeline already runs threads and forking a threaded process can
+    deadlock the children. The forkserver preloads pandas and the transformer
+    so workers start quickly. Workers run with copy-on-write, like the
+    pipeline run that submits to them.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    if context.get_start_method() == 'forkserver':
+        context.set_forkserver_preload(['pandas', 'pipeline.transformers.data_transformer'])
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_enable_copy_on_write)
+
+
+def hash_partitions(df: pd.DataFrame, key: pd.Series, partitions: int) -> List[pd.DataFrame]:
+    """Split df into non-empty partitions by the hash of key, preserving row order"""
+    buckets = pd.util.hash_pandas_object(key, index=False).to_numpy() % partitions
+    return [part for _, part in df.groupby(buckets, sort=True) if not part.empty]
+
+
+def parallel_clean(
+    clean: Callable[[pd.DataFrame], pd.DataFrame],
+    df: pd.DataFrame,
+    key: Callable[[pd.DataFrame], pd.Series],
+    executor: Executor,
+    partitions: int
+) -> pd.DataFrame:
+    """
+    Clean df in hash partitions on executor
+
+    Args:
+        clean: Cleaning function (a picklable module-level or static function)
+        df: Frame to clean
+        key: Function returning the key rows are deduplicated on; rows that
+            clean treats as duplicates must get equal keys
+        executor: Pool the partitions are cleaned on
+        partitions: Number of partitions
+
+    Returns:
+        The same frame clean(df) returns
+    """
+    original_index = df.index
+    df = df.reset_index(drop=True)
+    parts = hash_partitions(df, key(df), partitions)
+    if len(parts) <= 1:
+        return clean(df.set_axis(original_index))
+
+    logger.info(f"Cleaning {len(df)} rows in {len(parts)} partitions")
+    results = [part for part in executor.map(clean, parts) if not part.empty]
+    if not results:
+        return clean(df.iloc[:0].set_axis(original_index[:0]))
+
+    result = pd.concat(results).sort_index(kind='stable')
+    result.index = original_index[result.index]
+    return result
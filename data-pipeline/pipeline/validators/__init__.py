@@ -1,4 +1,5 @@
 """Validators module"""
 from pipeline.validators.data_validator import DataValidator
+from pipeline.validators.rules import RULESETS, RuleSet, Validation
 
-__all__ = ["DataValidator"]
+__all__ = ["DataValidator", "RULESETS", "RuleSet", "Validation"]
@@ -2,12 +2,22 @@ import pandas as pd
 import logging
 from typing import List, Dict, Tuple
 
+from pipeline.validators.rules import RULESETS
+
 logger = logging.getLogger(__name__)
 
 
 class DataValidator:
     """Validate data quality and integrity"""
     
+    @staticmethod
+    def _validate(df: pd.DataFrame, entity: str, label: str) -> Tuple[bool, List[str]]:
+        """Run the entity's rule set over the whole frame in one pass"""
+        logger.info(f"Validating {label.lower()} data...")
+        is_valid, issues = RULESETS[entity].validate(df)
+        logger.info(f"{label} data validation: {'PASSED' if is_valid else 'FAILED'}")
+        return is_valid, issues
+    
     @staticmethod
     def validate_drug_data(df: pd.DataFrame) -> Tuple[bool, List[str]]:
         """
@@ -19,38 +29,7 @@ class DataValidator:
         Returns:
             Tuple of (is_valid, list of issues)
         """
-        logger.info("Validating drug data...")
-        issues = []
-        
-        # Check required columns
-        required_columns = ['name']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            issues.append(f"Missing required columns: {missing_columns}")
-        
-        # Check for null values in critical fields
-        if 'name' in df.columns:
-            null_count = df['name'].isnull().sum()
-            if null_count > 0:
-                issues.append(f"Found {null_count} null values in 'name' field")
-        
-        # Check for duplicates
-        if 'name' in df.columns:
-            duplicate_count = df.duplicated(subset=['name']).sum()
-            if duplicate_count > 0:
-                issues.append(f"Found {duplicate_count} duplicate drug names")
-        
-        # Check data types
-        if 'approval_date' in df.columns:
-            try:
-                pd.to_datetime(df['approval_date'], errors='raise')
-            except:
-                issues.append("Invalid date format in 'approval_date'")
-        
-        is_valid = len(issues) == 0
-        logger.info(f"Drug data validation: {'PASSED' if is_valid else 'FAILED'}")
-        
-        return is_valid, issues
+        return DataValidator._validate(df, 'drugs', 'Drug')
     
     @staticmethod
     def validate_clinical_trial_data(df: pd.DataFrame) -> Tuple[bool, List[str]]:
@@ -63,59 +42,33 @@ class DataValidator:
         Returns:
             Tuple of (is_valid, list of issues)
         """
-        logger.info("Validating clinical trial data...")
-        issues = []
-        
-        # Check required columns
-        required_columns = ['trial_id', 'title', 'drug_id']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            issues.append(f"Missing required columns: {missing_columns}")
-        
-        # Check for null values
-        for col in required_columns:
-            if col in df.columns:
-                null_count = df[col].isnull().sum()
-                if null_count > 0:
-                    issues.append(f"Found {null_count} null values in '{col}'")
-        
-        # Check for duplicate trial IDs
-        if 'trial_id' in df.columns:
-            duplicate_count = df.duplicated(subset=['trial_id']).sum()
-            if duplicate_count > 0:
-                issues.append(f"Found {duplicate_count} duplicate trial IDs")
-        
-        # Validate patient count
-        if 'patient_count' in df.columns:
-            negative_count = (df['patient_count'] < 0).sum()
-            if negative_count > 0:
-                issues.append(f"Found {negative_count} negative patient counts")
-        
-        # Validate date logic
-        if 'start_date' in df.columns and 'end_date' in df.columns:
-            df_dates = df.dropna(subset=['start_date', 'end_date'])
-            invalid_dates = (pd.to_datetime(df_dates['end_date']) < pd.to_datetime(df_dates['start_date'])).sum()
-            if invalid_dates > 0:
-                issues.append(f"Found {invalid_dates} trials where end_date < start_date")
-        
-        # Validate phase values
-        if 'phase' in df.columns:
-            valid_phases = ['Phase 1', 'Phase 2', 'Phase 3', 'Phase 4']
-            invalid_phases = ~df['phase'].isin(valid_phases + [None])
-            if invalid_phases.any():
-                issues.append(f"Found {invalid_phases.sum()} invalid phase values")
-        
-        # Validate status values
-        if 'status' in df.columns:
-            valid_statuses = ['Planned', 'Ongoing', 'Completed', 'Terminated']
-            invalid_statuses = ~df['status'].isin(valid_statuses + [None])
-            if invalid_statuses.any():
-                issues.append(f"Found {invalid_statuses.sum()} invalid status values")
+        return DataValidator._validate(df, 'clinical_trials', 'Clinical trial')
+    
+    @staticmethod
+    def validate_trial_result_data(df: pd.DataFrame) -> Tuple[bool, List[str]]:
+        """
+        Validate trial result data quality
         
-        is_valid = len(issues) == 0
-        logger.info(f"Clinical trial data validation: {'PASSED' if is_valid else 'FAILED'}")
+        Args:
+            df: Trial result dataframe
+            
+        Returns:
+            Tuple of (is_valid, list of issues)
+        """
+        return DataValidator._validate(df, 'trial_results', 'Trial result')
+    
+    @staticmethod
+    def validate_adverse_event_data(df: pd.DataFrame) -> Tuple[bool, List[str]]:
+        """
+        Validate adverse event data quality
         
-        return is_valid, issues
+        Args:
+            df: Adverse event dataframe
+            
+        Returns:
+            Tuple of (is_valid, list of issues)
+        """
+        return DataValidator._validate(df, 'adverse_events', 'Adverse event')
     
     @staticmethod
     def generate_quality_report(df: pd.DataFrame, data_type: str) -> Dict:
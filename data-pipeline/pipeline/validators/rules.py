@@ -0,0 +1,236 @@
+"""
+Declarative validation rules
+
+Each entity has a RuleSet: the columns it requires plus a list of rules, each
+of which turns a frame into a vectorized boolean mask of violating rows.
+Compiling a rule set against a frame's columns drops rules whose columns are
+absent; evaluating it runs every mask once and packs them into a per-row
+violation bitmap (bit i set = rule i failed). A Validation accumulates counts
+and duplicate keys over chunks, so validating a stream costs the same as
+validating the whole frame.
+"""
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pipeline.schema import PHASES, SEVERITIES, STATUSES, coercion_failures, is_parsed, to_dates
+
+
+class Rule(NamedTuple):
+    """A named row check; `violations` returns True for rows that break it"""
+    name: str
+    columns: Tuple[str, ...]
+    violations: Callable[[pd.DataFrame, Dict], pd.Series]
+    message: str  # issue text; {count} is the number of violating rows
+
+
+def not_null(col: str, message: Optional[str] = None) -> Rule:
+    return Rule(
+        f'{col}_not_null', (col,),
+        lambda df, state: df[col].isnull(),
+        message or f"Found {{count}} null values in '{col}'"
+    )
+
+
+def unique(columns: Sequence[str], message: str) -> Rule:
+    """Rows repeating the key of an earlier row, also across chunks"""
+    columns = list(columns)
+
+    def violations(df: pd.DataFrame, state: Dict) -> pd.Series:
+        duplicated = df.duplicated(subset=columns)
+        seen = state.setdefault('seen', set())
+        keys = df[columns[0]] if len(columns) == 1 else pd.Series(
+            list(df[columns].itertuples(index=False, name=None)), index=df.index
+        )
+        if seen:
+            duplicated |= keys.isin(seen)
+        seen.update(keys[~duplicated])
+        return duplicated
+
+    return Rule('_'.join(columns) + '_unique', tuple(columns), violations, message)
+
+
+def non_negative(col: str, message: str) -> Rule:
+    return Rule(
+        f'{col}_non_negative', (col,),
+        lambda df, state: pd.to_numeric(df[col], errors='coerce') < 0,
+        message
+    )
+
+
+def between(col: str, low: float, high: float, message: str) -> Rule:
+    def violations(df: pd.DataFrame, state: Dict) -> pd.Series:
+        values = pd.to_numeric(df[col], errors='coerce')
+        return values.notna() & ~values.between(low, high)
+
+    return Rule(f'{col}_range', (col,), violations, message)
+
+
+def valid_date(col: str, message: str) -> Rule:
+    """Present values that are not dates, including those apply_schema set to NaT"""
+    def violations(df: pd.DataFrame, state: Dict) -> pd.Series:
+        failed = coercion_failures(df, col)
+        if is_parsed(df[col]):
+            return failed
+        return failed | (df[col].notna() & to_dates(df[col]).isna())
+
+    return Rule(f'{col}_valid_date', (col,), violations, message)
+
+
+def valid_number(col: str, message: str) -> Rule:
+    """Present values that are not numbers, including those apply_schema set to NaN"""
+    def violations(df: pd.DataFrame, state: Dict) -> pd.Series:
+        failed = coercion_failures(df, col)
+        if pd.api.types.is_numeric_dtype(df[col]):
+            return failed
+        return failed | (df[col].notna() & pd.to_numeric(df[col], errors='coerce').isna())
+
+    return Rule(f'{col}_valid_number', (col,), violations, message)
+
+
+def date_order(start: str, end: str, message: str) -> Rule:
+    return Rule(
+        f'{end}_after_{start}', (start, end),
+        lambda df, state: to_dates(df[end]) < to_dates(df[start]),
+        message
+    )
+
+
+def one_of(col: str, values: Sequence[str], message: str) -> Rule:
+    """Present values outside the domain; missing values (None, NaN, pd.NA) pass"""
+    allowed = list(values)
+    return Rule(
+        f'{col}_domain', (col,),
+        lambda df, state: df[col].notna() & ~df[col].isin(allowed),
+        message
+    )
+
+
+class CompiledRules(NamedTuple):
+    """A rule set bound to one set of columns"""
+    rules: Tuple[Tuple[int, Rule], ...]  # (bit, rule) for rules whose columns are present
+    missing_columns: Tuple[str, ...]
+
+
+class RuleSet:
+    """Required columns and rules of one entity"""
+
+    def __init__(self, entity: str, required_columns: Sequence[str], rules: Sequence[Rule]):
+        if len(rules) > 64:
+            raise ValueError("A rule set holds at most 64 rules (one bit each)")
+        self.entity = entity
+        self.required_columns = tuple(required_columns)
+        self.rules = tuple(rules)
+        self._compiled: Dict[Tuple[str, ...], CompiledRules] = {}
+
+    def compile(self, columns: Sequence[str]) -> CompiledRules:
+        key = tuple(columns)
+        if key not in self._compiled:
+            present = set(columns)
+            self._compiled[key] = CompiledRules(
+                rules=tuple(
+                    (bit, rule) for bit, rule in enumerate(self.rules) if set(rule.columns) <= present
+                ),
+                missing_columns=tuple(col for col in self.required_columns if col not in present),
+            )
+        return self._compiled[key]
+
+    def names(self, bits: int) -> str:
+        """Comma-separated names of the rules set in one bitmap value"""
+        return ','.join(rule.name for i, rule in enumerate(self.rules) if bits >> i & 1)
+
+    def validation(self) -> 'Validation':
+        """Start validating a frame, or a stream of chunks of one"""
+        return Validation(self)
+
+    def validate(self, df: pd.DataFrame) -> Tuple[bool, List[str]]:
+        """Validate a whole frame; returns (is_valid, issues)"""
+        validation = self.validation()
+        validation.update(df)
+        issues = validation.issues()
+        return len(issues) == 0, issues
+
+
+class Validation:
+    """Running validation of one entity over one or more chunks"""
+
+    def __init__(self, ruleset: RuleSet):
+        self.ruleset = ruleset
+        self.rows = 0
+        self.counts: Dict[str, int] = {rule.name: 0 for rule in ruleset.rules}
+        self.missing_columns: Tuple[str, ...] = ()
+        self._state: Dict[str, Dict] = {rule.name: {} for rule in ruleset.rules}
+
+    def update(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Evaluate all rules on a chunk
+
+        Returns the chunk's violation bitmap: one uint64 per row with bit i
+        set when rule i of the rule set failed for that row.
+        """
+        compiled = self.ruleset.compile(list(df.columns))
+        self.missing_columns = tuple(dict.fromkeys(self.missing_columns + compiled.missing_columns))
+        self.rows += len(df)
+
+        bitmap = np.zeros(len(df), dtype=np.uint64)
+        for bit, rule in compiled.rules:
+            mask = rule.violations(df, self._state[rule.name]).to_numpy(dtype=bool, na_value=False)
+            self.counts[rule.name] += int(mask.sum())
+            bitmap |= mask.astype(np.uint64) << np.uint64(bit)
+        return bitmap
+
+    def failed_rules(self, bitmap: np.ndarray) -> np.ndarray:
+        """Comma-separated names of the rules each row failed ('' for valid rows)"""
+        values, inverse = np.unique(bitmap, return_inverse=True)
+        names = np.array([self.ruleset.names(int(bits)) for bits in values], dtype=object)
+        return names[inverse]
+
+    def issues(self) -> List[str]:
+        issues = []
+        if self.missing_columns:
+            issues.append(f"Missing required columns: {list(self.missing_columns)}")
+        for rule in self.ruleset.rules:
+            count = self.counts[rule.name]
+            if count > 0:
+                issues.append(rule.message.format(count=count))
+        return issues
+
+
+RULESETS: Dict[str, RuleSet] = {
+    'drugs': RuleSet('drugs', ['name'], [
+        not_null('name', "Found {count} null values in 'name' field"),
+        unique(['name'], "Found {count} duplicate drug names"),
+        valid_date('approval_date', "Invalid date format in 'approval_date'"),
+    ]),
+    'clinical_trials': RuleSet('clinical_trials', ['trial_id', 'title', 'drug_id'], [
+        not_null('trial_id'),
+        not_null('title'),
+        not_null('drug_id'),
+        unique(['trial_id'], "Found {count} duplicate trial IDs"),
+        non_negative('patient_count', "Found {count} negative patient counts"),
+        date_order('start_date', 'end_date', "Found {count} trials where end_date < start_date"),
+        one_of('phase', PHASES, "Found {count} invalid phase values"),
+        one_of('status', STATUSES, "Found {count} invalid status values"),
+        valid_number('drug_id', "Found {count} non-numeric values in 'drug_id'"),
+        valid_number('patient_count', "Found {count} non-numeric values in 'patient_count'"),
+        valid_date('start_date', "Found {count} invalid dates in 'start_date'"),
+        valid_date('end_date', "Found {count} invalid dates in 'end_date'"),
+    ]),
+    'trial_results': RuleSet('trial_results', ['trial_id', 'endpoint'], [
+        not_null('trial_id'),
+        not_null('endpoint'),
+        between('p_value', 0, 1, "Found {count} p-values outside [0, 1]"),
+        valid_number('result_value', "Found {count} non-numeric values in 'result_value'"),
+        valid_number('p_value', "Found {count} non-numeric values in 'p_value'"),
+    ]),
+    'adverse_events': RuleSet('adverse_events', ['drug_id', 'event_type', 'reported_date'], [
+        not_null('drug_id'),
+        not_null('event_type'),
+        not_null('reported_date'),
+        non_negative('frequency', "Found {count} negative frequencies"),
+        one_of('severity', SEVERITIES, "Found {count} invalid severity values"),
+        valid_number('frequency', "Found {count} non-numeric values in 'frequency'"),
+        valid_date('reported_date', "Found {count} invalid dates in 'reported_date'"),
+    ]),
+}
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+from pipeline.extractors import DataExtractor
+from pipeline.frames import frame_memory
+from pipeline.transformers import DataTransformer
+
+
+def test_typed_extraction_uses_less_memory(tmp_path):
+    """Test that typed frames hold a trials feed in at most a third of the memory"""
+    rng = np.random.default_rng(0)
+    rows = 5000
+    pd.DataFrame({
+        'trial_id': [f"NCT{i:08d}" for i in range(rows)],
+        'title': [f"Study {i % 200} of drug" for i in range(rows)],
+        'drug_id': rng.integers(1, 500, rows),
+        'phase': rng.choice(['Phase 1', 'Phase 2', 'Phase 3'], rows),
+        'status': rng.choice(['Ongoing', 'Completed'], rows),
+        'start_date': rng.choice(['2020-01-15', '2021-02-01'], rows),
+        'patient_count': rng.integers(0, 900, rows),
+        'location': rng.choice(['USA', 'EU', 'Asia'], rows),
+    }).to_csv(tmp_path / 'clinical_trials.csv', index=False)
+
+    plain = DataExtractor(str(tmp_path)).extract_clinical_trials_data()
+    typed = DataExtractor(str(tmp_path), typed=True).extract_clinical_trials_data()
+    assert isinstance(typed['phase'].dtype, pd.CategoricalDtype)
+    assert typed['patient_count'].dtype == np.int16
+    assert frame_memory({'plain': plain}) >= 3 * frame_memory({'typed': typed})
+
+
+def test_cleaning_categoricals_matches_objects():
+    """Test that cleaning categorical columns gives the same values and does not touch the input"""
+    df = pd.DataFrame({
+        'trial_id': ['nct001', 'NCT002', 'NCT003'],
+        'phase': ['phase iii', 'Phase 2', None],
+        'status': ['active', 'stopped', 'Unknown'],
+    })
+    typed = df.astype({'phase': 'category', 'status': 'category'})
+    cleaned = DataTransformer.clean_clinical_trial_data(typed)
+
+    assert isinstance(cleaned['status'].dtype, pd.CategoricalDtype)
+    expected = DataTransformer.clean_clinical_trial_data(df)
+    for col in ['phase', 'status']:
+        assert cleaned[col].astype(object).fillna('').tolist() == expected[col].fillna('').tolist()
+    assert list(typed['status']) == ['active', 'stopped', 'Unknown']
+
+
+def test_copy_on_write_scoped_to_run(tmp_path, monkeypatch):
+    """Test that copy-on-write is enabled for a pipeline run only, not on import"""
+    from pipeline.main import DataPipeline
+    assert not pd.get_option('mode.copy_on_write')
+
+    seen = []
+    monkeypatch.setattr(DataPipeline, '_run', lambda self: seen.append(pd.get_option('mode.copy_on_write')))
+    monkeypatch.delenv('DATABASE_URL', raising=False)
+    monkeypatch.setenv('DATA_OUTPUT_PATH', str(tmp_path))
+    DataPipeline().run()
+    assert seen == [True]
+    assert not pd.get_option('mode.copy_on_write')
+
+
+def test_cleaning_leaves_input_intact_without_copy_on_write():
+    """Test that cleaning never writes into the caller's frame"""
+    df = pd.DataFrame({
+        'name': [' aspirin ', 'Ibuprofen'],
+        'generic_name': [None, 'Ibuprofen'],
+        'manufacturer': [None, ' Pfizer'],
+    })
+    before = df.copy()
+    DataTransformer.clean_drug_data(df)
+    pd.testing.assert_frame_equal(df, before)
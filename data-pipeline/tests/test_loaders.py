@@ -0,0 +1,121 @@
+import pytest
+import pandas as pd
+from sqlalchemy import create_engine, text
+from pipeline.loaders import DataLoader
+from pipeline.loaders.data_loader import copy_insert
+
+
+@pytest.fixture
+def loader(tmp_path):
+    database_url = f'sqlite:///{tmp_path / "load.db"}'
+    engine = create_engine(database_url)
+    with engine.begin() as conn:
+        conn.execute(text('CREATE TABLE drugs (id INTEGER PRIMARY KEY, name TEXT UNIQUE, generic_name TEXT, '
+                          'manufacturer TEXT, approval_date TIMESTAMP)'))
+    return DataLoader(database_url)
+
+
+def test_sqlite_falls_back_to_inserts(loader):
+    """Test that non-PostgreSQL databases load with INSERTs and record throughput"""
+    df = pd.DataFrame({
+        'name': ['Aspirin', 'Ibuprofen'],
+        'generic_name': ['Acetylsalicylic acid', None],
+        'manufacturer': ['Bayer', 'Pfizer'],
+        'approval_date': ['1899-03-06', '1969-01-01'],
+    })
+    assert not loader.uses_copy
+    assert loader.load_drugs(df)
+    assert loader.load_drugs(df.assign(name=['Metformin', 'Insulin']))
+
+    with loader.engine.connect() as conn:
+        assert conn.execute(text('SELECT COUNT(*) FROM drugs')).scalar() == 4
+    stats = loader.load_stats['drugs']
+    assert stats['rows'] == 4
+    assert stats['method'] == 'insert'
+    assert stats['rows_per_sec'] > 0
+
+
+class FakeCursor:
+    def __init__(self):
+        self.statements = []
+
+    def copy_expert(self, sql, file):
+        self.statements.append((sql, file.read()))
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.connection = self
+        self.cursor_ = FakeCursor()
+
+    def cursor(self):
+        return self.cursor_
+
+
+class FakeTable:
+    schema = None
+    name = 'drugs'
+
+
+def test_copy_insert_streams_csv():
+    """Test that COPY loading sends the rows as CSV with NULLs left empty"""
+    conn = FakeConnection()
+    rows = [('Aspirin', None, 'Bayer, AG'), ('Ibuprofen', 'Ibuprofen', 'Pfizer')]
+    copy_insert(FakeTable(), conn, ['name', 'generic_name', 'manufacturer'], iter(rows))
+
+    sql, data = conn.cursor_.statements[0]
+    assert sql == 'COPY "drugs" ("name", "generic_name", "manufacturer") FROM STDIN WITH (FORMAT csv)'
+    assert data.splitlines() == ['Aspirin,,"Bayer, AG"', 'Ibuprofen,Ibuprofen,Pfizer']
+
+
+def drug_names(loader):
+    with loader.engine.connect() as conn:
+        return pd.read_sql('SELECT name, manufacturer FROM drugs ORDER BY name', conn)
+
+
+def test_merge_is_idempotent(loader):
+    """Test that merging reports inserts, updates and unchanged rows and never duplicates"""
+    df = pd.DataFrame({
+        'name': ['Aspirin', 'Ibuprofen'],
+        'generic_name': ['Acetylsalicylic acid', None],
+        'manufacturer': ['Bayer', 'Pfizer'],
+        'approval_date': ['1899-03-06', None],
+    })
+    assert loader.load_drugs(df, mode='merge')
+    assert loader.merge_stats['drugs'] == {'inserted': 2, 'updated': 0, 'unchanged': 0}
+
+    assert loader.load_drugs(df, mode='merge')
+    assert loader.merge_stats['drugs'] == {'inserted': 2, 'updated': 0, 'unchanged': 2}
+
+    changed = pd.concat([df, pd.DataFrame({'name': ['Metformin'], 'manufacturer': ['Merck']})])
+    changed.loc[changed['name'] == 'Ibuprofen', 'manufacturer'] = 'Abbott'
+    assert loader.load_drugs(changed, mode='merge')
+    assert loader.merge_stats['drugs'] == {'inserted': 3, 'updated': 1, 'unchanged': 3}
+
+    result = drug_names(loader)
+    assert list(result['name']) == ['Aspirin', 'Ibuprofen', 'Metformin']
+    assert list(result['manufacturer']) == ['Bayer', 'Abbott', 'Merck']
+
+
+def test_adverse_events_without_reported_date_are_rejected(loader):
+    """Test that the loader never invents a reported_date and validation quarantines such rows"""
+    from pipeline.validators import RULESETS
+    with loader.engine.begin() as conn:
+        conn.execute(text('CREATE TABLE adverse_events (id INTEGER PRIMARY KEY, drug_id INTEGER, event_type TEXT, '
+                          'severity TEXT, frequency INTEGER, reported_date TIMESTAMP)'))
+    df = pd.DataFrame({
+        'drug_id': [1, 2],
+        'event_type': ['Rash', 'Nausea'],
+        'reported_date': pd.to_datetime(['2022-06-15', None]),
+    })
+    assert not loader.load_adverse_events(df)
+    assert not loader.load_adverse_events(df.drop(columns='reported_date'))
+
+    validation = RULESETS['adverse_events'].validation()
+    assert validation.failed_rules(validation.update(df)).tolist() == ['', 'reported_date_not_null']
+    assert loader.load_adverse_events(df.iloc[:1])
+    with loader.engine.connect() as conn:
+        assert conn.execute(text('SELECT COUNT(*) FROM adverse_events')).scalar() == 1
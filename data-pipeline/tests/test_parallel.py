@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pipeline.transformers import DataTransformer
+from pipeline.transformers.parallel import create_process_pool, hash_partitions, parallel_clean
+
+
+@pytest.fixture(scope='module')
+def pool():
+    with create_process_pool(2) as executor:
+        yield executor
+
+
+def make_drugs(rows):
+    rng = np.random.default_rng(0)
+    names = np.array(['aspirin', ' Aspirin ', 'IBUPROFEN', 'ibuprofen', 'Metformin', 'insulin', 'Paracetamol'])
+    return pd.DataFrame({
+        'name': [f"{names[i % len(names)]}{' ' if i % 3 else ''}{i % 40}" for i in rng.permutation(rows)],
+        'generic_name': rng.choice(['Generic', None], rows),
+        'manufacturer': rng.choice(['Bayer', ' Pfizer', None], rows),
+        'approval_date': rng.choice(['1990-01-01', 'invalid', None], rows),
+    }, index=pd.RangeIndex(100, 100 + rows))
+
+
+def make_trials(rows):
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        'trial_id': [f"{'nct' if i % 2 else ' NCT'}{i % 50:03d}" for i in rng.permutation(rows)],
+        'title': [f"Trial {i}" for i in range(rows)],
+        'drug_id': rng.integers(1, 10, rows),
+        'phase': rng.choice(['phase 3', 'Phase II', 'unknown', None], rows),
+        'status': rng.choice(['active', 'Completed', 'stopped'], rows),
+        'start_date': rng.choice(['2020-01-15', 'bad'], rows),
+        'end_date': rng.choice(['2022-01-15', None], rows),
+        'patient_count': rng.choice([100, -5, 250], rows),
+    })
+
+
+def test_hash_partitions_keep_duplicates_together():
+    """Test that every normalized key lands in exactly one partition, in original order"""
+    df = make_drugs(300)
+    parts = hash_partitions(df, DataTransformer.drug_key(df), 4)
+    assert sum(len(part) for part in parts) == len(df)
+    keys = [set(DataTransformer.drug_key(part)) for part in parts]
+    assert sum(len(k) for k in keys) == len(set().union(*keys))
+    assert all(part.index.is_monotonic_increasing for part in parts)
+
+
+@pytest.mark.parametrize('make, clean, key', [
+    (make_drugs, DataTransformer.clean_drug_data, DataTransformer.drug_key),
+    (make_trials, DataTransformer.clean_clinical_trial_data, DataTransformer.clinical_trial_key),
+])
+def test_parallel_clean_matches_serial(pool, make, clean, key):
+    """Test that partitioned cleaning returns exactly the serial result"""
+    df = make(500)
+    expected = clean(df)
+    result = parallel_clean(clean, df, key, pool, 4)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_pipeline_parallel_transform(tmp_path, monkeypatch):
+    """Test that a pipeline run with workers writes the same output as a serial run"""
+    from pipeline import main
+    monkeypatch.delenv('DATABASE_URL', raising=False)
+    monkeypatch.setattr(main.parallel, 'MIN_PARALLEL_ROWS', 1)
+
+    outputs = {}
+    for workers in (1, 2):
+        monkeypatch.setenv('DATA_OUTPUT_PATH', str(tmp_path / str(workers)))
+        pipeline = main.DataPipeline(workers=workers)
+        frames = pipeline.transform(pipeline.extract())
+        outputs[workers] = frames
+    for name, frame in outputs[1].items():
+        pd.testing.assert_frame_equal(outputs[2][name], frame)
@@ -0,0 +1,198 @@
+import pytest
+import pandas as pd
+from sqlalchemy import create_engine, text
+from pipeline.main import DataPipeline
+
+
+@pytest.fixture
+def source_files(tmp_path):
+    """CSV sources with duplicates that span chunk boundaries"""
+    source = tmp_path / 'source'
+    source.mkdir()
+    pd.DataFrame({
+        'name': ['Aspirin', 'Ibuprofen', 'Metformin', '  aspirin ', 'Paracetamol', 'IBUPROFEN', 'Insulin'],
+        'generic_name': ['Acetylsalicylic acid', None, 'Metformin', 'ASA', 'Acetaminophen', None, 'Insulin'],
+        'manufacturer': ['Bayer', 'Pfizer', 'Merck', 'Bayer', 'GSK', 'Pfizer', None],
+        'approval_date': ['1899-03-06', '1969-01-01', '1994-12-29', '1899-03-06', '1950-01-01', None, '1982-10-28'],
+    }).to_csv(source / 'drugs.csv', index=False)
+    pd.DataFrame({
+        'trial_id': ['NCT001', 'NCT002', 'nct001', 'NCT003', ' NCT002', 'NCT004'],
+        'title': ['T1', 'T2', 'T1 again', 'T3', 'T2 again', 'T4'],
+        'drug_id': [1, 2, 1, 3, 2, 4],
+        'phase': ['phase 3', 'Phase 2', 'phase 3', 'phase iii', 'Phase 2', 'Phase 1'],
+        'status': ['completed', 'active', 'completed', 'ongoing', 'active', 'planned'],
+        'start_date': ['2020-01-15', '2021-06-01', '2020-01-15', '2019-03-20', '2021-06-01', '2022-01-10'],
+        'patient_count': [500, 250, 500, 300, 250, 150],
+    }).to_csv(source / 'clinical_trials.csv', index=False)
+    return source
+
+
+@pytest.fixture
+def all_source_files(source_files):
+    """Source files for all four entities"""
+    pd.DataFrame({
+        'trial_id': [1, 1, 2, 1, None],
+        'endpoint': ['Response rate', 'Bleeding', 'Pain score', 'Response rate', 'Orphan'],
+        'result_value': [25.5, 1.2, 'n/a', 26.0, 3.0],
+        'unit': ['Percentage', 'percentage ', 'points', 'percentage', 'points'],
+        'p_value': [0.001, 1.5, 0.03, 0.002, 0.5],
+    }).to_csv(source_files / 'trial_results.csv', index=False)
+    pd.DataFrame({
+        'drug_id': [1, 2, 1, 3, 2],
+        'event_type': ['Bleeding', 'Stomach upset', ' Bleeding', 'Liver toxicity', 'Headache'],
+        'severity': ['moderate', 'Mild', 'Moderate', 'SEVERE', 'serious'],
+        'frequency': [150, 500, 150, -3, 80],
+        'reported_date': ['2022-06-15', '2022-08-20', '2022-06-15', '2022-03-10', '2022-09-01'],
+    }).to_csv(source_files / 'adverse_events.csv', index=False)
+    return source_files
+
+
+def make_pipeline(tmp_path, monkeypatch, source, name, chunk_size=None, **options):
+    database = tmp_path / f'{name}.db'
+    engine = create_engine(f'sqlite:///{database}')
+    with engine.begin() as conn:
+        conn.execute(text('CREATE TABLE drugs (id INTEGER PRIMARY KEY, name TEXT UNIQUE, generic_name TEXT, '
+                          'manufacturer TEXT, approval_date TIMESTAMP)'))
+        conn.execute(text('CREATE TABLE clinical_trials (id INTEGER PRIMARY KEY, trial_id TEXT UNIQUE, '
+                          'title TEXT, drug_id INTEGER, phase TEXT, status TEXT, start_date TIMESTAMP, '
+                          'end_date TIMESTAMP, patient_count INTEGER)'))
+        conn.execute(text('CREATE TABLE trial_results (id INTEGER PRIMARY KEY, trial_id INTEGER, endpoint TEXT, '
+                          'result_value FLOAT, unit TEXT, p_value FLOAT)'))
+        conn.execute(text('CREATE TABLE adverse_events (id INTEGER PRIMARY KEY, drug_id INTEGER, event_type TEXT, '
+                          'severity TEXT, frequency INTEGER, reported_date TIMESTAMP)'))
+    monkeypatch.setenv('DATA_SOURCE_PATH', str(source))
+    monkeypatch.setenv('DATA_OUTPUT_PATH', str(tmp_path / f'{name}_out'))
+    monkeypatch.setenv('DATABASE_URL', f'sqlite:///{database}')
+    return DataPipeline(use_mock_data=False, chunk_size=chunk_size, **options), engine
+
+
+def table_rows(engine, table, key):
+    with engine.connect() as conn:
+        return pd.read_sql(f'SELECT * FROM {table} ORDER BY {key}', conn).drop(columns='id')
+
+
+def test_streaming_matches_full_run(tmp_path, monkeypatch, source_files):
+    """Test that a chunked run loads the same rows as a whole-file run"""
+    full, full_engine = make_pipeline(tmp_path, monkeypatch, source_files, 'full')
+    assert full.run()
+    streamed, streamed_engine = make_pipeline(tmp_path, monkeypatch, source_files, 'streamed', chunk_size=2)
+    assert streamed.run()
+
+    drugs = table_rows(streamed_engine, 'drugs', 'name')
+    assert list(drugs['name']) == ['Aspirin', 'Ibuprofen', 'Insulin', 'Metformin', 'Paracetamol']
+    pd.testing.assert_frame_equal(drugs, table_rows(full_engine, 'drugs', 'name'))
+
+    trials = table_rows(streamed_engine, 'clinical_trials', 'trial_id')
+    assert list(trials['trial_id']) == ['NCT001', 'NCT002', 'NCT003', 'NCT004']
+    pd.testing.assert_frame_equal(trials, table_rows(full_engine, 'clinical_trials', 'trial_id'))
+
+    output = pd.read_csv(tmp_path / 'streamed_out' / 'trials_transformed.csv')
+    assert list(output['trial_id']) == ['NCT001', 'NCT002', 'NCT003', 'NCT004']
+
+
+def test_streaming_mock_data(tmp_path, monkeypatch):
+    """Test streaming the mock data without a database"""
+    monkeypatch.delenv('DATABASE_URL', raising=False)
+    monkeypatch.setenv('DATA_OUTPUT_PATH', str(tmp_path))
+    pipeline = DataPipeline(chunk_size=3)
+    assert pipeline.run()
+    assert len(pd.read_csv(tmp_path / 'drugs_transformed.csv')) == 5
+
+
+def test_all_sources_loaded(tmp_path, monkeypatch, all_source_files):
+    """Test that trial results and adverse events are extracted, cleaned and loaded"""
+    full, engine = make_pipeline(tmp_path, monkeypatch, all_source_files, 'all')
+    assert full.run()
+
+    results = table_rows(engine, 'trial_results', 'trial_id, endpoint')
+    assert list(zip(results['trial_id'], results['endpoint'])) == [
+        (1, 'Bleeding'), (1, 'Response rate'), (2, 'Pain score')
+    ]
+    assert results['p_value'].isna().tolist() == [True, False, False]
+
+    events = table_rows(engine, 'adverse_events', 'drug_id, event_type')
+    assert list(events['event_type']) == ['Bleeding', 'Headache', 'Stomach upset', 'Liver toxicity']
+    assert list(events['severity']) == ['Moderate', 'Severe', 'Mild', 'Severe']
+    assert list(events['frequency']) == [150, 80, 500, 0]
+
+    streamed, streamed_engine = make_pipeline(tmp_path, monkeypatch, all_source_files, 'all_streamed', chunk_size=2)
+    assert streamed.run()
+    pd.testing.assert_frame_equal(table_rows(streamed_engine, 'trial_results', 'trial_id, endpoint'), results)
+    pd.testing.assert_frame_equal(table_rows(streamed_engine, 'adverse_events', 'drug_id, event_type'), events)
+
+
+@pytest.mark.parametrize('chunk_size', [None, 2])
+def test_typed_frames_load_same_rows(tmp_path, monkeypatch, all_source_files, chunk_size):
+    """Test that typed frames load exactly what object frames load"""
+    plain, plain_engine = make_pipeline(tmp_path, monkeypatch, all_source_files, 'plain', chunk_size)
+    assert plain.run()
+    typed, typed_engine = make_pipeline(
+        tmp_path, monkeypatch, all_source_files, 'typed', chunk_size, typed_frames=True
+    )
+    assert typed.run()
+
+    for table, key in [('drugs', 'name'), ('clinical_trials', 'trial_id'),
+                       ('trial_results', 'trial_id, endpoint'), ('adverse_events', 'drug_id, event_type')]:
+        pd.testing.assert_frame_equal(table_rows(typed_engine, table, key), table_rows(plain_engine, table, key))
+    if chunk_size is None:
+        assert set(typed.memory.stages) == {'extract', 'transform', 'load'}
+
+
+def test_incremental_run_processes_only_changes(tmp_path, monkeypatch, source_files):
+    """Test that incremental runs skip unchanged files and load only new or changed rows"""
+    def run(name):
+        pipeline = DataPipeline(use_mock_data=False, load_mode='merge', incremental=True)
+        assert pipeline.run()
+        return pd.read_csv(tmp_path / 'incremental_out' / f'{name}_transformed.csv')
+
+    _, engine = make_pipeline(tmp_path, monkeypatch, source_files, 'incremental')
+    assert len(run('drugs')) == 5
+    assert (tmp_path / 'incremental_out' / 'pipeline_state.json').exists()
+
+    # Nothing changed: both files are skipped
+    assert run('drugs').empty
+    assert run('trials').empty
+
+    trials = pd.read_csv(source_files / 'clinical_trials.csv')
+    trials.loc[trials['trial_id'] == 'NCT003', 'patient_count'] = 320
+    trials = pd.concat([trials, pd.DataFrame({
+        'trial_id': ['NCT005'], 'title': ['T5'], 'drug_id': [5], 'phase': ['Phase 1'],
+        'status': ['planned'], 'start_date': ['2023-02-01'], 'patient_count': [40],
+    })])
+    trials.to_csv(source_files / 'clinical_trials.csv', index=False)
+
+    changed = run('trials')
+    assert list(changed['trial_id']) == ['NCT003', 'NCT005']
+    loaded = table_rows(engine, 'clinical_trials', 'trial_id')
+    assert list(loaded['trial_id']) == ['NCT001', 'NCT002', 'NCT003', 'NCT004', 'NCT005']
+    assert loaded.loc[loaded['trial_id'] == 'NCT003', 'patient_count'].item() == 320
+
+
+
+@pytest.mark.parametrize('chunk_size', [None, 2])
+def test_incremental_reloads_sources_without_key(tmp_path, monkeypatch, all_source_files, chunk_size):
+    """Test that a changed adverse event replaces its row instead of adding a second one"""
+    def run():
+        pipeline = DataPipeline(use_mock_data=False, chunk_size=chunk_size, load_mode='merge', incremental=True)
+        assert pipeline.run()
+        return table_rows(engine, 'adverse_events', 'drug_id, event_type')
+
+    _, engine = make_pipeline(tmp_path, monkeypatch, all_source_files, 'keyless')
+    first = run()
+    assert len(first) == 4
+    # Unchanged files are skipped and the table is left as it is
+    pd.testing.assert_frame_equal(run(), first)
+
+    events = pd.read_csv(all_source_files / 'adverse_events.csv')
+    events.loc[events['event_type'] == 'Headache', 'frequency'] = 95
+    events.to_csv(all_source_files / 'adverse_events.csv', index=False)
+
+    events = run()
+    assert len(events) == 4
+    assert events.loc[events['event_type'] == 'Headache', 'frequency'].tolist() == [95]
+    assert len(table_rows(engine, 'trial_results', 'trial_id, endpoint')) == 3
+
+def test_incremental_requires_merge():
+    """Test that incremental runs refuse to append"""
+    with pytest.raises(ValueError):
+        DataPipeline(load_mode='append', incremental=True)
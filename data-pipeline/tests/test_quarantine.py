@@ -0,0 +1,115 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from pipeline.main import DataPipeline
+from pipeline.quarantine import Quarantine
+from pipeline.validators import RULESETS
+
+
+@pytest.fixture
+def bad_trial_source(tmp_path):
+    """Trials where one row violates the end_date >= start_date constraint"""
+    source = tmp_path / 'source'
+    source.mkdir()
+    pd.DataFrame({
+        'name': ['Aspirin', 'Ibuprofen'],
+        'generic_name': ['Acetylsalicylic acid', None],
+        'manufacturer': ['Bayer', 'Pfizer'],
+        'approval_date': ['1899-03-06', '1969-01-01'],
+    }).to_csv(source / 'drugs.csv', index=False)
+    pd.DataFrame({
+        'trial_id': ['NCT001', 'NCT002', 'NCT003'],
+        'title': ['T1', 'T2', 'T3'],
+        'drug_id': [1, 2, 1],
+        'phase': ['Phase 1', 'Phase 2', 'Phase 3'],
+        'status': ['Completed', 'Ongoing', 'Completed'],
+        'start_date': ['2020-01-15', '2022-06-01', '2019-03-20'],
+        'end_date': ['2021-01-15', '2021-06-01', '2020-03-20'],
+        'patient_count': [500, 250, 300],
+    }).to_csv(source / 'clinical_trials.csv', index=False)
+    return source
+
+
+@pytest.mark.parametrize('chunk_size', [None, 1])
+def test_invalid_rows_are_quarantined_not_loaded(tmp_path, monkeypatch, bad_trial_source, chunk_size):
+    """Test that one row breaking a database constraint no longer fails the load"""
+    database = tmp_path / 'quarantine.db'
+    engine = create_engine(f'sqlite:///{database}')
+    with engine.begin() as conn:
+        conn.execute(text('CREATE TABLE drugs (id INTEGER PRIMARY KEY, name TEXT UNIQUE, generic_name TEXT, '
+                          'manufacturer TEXT, approval_date TIMESTAMP)'))
+        conn.execute(text('CREATE TABLE clinical_trials (id INTEGER PRIMARY KEY, trial_id TEXT UNIQUE, '
+                          'title TEXT, drug_id INTEGER, phase TEXT, status TEXT, start_date TIMESTAMP, '
+                          'end_date TIMESTAMP, patient_count INTEGER CHECK (patient_count >= 0), '
+                          'CHECK (end_date >= start_date))'))
+    monkeypatch.setenv('DATA_SOURCE_PATH', str(bad_trial_source))
+    monkeypatch.setenv('DATA_OUTPUT_PATH', str(tmp_path / 'out'))
+    monkeypatch.setenv('DATABASE_URL', f'sqlite:///{database}')
+
+    pipeline = DataPipeline(use_mock_data=False, chunk_size=chunk_size)
+    pipeline.quarantine.format = 'csv'
+    assert pipeline.run()
+
+    with engine.connect() as conn:
+        loaded = pd.read_sql('SELECT trial_id FROM clinical_trials ORDER BY trial_id', conn)
+    assert list(loaded['trial_id']) == ['NCT001', 'NCT003']
+
+    quarantined = pd.read_csv(tmp_path / 'out' / 'quarantine' / 'clinical_trials.csv')
+    assert list(quarantined['trial_id']) == ['NCT002']
+    assert list(quarantined['failed_rules']) == ['end_date_after_start_date']
+    assert pipeline.quarantine.metrics['clinical_trials'] == {
+        'rows': 3, 'quarantined': 1, 'rules': {'end_date_after_start_date': 1}
+    }
+    assert pipeline.quarantine.metrics['drugs']['quarantined'] == 0
+
+
+def test_quarantine_parquet_parts(tmp_path):
+    """Test that chunks are quarantined as parts of one Parquet dataset"""
+    pytest.importorskip('pyarrow')
+    quarantine = Quarantine(str(tmp_path), format='parquet')
+    validation = RULESETS['adverse_events'].validation()
+    chunks = [
+        pd.DataFrame({'drug_id': [1, 2], 'event_type': ['Rash', None], 'frequency': [3, 4]}),
+        pd.DataFrame({'drug_id': [3, 4], 'event_type': ['Nausea', 'Rash'], 'frequency': [-1, 5]}),
+    ]
+    valid = [quarantine.split('adverse_events', chunk, validation) for chunk in chunks]
+
+    assert [list(chunk['drug_id']) for chunk in valid] == [[1], [4]]
+    rejected = pd.read_parquet(tmp_path / 'quarantine' / 'adverse_events')
+    assert sorted(zip(rejected['drug_id'], rejected['failed_rules'])) == [
+        (2, 'event_type_not_null'), (3, 'frequency_non_negative')
+    ]
+
+
+@pytest.mark.parametrize('chunk_size', [None, 1])
+def test_unparseable_dates_are_quarantined(tmp_path, monkeypatch, bad_trial_source, chunk_size):
+    """Test that dates the schema could not parse quarantine their row instead of loading as null"""
+    drugs = pd.read_csv(bad_trial_source / 'drugs.csv')
+    drugs.loc[1, 'approval_date'] = 'sometime in 1969'
+    drugs.to_csv(bad_trial_source / 'drugs.csv', index=False)
+    trials = pd.read_csv(bad_trial_source / 'clinical_trials.csv')
+    trials.loc[2, 'start_date'] = '20/03/2019'
+    trials.to_csv(bad_trial_source / 'clinical_trials.csv', index=False)
+
+    database = tmp_path / 'dates.db'
+    monkeypatch.setenv('DATA_SOURCE_PATH', str(bad_trial_source))
+    monkeypatch.setenv('DATA_OUTPUT_PATH', str(tmp_path / 'out'))
+    monkeypatch.setenv('DATABASE_URL', f'sqlite:///{database}')
+
+    pipeline = DataPipeline(use_mock_data=False, chunk_size=chunk_size)
+    pipeline.quarantine.format = 'csv'
+    assert pipeline.run()
+
+    engine = create_engine(f'sqlite:///{database}')
+    with engine.connect() as conn:
+        assert list(pd.read_sql('SELECT name FROM drugs', conn)['name']) == ['Aspirin']
+        assert list(pd.read_sql('SELECT trial_id FROM clinical_trials', conn)['trial_id']) == ['NCT001']
+
+    quarantine = tmp_path / 'out' / 'quarantine'
+    drugs = pd.read_csv(quarantine / 'drugs.csv')
+    assert list(zip(drugs['name'], drugs['failed_rules'])) == [('Ibuprofen', 'approval_date_valid_date')]
+    trials = pd.read_csv(quarantine / 'clinical_trials.csv')
+    assert sorted(zip(trials['trial_id'], trials['failed_rules'])) == [
+        ('NCT002', 'end_date_after_start_date'), ('NCT003', 'start_date_valid_date')
+    ]
+    assert '_schema_errors' not in trials.columns
@@ -0,0 +1,80 @@
+import pytest
+import numpy as np
+import pandas as pd
+from pipeline.validators import RULESETS, DataValidator
+
+
+def make_trials():
+    return pd.DataFrame({
+        'trial_id': ['NCT001', 'NCT002', 'NCT001', None],
+        'title': ['Trial 1', 'Trial 2', 'Trial 3', 'Trial 4'],
+        'drug_id': [1, 2, 3, 4],
+        'phase': ['Phase 1', 'Phase 9', 'Phase 2', None],
+        'status': ['Ongoing', 'Completed', 'Completed', 'Completed'],
+        'patient_count': [100, -5, 10, 20],
+        'start_date': ['2020-01-01', '2022-01-01', '2020-01-01', None],
+        'end_date': ['2021-01-01', '2021-01-01', None, '2021-01-01'],
+    })
+
+
+def test_bitmap_marks_failed_rules_per_row():
+    """Test that each row's bitmap holds exactly the rules it failed"""
+    ruleset = RULESETS['clinical_trials']
+    validation = ruleset.validation()
+    bitmap = validation.update(make_trials())
+
+    assert bitmap.dtype == np.uint64
+    assert bitmap[0] == 0
+    assert validation.failed_rules(bitmap).tolist() == [
+        '',
+        'patient_count_non_negative,end_date_after_start_date,phase_domain',
+        'trial_id_unique',
+        'trial_id_not_null',
+    ]
+    assert validation.counts['patient_count_non_negative'] == 1
+    assert validation.counts['status_domain'] == 0
+
+
+def test_chunked_validation_matches_whole_frame():
+    """Test that counts and issues over chunks equal a single pass, duplicates included"""
+    df = make_trials()
+    _, expected = RULESETS['clinical_trials'].validate(df)
+
+    validation = RULESETS['clinical_trials'].validation()
+    bitmaps = [validation.update(df.iloc[i:i + 1]) for i in range(len(df))]
+
+    assert validation.issues() == expected
+    assert validation.rows == len(df)
+    np.testing.assert_array_equal(np.concatenate(bitmaps), RULESETS['clinical_trials'].validation().update(df))
+
+
+def test_missing_columns_skip_their_rules():
+    """Test that rules on absent columns are dropped and required columns reported"""
+    is_valid, issues = DataValidator.validate_adverse_event_data(pd.DataFrame({'drug_id': [1, -1]}))
+    assert not is_valid
+    assert issues == ["Missing required columns: ['event_type', 'reported_date']"]
+
+
+def test_parsed_dates_pass_date_rule():
+    """Test that typed date columns are trusted and unparsable strings are flagged"""
+    parsed = pd.DataFrame({'name': ['A'], 'approval_date': pd.to_datetime(['2020-01-01'])})
+    raw = pd.DataFrame({'name': ['A', 'B'], 'approval_date': ['2020-01-01', 'invalid']})
+    assert DataValidator.validate_drug_data(parsed) == (True, [])
+    assert DataValidator.validate_drug_data(raw) == (False, ["Invalid date format in 'approval_date'"])
+
+
+@pytest.mark.parametrize('dtype', ['object', 'string', 'category'])
+def test_domain_rules_allow_missing_values(dtype):
+    """Test that empty phase/status pass the domain rules for every text dtype"""
+    df = pd.DataFrame({
+        'trial_id': ['NCT001', 'NCT002', 'NCT003'],
+        'title': ['T1', 'T2', 'T3'],
+        'drug_id': [1, 2, 3],
+        'phase': pd.Series(['Phase 1', np.nan, 'Phase 9'], dtype=dtype),
+        'status': pd.Series([None, 'Ongoing', 'Ongoing'], dtype=dtype),
+    })
+    validation = RULESETS['clinical_trials'].validation()
+    bitmap = validation.update(df)
+
+    assert validation.failed_rules(bitmap).tolist() == ['', '', 'phase_domain']
+    assert validation.counts['status_domain'] == 0
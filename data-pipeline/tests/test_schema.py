@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+from pipeline.extractors import DataExtractor
+from pipeline.schema import (
+    SCHEMA_ERRORS_COLUMN, apply_schema, coercion_failures, invalid_dates, read_dtypes, without_schema_errors
+)
+
+
+def test_apply_schema_parses_once():
+    """Test that dates and numbers are typed at extraction and bad values become missing"""
+    raw = pd.DataFrame({
+        'trial_id': ['NCT001', '002', 'NCT003'],
+        'drug_id': ['1', '2', 'x'],
+        'start_date': ['2020-01-15', '2021-06-01 00:00:00', '15/01/2020'],
+        'end_date': [None, '2022-12-31', '2023-01-01'],
+        'extra': ['a', 'b', 'c'],
+    })
+    assert invalid_dates(raw['start_date']) == 1
+
+    df = apply_schema(raw, 'clinical_trials')
+    assert list(df['start_date']) == [pd.Timestamp('2020-01-15'), pd.Timestamp('2021-06-01'), pd.NaT]
+    assert df['drug_id'].isna().tolist() == [False, False, True]
+    assert list(df['trial_id']) == ['NCT001', '002', 'NCT003']
+    assert list(df['extra']) == ['a', 'b', 'c']
+    assert invalid_dates(df['start_date']) == 0
+
+
+
+@pytest.mark.parametrize('typed', [False, True])
+def test_apply_schema_records_coercion_failures(typed):
+    """Test that values set to missing are named per row instead of dropped silently"""
+    raw = pd.DataFrame({
+        'trial_id': ['NCT001', 'NCT002', 'NCT003'],
+        'drug_id': ['1', 'x', 'y'],
+        'start_date': ['2020-01-15', 'not a date', None],
+    })
+    df = apply_schema(raw, 'clinical_trials', typed)
+    assert list(df[SCHEMA_ERRORS_COLUMN]) == [None, 'drug_id,start_date', 'drug_id']
+    assert coercion_failures(df, 'start_date').tolist() == [False, True, False]
+    assert coercion_failures(df, 'drug_id').tolist() == [False, True, True]
+    assert SCHEMA_ERRORS_COLUMN not in without_schema_errors(df).columns
+
+    clean = apply_schema(raw.iloc[:1], 'clinical_trials', typed)
+    assert SCHEMA_ERRORS_COLUMN not in clean.columns
+    assert not coercion_failures(clean, 'start_date').any()
+
+def test_text_columns_are_never_read_as_numbers(tmp_path):
+    """Test that declared text columns keep values that look numeric"""
+    pd.DataFrame({'trial_id': ['001', '002'], 'title': ['A', 'B'], 'drug_id': [1, 2]}).to_csv(
+        tmp_path / 'clinical_trials.csv', index=False
+    )
+    df = DataExtractor(str(tmp_path)).extract_clinical_trials_data()
+    assert list(df['trial_id']) == ['001', '002']
+    assert read_dtypes('trial_results', ['trial_id', 'endpoint']) == {'endpoint': 'object'}
+
+
+def test_later_stages_do_not_parse_dates(tmp_path, monkeypatch):
+    """Test that transform, validate and load trust the dates typed at extraction"""
+    from pipeline.main import DataPipeline
+    monkeypatch.setenv('DATA_OUTPUT_PATH', str(tmp_path))
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'load.db'}")
+    pipeline = DataPipeline()
+    frames = pipeline.extract()
+
+    def no_parsing(*args, **kwargs):
+        raise AssertionError('dates parsed after extraction')
+
+    monkeypatch.setattr(pd, 'to_datetime', no_parsing)
+    frames = pipeline.transform(frames)
+    pipeline.validate(frames)
+    assert pipeline.load(frames)
+    assert pd.api.types.is_datetime64_any_dtype(frames['clinical_trials']['start_date'])
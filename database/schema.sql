@@ -6,6 +6,7 @@ DROP TABLE IF EXISTS adverse_events CASCADE;
 DROP TABLE IF EXISTS trial_results CASCADE;
 DROP TABLE IF EXISTS clinical_trials CASCADE;
 DROP TABLE IF EXISTS drugs CASCADE;
+DROP FUNCTION IF EXISTS ensure_adverse_event_partitions(DATE, DATE);
 
 -- Drop existing types
 DROP TYPE IF EXISTS trial_phase CASCADE;
@@ -57,6 +58,7 @@ CREATE INDEX idx_trials_trial_id ON clinical_trials(trial_id);
 CREATE INDEX idx_trials_drug_id ON clinical_trials(drug_id);
 CREATE INDEX idx_trials_phase ON clinical_trials(phase);
 CREATE INDEX idx_trials_status ON clinical_trials(status);
+CREATE INDEX idx_trials_drug_id_status ON clinical_trials(drug_id, status);
 
 -- Trial Results Table
 CREATE TABLE trial_results (
@@ -74,19 +76,76 @@ CREATE TABLE trial_results (
 CREATE INDEX idx_trial_results_trial_id ON trial_results(trial_id);
 
 -- Adverse Events Table
+-- Range-partitioned by month of reported_date so date-bounded queries only
+-- scan the matching partitions and old months can be detached cheaply.
+-- The partition key must be part of the primary key, so reported_date is
+-- required and defaults to the day the event is recorded.
 CREATE TABLE adverse_events (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     drug_id INTEGER NOT NULL REFERENCES drugs(id) ON DELETE CASCADE,
     event_type VARCHAR(200),
     severity VARCHAR(50),
     frequency INTEGER CHECK (frequency >= 0),
     description TEXT,
-    reported_date DATE,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-);
+    reported_date DATE NOT NULL DEFAULT CURRENT_DATE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, reported_date)
+) PARTITION BY RANGE (reported_date);
+
+-- Rows outside every monthly partition land here until their month is created
+CREATE TABLE adverse_events_default PARTITION OF adverse_events DEFAULT;
 
 CREATE INDEX idx_adverse_events_drug_id ON adverse_events(drug_id);
 CREATE INDEX idx_adverse_events_severity ON adverse_events(severity);
+CREATE INDEX idx_adverse_events_drug_id_reported_date ON adverse_events(drug_id, reported_date);
+
+-- Create monthly adverse_events partitions covering [from_date, to_date].
+-- Rows already sitting in the default partition for a new month are moved
+-- into it. Returns the number of partitions created.
+CREATE OR REPLACE FUNCTION ensure_adverse_event_partitions(from_date DATE, to_date DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    month_start DATE := date_trunc('month', from_date)::date;
+    month_end DATE;
+    partition_name TEXT;
+    created INTEGER := 0;
+BEGIN
+    WHILE month_start <= to_date LOOP
+        month_end := (month_start + INTERVAL '1 month')::date;
+        partition_name := format('adverse_events_y%sm%s', to_char(month_start, 'YYYY'), to_char(month_start, 'MM'));
+        IF to_regclass(partition_name) IS NULL THEN
+            IF EXISTS (
+                SELECT 1 FROM adverse_events_default
+                WHERE reported_date >= month_start AND reported_date < month_end
+            ) THEN
+                ALTER TABLE adverse_events DETACH PARTITION adverse_events_default;
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF adverse_events FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, month_start, month_end
+                );
+                INSERT INTO adverse_events SELECT * FROM adverse_events_default
+                    WHERE reported_date >= month_start AND reported_date < month_end;
+                DELETE FROM adverse_events_default
+                    WHERE reported_date >= month_start AND reported_date < month_end;
+                ALTER TABLE adverse_events ATTACH PARTITION adverse_events_default DEFAULT;
+            ELSE
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF adverse_events FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, month_start, month_end
+                );
+            END IF;
+            created := created + 1;
+        END IF;
+        month_start := month_end;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_adverse_event_partitions(
+    (CURRENT_DATE - INTERVAL '12 months')::date,
+    (CURRENT_DATE + INTERVAL '3 months')::date
+);
 
 -- Create a trigger to update 'updated_at' timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
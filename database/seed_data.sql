@@ -36,7 +36,9 @@ INSERT INTO trial_results (trial_id, endpoint, result_value, unit, p_value, conf
 (8, 'Heartburn symptom relief', 85, 'percentage', 0.0001, '95% CI: 80-90%', 'High efficacy in GERD treatment'),
 (9, 'ACR20 response rate', 65, 'percentage', 0.0001, '95% CI: 60-70%', 'Significant improvement in RA symptoms');
 
--- Insert sample adverse events
+-- Insert sample adverse events (create their monthly partitions first)
+SELECT ensure_adverse_event_partitions('2021-12-01', '2022-09-30');
+
 INSERT INTO adverse_events (drug_id, event_type, severity, frequency, description, reported_date) VALUES
 (1, 'Gastrointestinal bleeding', 'Moderate', 150, 'Upper GI bleeding in chronic users', '2022-06-15'),
 (2, 'Stomach upset', 'Mild', 500, 'Mild gastrointestinal discomfort', '2022-08-20'),
@@ -30,6 +30,7 @@ pip install -q fastapi uvicorn sqlalchemy pydantic pydantic-settings python-dote
 # Create .env file with SQLite
 cat > .env << EOF
 DATABASE_URL=sqlite:///./datamax.db
+SQLITE_TUNED=true
 SECRET_KEY=dev-secret-key
 ENVIRONMENT=development
 LOG_LEVEL=INFO